@@ -1,10 +1,14 @@
 from django.contrib import admin
 from django.contrib.auth.models import Group, User
-from django.utils.html import format_html
+from django.db.models.query import QuerySet
+from django.http import HttpRequest
+from django.utils.html import format_html, format_html_join
 from django_celery_beat import models as celery_models
 
+from app.etl.state import TargetState
 from app.forms import DatabaseForm, ProcessForm
-from app.models import Column, Database, Model, Process, Relationship
+from app.history import ProcessRunsAdmin, RunFormat, RunHistoryAdmin
+from app.models import Column, Database, Model, Process, ProcessRun, ProcessTarget, Relationship
 
 
 class RelationshipInline(admin.StackedInline):
@@ -14,6 +18,13 @@ class RelationshipInline(admin.StackedInline):
     autocomplete_fields = ('process',)
 
 
+class ProcessTargetInline(admin.TabularInline):
+    """Класс для вставки дополнительных получателей данных в админку процессов."""
+
+    model = ProcessTarget
+    extra = 0
+
+
 class ColumnInline(admin.TabularInline):
     """Класс для вставки колонок таблицы в админку модели."""
 
@@ -66,15 +77,29 @@ class ModelAdmin(admin.ModelAdmin):
 
 
 @admin.register(Process)
-class ProcessAdmin(admin.ModelAdmin):
+class ProcessAdmin(ProcessRunsAdmin):
     """Класс админки процессов."""
 
     form = ProcessForm
-    inlines = (RelationshipInline,)
+    inlines = (ProcessTargetInline, RelationshipInline)
     search_fields = ('slug', 'source', 'target')
     list_filter = ('source', 'target')
-    list_display = ('slug', 'from_', 'to', 'active')
+    list_display = ('slug', 'from_', 'to', 'active', 'trend')
+    list_select_related = ('source', 'target', 'model', 'task')
     exclude = ('task',)
+    readonly_fields = ('history',)
+    actions = ('reread_targets', 'profile_runs')
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet[Process]:
+        """Получение процессов вместе с дополнительными получателями для всех процессов страницы сразу.
+
+        Args:
+            request: Запрос
+
+        Returns:
+            QuerySet[Process]: Процессы
+        """
+        return super().get_queryset(request).prefetch_related('extra_targets__target', 'extra_targets__model')
 
     @admin.display(description='from')
     def from_(self, obj: Process) -> str:
@@ -90,15 +115,16 @@ class ProcessAdmin(admin.ModelAdmin):
 
     @admin.display
     def to(self, obj: Process):
-        """Вывод получателя данных ETL-процесса.
+        """Вывод получателей данных ETL-процесса.
 
         Args:
             obj: Процесс
 
         Returns:
-            str: Получатель данных
+            str: Получатели данных
         """
-        return '{slug}: {to_table}'.format(slug=obj.target.slug, to_table=obj.to_table)
+        targets = [obj.primary_target, *obj.extra_targets.all()]
+        return format_html('<br>'.join(str(target) for target in targets))
 
     @admin.display(boolean=True)
     def active(self, obj: Process) -> bool:
@@ -112,6 +138,121 @@ class ProcessAdmin(admin.ModelAdmin):
         """
         return obj.task.enabled
 
+    @admin.action(description='Профилировать следующий запуск')
+    def profile_runs(self, request: HttpRequest, queryset: QuerySet[Process]):
+        """Отметка профилирования следующего запуска выбранных процессов.
+
+        Args:
+            request: Запрос
+            queryset: Выбранные процессы
+        """
+        queryset.update(profile_next_run=True)
+
+    @admin.action(description='Перечитать получателей при следующей синхронизации')
+    def reread_targets(self, request: HttpRequest, queryset: QuerySet[Process]):
+        """Сброс снимков состояния получателей выбранных процессов.
+
+        Args:
+            request: Запрос
+            queryset: Выбранные процессы
+        """
+        for process in queryset:
+            TargetState.invalidate(process.id)
+
+
+@admin.register(ProcessRun)
+class ProcessRunAdmin(RunHistoryAdmin):
+    """Класс админки истории запусков процессов."""
+
+    list_filter = ('status', 'task', 'process')
+    list_display = (
+        'process', 'task', 'started', 'status', 'time', 'rows_written', 'memory', 'slowest', 'profile_link',
+    )
+    date_hierarchy = 'started'
+    readonly_fields = ('profile_link', 'operators_table')
+    exclude = ('operators',)
+
+    @admin.display(description='время', ordering='duration')
+    def time(self, obj: ProcessRun) -> str:
+        """Вывод длительности запуска.
+
+        Args:
+            obj: Запуск
+
+        Returns:
+            str: Длительность
+        """
+        return RunFormat.format_seconds(obj.duration)
+
+    @admin.display(description='пик RSS', ordering='peak_rss')
+    def memory(self, obj: ProcessRun) -> str:
+        """Вывод пикового RSS воркера за время запуска.
+
+        Args:
+            obj: Запуск
+
+        Returns:
+            str: Пиковый объём памяти
+        """
+        return RunFormat.format_bytes(obj.peak_rss)
+
+    @admin.display(description='самый долгий оператор')
+    def slowest(self, obj: ProcessRun) -> str:
+        """Вывод оператора, который занял больше всего времени.
+
+        Args:
+            obj: Запуск
+
+        Returns:
+            str: Оператор и его время
+        """
+        if not obj.operators:
+            return '-'
+        operator, stats = RunFormat.get_operators(obj)[0]
+        return '{operator} {seconds}'.format(operator=operator, seconds=RunFormat.format_seconds(stats['seconds']))
+
+    @admin.display(description='профиль')
+    def profile_link(self, obj: ProcessRun) -> str:
+        """Вывод ссылки на архив профилирования запуска.
+
+        Args:
+            obj: Запуск
+
+        Returns:
+            str: Ссылка на скачивание
+        """
+        return RunFormat.get_profile_link(obj)
+
+    @admin.display(description='операторы')
+    def operators_table(self, obj: ProcessRun) -> str:
+        """Вывод показателей операторов запуска.
+
+        Args:
+            obj: Запуск
+
+        Returns:
+            str: Таблица показателей
+        """
+        row = '<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>'
+        rows = format_html_join('', row, (
+            (
+                operator,
+                stats['calls'],
+                RunFormat.format_seconds(stats['seconds']),
+                stats['rows'],
+                stats['rows_written'],
+                RunFormat.format_bytes(stats['bytes_read']),
+                RunFormat.format_bytes(stats['bytes_written']),
+                RunFormat.format_bytes(stats['peak_rss']),
+            )
+            for operator, stats in RunFormat.get_operators(obj)
+        ))
+        return format_html(
+            '<table><tr><th>оператор</th><th>вызовов</th><th>время</th><th>строк</th><th>записано строк</th>'
+            '<th>прочитано</th><th>записано</th><th>пик RSS</th></tr>{rows}</table>',
+            rows=rows,
+        )
+
 
 admin.site.unregister(User)
 admin.site.unregister(Group)
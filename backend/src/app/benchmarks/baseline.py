@@ -0,0 +1,162 @@
+import datetime
+import json
+import os
+import platform
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.core.management.base import CommandError, OutputWrapper
+
+from app.benchmarks.stages import Timings
+
+
+class BaselineReport:
+    """Отчёт о замерах этапов ETL и их сравнение с сохранёнными ранее результатами."""
+
+    settings = (
+        'ETL_ASYNC_LOAD',
+        'ETL_ES_BULK_CHUNK_SIZE',
+        'ETL_ES_BULK_THREADS',
+        'ETL_ES_READ_SLICES',
+        'ETL_PIPELINE_QUEUE_SIZE',
+        'ETL_SQL_BATCH_SIZE',
+        'ETL_SQLITE_BATCH_SIZE',
+        'ETL_SQLITE_BULK_LOAD',
+        'ETL_SYNC_STATE',
+    )
+
+    def __init__(self, stdout: OutputWrapper, stderr: OutputWrapper, options: Dict[str, Any]):
+        """При инициализации ожидает получить потоки вывода команды и её параметры.
+
+        Args:
+            stdout: Поток вывода отчёта
+            stderr: Поток вывода предупреждений
+            options: Параметры команды
+        """
+        self.stdout = stdout
+        self.stderr = stderr
+        self.options = options
+        self.timings: Timings = {}
+
+    def add(self, target: str, rows: int, timings: Timings) -> None:
+        """Добавление в отчёт времени этапов передачи в одного получателя.
+
+        Args:
+            target: Тип получателя
+            rows: Количество фильмов
+            timings: Лучшее время каждого этапа в секундах
+        """
+        self.stdout.write('etl rows={rows} target={target}: {stages}'.format(
+            rows=rows,
+            target=target,
+            stages=' '.join('{0}={1:.3f}s'.format(stage, seconds) for stage, seconds in timings.items()),
+        ))
+        self.timings.update({
+            '{0}/{1}/{2}'.format(target, rows, stage): seconds for stage, seconds in timings.items()
+        })
+
+    def write(self) -> None:
+        """Вывод отчёта о сравнении результатов замеров с сохранёнными ранее и сохранение результатов.
+
+        Raises:
+            CommandError: Этапы замедлились больше допустимого, если задан --strict
+        """
+        baseline = self.load()
+        regressions: List[str] = []
+        self.stdout.write('{0:<15}{1:>9}  {2:<15}{3:>9}{4:>11}{5:>10}{6:>9}  {7}'.format(
+            'target', 'rows', 'stage', 'seconds', 'rows/s', 'baseline', 'change', 'verdict',
+        ))
+        for key, seconds in self.timings.items():
+            if self.write_row(key, seconds, baseline.get(key)):
+                regressions.append(key)
+        if self.options['save_baseline']:
+            self.save(self.options['save_baseline'])
+        if regressions and self.options['strict']:
+            raise CommandError('Этапы замедлились больше чем на {threshold}%: {keys}'.format(
+                threshold=self.options['threshold'], keys=', '.join(regressions),
+            ))
+
+    def write_row(self, key: str, seconds: float, baseline: Optional[float]) -> bool:
+        """Вывод строки отчёта о сравнении этапа с сохранённым результатом.
+
+        Args:
+            key: Тип получателя, количество фильмов и название этапа через косую черту
+            seconds: Время этапа в секундах
+            baseline: Сохранённое время этапа в секундах
+
+        Returns:
+            bool: Этап замедлился больше допустимого
+        """
+        target, rows, stage = key.split('/')
+        change = (seconds / baseline - 1) * 100 if baseline else None
+        verdict = '-'
+        if change is not None and abs(change) <= self.options['threshold']:
+            verdict = 'ok'
+        elif change is not None:
+            verdict = 'slower' if change > 0 else 'faster'
+        self.stdout.write('{0:<15}{1:>9}  {2:<15}{3:>9.3f}{4:>11.0f}{5:>10}{6:>9}  {7}'.format(
+            target,
+            rows,
+            stage,
+            seconds,
+            int(rows) / seconds,
+            '{0:.3f}'.format(baseline) if baseline else '-',
+            '{0:+.1f}%'.format(change) if change is not None else '-',
+            verdict,
+        ))
+        return verdict == 'slower'
+
+    def load(self) -> Timings:
+        """Чтение сохранённых результатов замеров из файла --baseline.
+
+        Returns:
+            Timings: Сохранённое время этапов или пустой словарь, если файл не задан
+        """
+        if not self.options['baseline']:
+            return {}
+        with open(self.options['baseline']) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get('environment') != self.get_environment():
+            self.stderr.write('Окружение отличается от окружения сохранённых результатов: {env}'.format(
+                env=baseline.get('environment'),
+            ))
+        return baseline['results']
+
+    def save(self, path: str) -> None:
+        """Сохранение результатов замеров для сравнения с ними следующих замеров.
+
+        Результаты добавляются к уже сохранённым в файле, поэтому замеры разных размеров можно сохранять по очереди.
+
+        Args:
+            path: Путь к файлу JSON
+        """
+        saved: Dict = {}
+        if os.path.exists(path):
+            with open(path) as baseline_file:
+                saved = json.load(baseline_file).get('results', {})
+        with open(path, 'w') as baseline_file:
+            json.dump({
+                'created': datetime.datetime.now().isoformat(timespec='seconds'),
+                'environment': self.get_environment(),
+                'results': {**saved, **self.timings},
+            }, baseline_file, indent=2, ensure_ascii=False)
+        self.stdout.write('Результаты сохранены в {path}'.format(path=path))
+
+    def get_environment(self) -> Dict:
+        """Окружение замеров, от которого зависит их время: версии библиотек, процессор и настройки ETL.
+
+        Returns:
+            Dict: Описание окружения
+        """
+        return {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'chunk_size': self.options['chunk_size'],
+            'extract_cache': self.options['extract_cache'],
+            'settings': {name: getattr(settings, name) for name in self.settings},
+        }
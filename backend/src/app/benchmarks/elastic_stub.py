@@ -0,0 +1,419 @@
+import contextlib
+import http
+import itertools
+import threading
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import orjson
+
+Response = Tuple[int, bytes]
+
+
+class ElasticStub:
+    """Локальная заглушка Elasticsearch, которая хранит документы в памяти процесса.
+
+    Заглушка отвечает на запросы, которые отправляет ElasticEngine: массовые операции, чтение через scroll
+    со срезами, подсчёт документов и обновление индекса. Поиск поддерживается только по всем документам индекса.
+    Замеры с ней показывают затраты самих ETL-сервисов на подготовку и разбор запросов без работы кластера.
+    """
+
+    def __init__(self) -> None:
+        """При инициализации создаёт пустое хранилище индексов."""
+        self.indices = ElasticIndices()
+        self.scrolls = ElasticScrolls()
+
+    @contextlib.contextmanager
+    def running(self) -> Iterator[str]:
+        """Запуск заглушки на свободном порту в отдельном потоке.
+
+        Yields:
+            Iterator[str]: Адрес заглушки для подключения клиента Elasticsearch
+        """
+        handler_class = type('ElasticStubHandler', (ElasticStubHandler,), {'stub': self})
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler_class)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield 'http://127.0.0.1:{port}'.format(port=server.server_address[1])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def reset(self) -> None:
+        """Удаление всех индексов."""
+        self.indices.clear()
+        self.scrolls.clear()
+
+    def count(self, index: str) -> int:
+        """Количество документов индекса.
+
+        Args:
+            index: Название индекса
+
+        Returns:
+            int: Количество документов
+        """
+        return len(self.indices.snapshot(index))
+
+    def dispatch(self, method: str, url: str, body: bytes) -> Response:
+        """Обработка запроса клиента Elasticsearch.
+
+        Args:
+            method: Метод HTTP
+            url: Путь запроса с параметрами
+            body: Тело запроса
+
+        Returns:
+            Response: Код и тело ответа
+        """
+        parts = urlsplit(url)
+        path = [part for part in parts.path.split('/') if part]
+        if not path:
+            return ElasticResponses.get_info()
+        if path == ['_search', 'scroll']:
+            return self.scrolls.clear_scroll(body) if method == 'DELETE' else self.scrolls.scroll(body)
+        if path[-1] == '_bulk':
+            return self.indices.bulk(body, path[0] if len(path) > 1 else None)
+        if path[-1] == '_refresh':
+            return http.HTTPStatus.OK, b''.join((b'{"_shards":', ElasticResponses.shards, b'}'))
+        return self.dispatch_index(path, parts.query, body)
+
+    def dispatch_index(self, path: List[str], query: str, body: bytes) -> Response:
+        """Обработка запроса к одному индексу.
+
+        Args:
+            path: Название индекса и операция над ним
+            query: Параметры запроса
+            body: Тело запроса
+
+        Returns:
+            Response: Код и тело ответа
+        """
+        if len(path) != 2:
+            return ElasticResponses.get_error(
+                http.HTTPStatus.BAD_REQUEST, 'unsupported_operation_exception', '/'.join(path),
+            )
+        if path[0] not in self.indices.documents:
+            return ElasticResponses.get_error(
+                http.HTTPStatus.NOT_FOUND, 'index_not_found_exception', 'no such index [{0}]'.format(path[0]),
+            )
+        if path[1] == '_search':
+            params = {name: found[-1] for name, found in parse_qs(query).items()}
+            return self.scrolls.search(path[0], self.indices, params, orjson.loads(body) if body else {})
+        if path[1] == '_count':
+            return ElasticResponses.get_count(len(self.indices.snapshot(path[0])))
+        return ElasticResponses.get_error(http.HTTPStatus.BAD_REQUEST, 'unsupported_operation_exception', path[1])
+
+
+class ElasticIndices:
+    """Документы индексов заглушки Elasticsearch в виде сохранённых тел документов по идентификаторам."""
+
+    def __init__(self) -> None:
+        """При инициализации индексов нет."""
+        self.documents: Dict[str, Dict[str, bytes]] = {}
+        self.lock = threading.Lock()
+
+    def clear(self) -> None:
+        """Удаление всех индексов."""
+        with self.lock:
+            self.documents.clear()
+
+    def snapshot(self, index: str) -> List[Tuple[str, bytes]]:
+        """Документы индекса на момент вызова.
+
+        Args:
+            index: Название индекса
+
+        Returns:
+            List[Tuple[str, bytes]]: Идентификаторы и тела документов
+        """
+        with self.lock:
+            return list(self.documents.get(index, {}).items())
+
+    def bulk(self, body: bytes, default_index: Optional[str]) -> Response:
+        """Выполнение массовой операции вставки и удаления документов.
+
+        Args:
+            body: Действия массовой операции в формате NDJSON
+            default_index: Индекс из пути запроса
+
+        Returns:
+            Response: Код и тело ответа
+        """
+        lines = iter(body.splitlines())
+        with self.lock:
+            responses = [
+                self.apply_action(orjson.loads(line), lines, default_index) for line in lines if line.strip()
+            ]
+        return http.HTTPStatus.OK, orjson.dumps({'took': 0, 'errors': False, 'items': responses})
+
+    def apply_action(self, action: Dict[str, Dict], lines: Iterator[bytes], default_index: Optional[str]) -> Dict:
+        """Вставка или удаление одного документа массовой операции.
+
+        Args:
+            action: Действие массовой операции
+            lines: Оставшиеся строки массовой операции, из которых берётся тело документа
+            default_index: Индекс из пути запроса
+
+        Returns:
+            Dict: Итог действия
+        """
+        operation, meta = next(iter(action.items()))
+        index = meta.get('_index', default_index)
+        doc_id = str(meta['_id'])
+        outcome = self.store(self.documents.setdefault(str(index), {}), operation, doc_id, lines)
+        return {operation: {'_index': index, '_id': doc_id, **outcome}}
+
+    def store(self, documents: Dict[str, bytes], operation: str, doc_id: str, lines: Iterator[bytes]) -> Dict:
+        """Изменение документа индекса действием массовой операции.
+
+        Args:
+            documents: Документы индекса
+            operation: Название действия
+            doc_id: Идентификатор документа
+            lines: Оставшиеся строки массовой операции, из которых берётся тело документа
+
+        Returns:
+            Dict: Итог и код ответа действия
+        """
+        if operation == 'delete':
+            if documents.pop(doc_id, None) is None:
+                return {'result': 'not_found', 'status': 404}
+            return {'result': 'deleted', 'status': 200}
+        outcome = {'result': 'updated', 'status': 200} if doc_id in documents else {'result': 'created', 'status': 201}
+        documents[doc_id] = next(lines)
+        return outcome
+
+
+class ElasticScrolls:
+    """Чтение документов заглушки Elasticsearch через scroll."""
+
+    def __init__(self) -> None:
+        """При инициализации открытых scroll нет."""
+        self.scrolls: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+
+    def clear(self) -> None:
+        """Удаление всех scroll."""
+        with self.lock:
+            self.scrolls.clear()
+
+    def search(self, index: str, indices: ElasticIndices, params: Dict[str, str], query: Dict) -> Response:
+        """Начало чтения документов индекса через scroll.
+
+        Args:
+            index: Название индекса
+            indices: Документы индексов
+            params: Параметры запроса
+            query: Тело запроса
+
+        Returns:
+            Response: Код и тело ответа с первой страницей документов
+        """
+        if query.get('query', {'match_all': {}}) != {'match_all': {}}:
+            return ElasticResponses.get_error(
+                http.HTTPStatus.BAD_REQUEST, 'parsing_exception', 'stub supports match_all only',
+            )
+        fields = query.get('_source')
+        if isinstance(fields, dict):
+            fields = fields.get('includes')
+        scroll_id = uuid.uuid4().hex
+        with self.lock:
+            self.scrolls[scroll_id] = {
+                'index': index,
+                'documents': self.get_slice(indices.snapshot(index), query.get('slice')),
+                'fields': set(fields) if isinstance(fields, list) else None,
+                'size': int(params.get('size', 10)),
+                'position': 0,
+            }
+        return self.get_page(scroll_id)
+
+    def scroll(self, body: bytes) -> Response:
+        """Следующая страница документов scroll.
+
+        Args:
+            body: Тело запроса с идентификатором scroll
+
+        Returns:
+            Response: Код и тело ответа
+        """
+        scroll_id = orjson.loads(body)['scroll_id']
+        if scroll_id not in self.scrolls:
+            return ElasticResponses.get_error(http.HTTPStatus.NOT_FOUND, 'search_context_missing_exception', scroll_id)
+        return self.get_page(scroll_id)
+
+    def clear_scroll(self, body: bytes) -> Response:
+        """Удаление scroll.
+
+        Args:
+            body: Тело запроса с идентификаторами scroll
+
+        Returns:
+            Response: Код и тело ответа
+        """
+        scroll_ids = orjson.loads(body)['scroll_id'] if body else []
+        with self.lock:
+            for scroll_id in scroll_ids if isinstance(scroll_ids, list) else [scroll_ids]:
+                self.scrolls.pop(scroll_id, None)
+        return http.HTTPStatus.OK, b'{"succeeded":true,"num_freed":1}'
+
+    def get_page(self, scroll_id: str) -> Response:
+        """Страница документов scroll, которая собирается из сохранённых тел документов без их повторной сериализации.
+
+        Args:
+            scroll_id: Идентификатор scroll
+
+        Returns:
+            Response: Код и тело ответа
+        """
+        state = self.scrolls[scroll_id]
+        start = state['position']
+        state['position'] += state['size']
+        hits = b','.join(
+            ElasticResponses.get_hit(state['index'], doc_id, source, state['fields'])
+            for doc_id, source in itertools.islice(state['documents'], start, start + state['size'])
+        )
+        return http.HTTPStatus.OK, b''.join((
+            b'{"_scroll_id":', orjson.dumps(scroll_id), b',"took":0,"timed_out":false,"_shards":',
+            ElasticResponses.shards, b',"hits":{"total":{"value":', str(len(state['documents'])).encode(),
+            b',"relation":"eq"},"max_score":1.0,"hits":[', hits, b']}}',
+        ))
+
+    @classmethod
+    def get_slice(cls, documents: List[Tuple[str, bytes]], part: Optional[Dict]) -> List[Tuple[str, bytes]]:
+        """Отбор документов среза scroll.
+
+        Args:
+            documents: Идентификаторы и тела документов индекса
+            part: Номер и количество срезов, по умолчанию все документы
+
+        Returns:
+            List[Tuple[str, bytes]]: Документы среза
+        """
+        if not part:
+            return documents
+        return [
+            (doc_id, source) for doc_id, source in documents
+            if zlib.crc32(doc_id.encode()) % part['max'] == part['id']
+        ]
+
+
+class ElasticResponses:
+    """Тела ответов заглушки Elasticsearch."""
+
+    version = '7.17.9'
+    shards = b'{"total":1,"successful":1,"skipped":0,"failed":0}'
+
+    @classmethod
+    def get_info(cls) -> Response:
+        """Сведения о кластере, которые клиент проверяет перед первым запросом.
+
+        Returns:
+            Response: Код и тело ответа
+        """
+        return http.HTTPStatus.OK, orjson.dumps({
+            'name': 'stub',
+            'cluster_name': 'stub',
+            'version': {'number': cls.version, 'build_flavor': 'default', 'lucene_version': '8.11.1'},
+            'tagline': 'You Know, for Search',
+        })
+
+    @classmethod
+    def get_error(cls, status: int, error: str, reason: str) -> Response:
+        """Ответ с ошибкой в формате Elasticsearch.
+
+        Args:
+            status: Код ответа
+            error: Тип ошибки
+            reason: Описание ошибки
+
+        Returns:
+            Response: Код и тело ответа
+        """
+        cause = {'type': error, 'reason': reason}
+        return status, orjson.dumps({'error': {'root_cause': [cause], **cause}, 'status': status})
+
+    @classmethod
+    def get_count(cls, count: int) -> Response:
+        """Ответ на подсчёт документов индекса.
+
+        Args:
+            count: Количество документов
+
+        Returns:
+            Response: Код и тело ответа
+        """
+        return http.HTTPStatus.OK, b''.join((b'{"count":', str(count).encode(), b',"_shards":', cls.shards, b'}'))
+
+    @classmethod
+    def get_hit(cls, index: str, doc_id: str, source: bytes, fields: Optional[set]) -> bytes:
+        """Документ страницы scroll с телом, отфильтрованным по запрошенным полям.
+
+        Args:
+            index: Название индекса
+            doc_id: Идентификатор документа
+            source: Сохранённое тело документа
+            fields: Запрошенные поля, по умолчанию все поля
+
+        Returns:
+            bytes: Документ страницы
+        """
+        if fields is not None:
+            source = orjson.dumps({field: value for field, value in orjson.loads(source).items() if field in fields})
+        return b''.join((
+            b'{"_index":', orjson.dumps(index), b',"_type":"_doc","_id":', orjson.dumps(doc_id),
+            b',"_score":1.0,"_source":', source, b'}',
+        ))
+
+
+class ElasticStubHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов HTTP, который передаёт их заглушке Elasticsearch."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    stub: ElasticStub
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Обработка запроса GET."""
+        self.respond()
+
+    def do_HEAD(self) -> None:  # noqa: N802
+        """Обработка запроса HEAD."""
+        self.respond()
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Обработка запроса POST."""
+        self.respond()
+
+    def do_PUT(self) -> None:  # noqa: N802
+        """Обработка запроса PUT."""
+        self.respond()
+
+    def do_DELETE(self) -> None:  # noqa: N802
+        """Обработка запроса DELETE."""
+        self.respond()
+
+    def respond(self) -> None:
+        """Чтение тела запроса и отправка ответа заглушки."""
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        status, payload = self.stub.dispatch(self.command, self.path, body)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('X-Elastic-Product', 'Elasticsearch')
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, WPS125
+        """Отключение журнала запросов, чтобы он не смешивался с отчётом замеров.
+
+        Args:
+            format: Шаблон сообщения
+            args: Аргументы шаблона
+        """
@@ -0,0 +1,146 @@
+import os
+from typing import Any, Dict, Optional
+
+import sqlalchemy
+
+from app.enums import DatabaseType, DataType
+from app.etl.connections import ConnectionRegistry
+from app.benchmarks.elastic_stub import ElasticStub
+from app.models import Column, Database, Model, Process, Relationship
+
+
+class BenchmarkFixtures:
+    """Метаданные процессов замеров и очистка их получателей.
+
+    Метаданные процессов повторяют процесс фильмов из примера: жанры, режиссёры и имена актёров и сценаристов
+    плоскими списками, актёры и сценаристы вложенными объектами.
+    """
+
+    prefix = 'benchmark'
+    table = 'movies'
+    columns = (
+        ('id', DataType.UUID, None, None),
+        ('title', DataType.str, None, None),
+        ('description', DataType.str, 'None', None),
+        ('creation_date', DataType.date, 'None', None),
+        ('rating', DataType.float, 'None', 'imdb_rating'),
+        ('type', DataType.str, None, None),
+    )
+    relation_fields = ('related_name', 'table', 'through_table', 'flat', 'condition')
+    relations = (
+        ('genre', 'genre', 'genre_film_work', True, None),
+        ('director', 'person', 'person_film_work', True, "role == 'director'"),
+        ('actors_names', 'person', 'person_film_work', True, "role == 'actor'"),
+        ('writers_names', 'person', 'person_film_work', True, "role == 'writer'"),
+        ('actors', 'person', 'person_film_work', False, "role == 'actor'"),
+        ('writers', 'person', 'person_film_work', False, "role == 'writer'"),
+    )
+
+    @classmethod
+    def create_process(cls, source_path: str, target: str, uri: str, chunk_size: Optional[int] = None) -> Process:
+        """Создание метаданных процесса передачи фильмов в получателя.
+
+        Args:
+            source_path: Путь к базе источника из SyntheticMovies
+            target: Тип получателя
+            uri: Адрес получателя
+            chunk_size: Размер части для передачи данных частями
+
+        Returns:
+            Process: Процесс
+        """
+        source, _ = Database.objects.get_or_create(
+            slug='{prefix}-source'.format(prefix=cls.prefix),
+            defaults={'type': DatabaseType.sqlite, 'uri': 'sqlite:///{path}'.format(path=source_path)},
+        )
+        slug = '{prefix}-{target}'.format(prefix=cls.prefix, target=target)
+        process = Process.objects.create(
+            slug=slug,
+            source=source,
+            target=Database.objects.create(slug=slug, type=target, uri=uri),
+            from_table='film_work',
+            to_table=cls.table,
+            model=cls.create_model('{slug}-movies'.format(slug=slug), cls.columns),
+            chunk_size=chunk_size,
+        )
+        cls.create_relations(process, slug)
+        return Process.objects.get(id=process.id)
+
+    @classmethod
+    def create_relations(cls, process: Process, slug: str) -> None:
+        """Создание связей процесса фильмов с жанрами и персонами.
+
+        Args:
+            process: Процесс
+            slug: Название процесса, с которого начинаются названия моделей связей
+        """
+        models = {
+            'genre': cls.create_model('{slug}-genre'.format(slug=slug), (('name', DataType.str, None, None),)),
+            'person': cls.create_model('{slug}-person'.format(slug=slug), (
+                ('id', DataType.UUID, None, None), ('full_name', DataType.str, None, 'name'),
+            )),
+            'name': cls.create_model('{slug}-name'.format(slug=slug), (('full_name', DataType.str, None, None),)),
+        }
+        for fields in cls.relations:
+            relation: Dict[str, Any] = dict(zip(cls.relation_fields, fields))
+            Relationship.objects.create(
+                process=process,
+                model=models['name' if relation['flat'] and relation['table'] == 'person' else relation['table']],
+                **relation,
+            )
+
+    @classmethod
+    def create_model(cls, title: str, columns: tuple) -> Model:
+        """Создание модели данных с колонками.
+
+        Args:
+            title: Название модели
+            columns: Название, тип, значение по умолчанию и псевдоним каждой колонки
+
+        Returns:
+            Model: Модель данных
+        """
+        model = Model.objects.create(title=title)
+        Column.objects.bulk_create(
+            Column(model=model, name=name, type=col_type, default=default, alias=alias)
+            for name, col_type, default, alias in columns
+        )
+        return model
+
+    @classmethod
+    def cleanup(cls) -> None:
+        """Удаление метаданных замеров вместе с задачами и историей запусков процессов."""
+        for process in Process.objects.filter(slug__startswith=cls.prefix):
+            process.delete()
+        Model.objects.filter(title__startswith=cls.prefix).delete()
+        Database.objects.filter(slug__startswith=cls.prefix).delete()
+
+    @classmethod
+    def reset(cls, process: Process, stub: ElasticStub) -> None:
+        """Очистка получателя процесса перед загрузкой.
+
+        Args:
+            process: Процесс
+            stub: Заглушка Elasticsearch
+        """
+        if process.target.type == DatabaseType.elasticsearch:
+            stub.reset()
+            return
+        with ConnectionRegistry.sql_engine(process.target.uri).begin() as sql_conn:
+            sql_conn.execute(sqlalchemy.text('DROP TABLE IF EXISTS {table}'.format(table=process.to_table)))
+
+    @classmethod
+    def get_target_uri(cls, target: str, workdir: str, elastic_uri: str) -> str:
+        """Адрес получателя замеров.
+
+        Args:
+            target: Тип получателя
+            workdir: Папка для получателей SQLite
+            elastic_uri: Адрес заглушки Elasticsearch
+
+        Returns:
+            str: Адрес получателя
+        """
+        if target == DatabaseType.sqlite:
+            return 'sqlite:///{path}'.format(path=os.path.join(workdir, 'target.sqlite'))
+        return elastic_uri
@@ -0,0 +1,59 @@
+from typing import Dict, Iterator, List, Tuple
+
+import pandas as pd
+
+
+def legacy_data_changes(src: pd.DataFrame, dest: pd.DataFrame, idx_col: str) -> Tuple[pd.DataFrame, ...]:
+    """Прежняя реализация сравнения датафреймов через кортежи строк, оставленная для сравнения скорости.
+
+    Args:
+        src: Датафрейм источника
+        dest: Датафрейм получателя
+        idx_col: Название колонки для индексации данных
+
+    Returns:
+        tuple[pandas.DataFrame, ...]: Датафреймы с новыми, обновленными и удаленными данными
+    """
+    dest.set_index(idx_col, inplace=True, drop=False)
+    changes = src[~src.apply(tuple, axis='columns').isin(dest.apply(tuple, axis='columns'))]
+    deleted = dest[  # type: ignore[call-overload]
+        ~dest.apply(tuple, axis='columns').isin(src.apply(tuple, axis='columns'))
+    ].drop(changes.index.values, errors='ignore')
+    new = changes[~changes[idx_col].isin(dest[idx_col])]
+    modified = changes[changes[idx_col].isin(dest[idx_col])]
+    return new, modified, deleted
+
+
+def legacy_actions(df: pd.DataFrame, index: str) -> Iterator[Dict]:
+    """Прежнее построчное построение действий массовой вставки, оставленное для сравнения скорости.
+
+    Args:
+        df: Датафрейм
+        index: Название индекса
+
+    Yields:
+        Iterator[Dict]: Действия массовой вставки
+    """
+    for idx, document in df.iterrows():
+        yield {
+            '_index': index,
+            '_id': idx,
+            '_source': document.to_dict(),
+        }
+
+
+def legacy_nested(df: pd.DataFrame, by: str, columns: List[str], flat: bool) -> pd.Series:
+    """Прежняя группировка вложенных объектов с вызовом функции для каждой группы, оставленная для сравнения скорости.
+
+    Args:
+        df: Датафрейм
+        by: Колонка с ключом группы
+        columns: Колонки вложенных объектов
+        flat: Собирать плоский список значений вместо списка словарей
+
+    Returns:
+        pd.Series: Списки вложенных объектов, проиндексированные по ключу группы
+    """
+    return df.groupby(by=by)[columns].apply(
+        func=lambda row: list(row.to_numpy().flat) if flat else row.to_dict('records'),
+    )
@@ -0,0 +1,63 @@
+from django.core.management.base import OutputWrapper
+from elasticsearch.serializer import JSONSerializer
+
+from app.benchmarks.legacy import legacy_actions, legacy_data_changes, legacy_nested
+from app.benchmarks.samples import BenchmarkSamples
+from app.etl.aggregation import Aggregation
+from app.etl.crud.elastic_bulk import ElasticBulk
+from app.etl.serializers import OrjsonSerializer
+
+
+class OperationBenchmarks:
+    """Замеры отдельных ETL-сервисов в сравнении с их прежними реализациями."""
+
+    @classmethod
+    def diff(cls, rows: int, stdout: OutputWrapper) -> None:
+        """Замер сравнения датафреймов источника и получателя в Aggregation.get_data_changes.
+
+        Args:
+            rows: Количество строк в датафрейме источника
+            stdout: Вывод команды
+        """
+        for nested in (False, True):
+            src, dest = BenchmarkSamples.get_diff_frames(rows, nested)
+            current = BenchmarkSamples.measure(Aggregation.get_data_changes, src, dest)
+            legacy = BenchmarkSamples.measure(legacy_data_changes, src, dest)
+            stdout.write('diff rows={rows} nested={nested}: current={current} legacy={legacy}'.format(
+                rows=rows, nested=nested, current=current, legacy=legacy,
+            ))
+
+    @classmethod
+    def bulk(cls, rows: int, stdout: OutputWrapper) -> None:
+        """Замер построения и сериализации тел запросов массовой вставки в Elasticsearch без отправки в кластер.
+
+        Args:
+            rows: Количество документов
+            stdout: Вывод команды
+        """
+        df = BenchmarkSamples.get_diff_frames(rows, nested=True)[0]
+        legacy = BenchmarkSamples.timed(BenchmarkSamples.serialize, legacy_actions(df, 'movies'), JSONSerializer())[1]
+        current = BenchmarkSamples.timed(
+            BenchmarkSamples.serialize, ElasticBulk.get_actions(df, 'movies'), OrjsonSerializer(),
+        )[1]
+        stdout.write('bulk rows={rows}: current={current:.3f}s ({rate:.0f} docs/s) legacy={legacy:.3f}s'.format(
+            rows=len(df), current=current, rate=len(df) / current, legacy=legacy,
+        ))
+
+    @classmethod
+    def nested(cls, rows: int, stdout: OutputWrapper) -> None:
+        """Замер группировки связанных строк в списки вложенных объектов в Aggregation.get_nested.
+
+        Args:
+            rows: Количество строк связей
+            stdout: Вывод команды
+        """
+        df = BenchmarkSamples.get_nested_frame(rows)
+        for flat, columns in ((False, ['id', 'name']), (True, ['name'])):
+            current = BenchmarkSamples.timed(Aggregation.get_nested, df, 'film_work_id', columns, flat)
+            legacy = BenchmarkSamples.timed(legacy_nested, df, 'film_work_id', columns, flat)
+            stdout.write(
+                'nested rows={rows} flat={flat}: current={current:.3f}s legacy={legacy:.3f}s equal={equal}'.format(
+                    rows=rows, flat=flat, current=current[1], legacy=legacy[1], equal=current[0].equals(legacy[0]),
+                ),
+            )
@@ -0,0 +1,108 @@
+import time
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+from elasticsearch.helpers import expand_action
+from elasticsearch.serializer import JSONSerializer
+
+
+class BenchmarkSamples:
+    """Синтетические данные для замеров отдельных ETL-сервисов и замер времени их работы."""
+
+    @classmethod
+    def get_diff_frames(cls, rows: int, nested: bool) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Генерация датафреймов источника и получателя, отличающихся на 1% новых, изменённых и удалённых строк.
+
+        Args:
+            rows: Количество строк
+            nested: Добавлять ли колонки со списками вложенных объектов
+
+        Returns:
+            Tuple[pd.DataFrame, pd.DataFrame]: Датафреймы источника и получателя
+        """
+        rng = np.random.default_rng(0)
+        ids = pd.Series(np.arange(rows + rows // 100)).map('{0:032x}'.format)
+        df = pd.DataFrame({
+            'id': ids,
+            'title': ids.map('film {0}'.format),
+            'rating': np.where(rng.integers(10, size=len(ids)) == 0, np.nan, rng.integers(100, size=len(ids)) / 10),
+            'creation_date': pd.Series(pd.date_range('2000-01-01', periods=len(ids), freq='h').date),
+        })
+        if nested:
+            df['genres'] = [['genre{0}'.format(num % 20), 'genre{0}'.format(num % 7)] for num in range(len(ids))]
+            df['actors'] = [[{'id': film_id.upper(), 'name': 'person'}] for film_id in ids]
+        df = df.set_index('id', drop=False)
+        dest = df.iloc[:rows].copy()
+        src = df.iloc[rows // 100:].copy()
+        src.iloc[:rows // 100, src.columns.get_loc('title')] = 'changed'
+        return src, dest
+
+    @classmethod
+    def get_nested_frame(cls, rows: int) -> pd.DataFrame:
+        """Генерация строк связей фильмов с персонами, по три связи на фильм в среднем.
+
+        Args:
+            rows: Количество строк связей
+
+        Returns:
+            pd.DataFrame: Датафрейм связей
+        """
+        rng = np.random.default_rng(0)
+        parents = pd.Series(np.arange(max(rows // 3, 1))).map('{0:032x}'.format).to_numpy()
+        return pd.DataFrame({
+            'film_work_id': rng.choice(parents, size=rows),
+            'id': pd.Series(rng.integers(rows, size=rows)).map('{0:032x}'.format),
+            'name': pd.Series(rng.integers(1000, size=rows)).map('person {0}'.format),
+        })
+
+    @classmethod
+    def timed(cls, func: Callable, *args: Any) -> Tuple[Any, float]:
+        """Выполнение функции с замером времени.
+
+        Args:
+            func: Функция
+            args: Аргументы функции
+
+        Returns:
+            Tuple[Any, float]: Результат функции и время выполнения в секундах
+        """
+        start = time.perf_counter()
+        result = func(*args)
+        return result, time.perf_counter() - start
+
+    @classmethod
+    def serialize(cls, actions: Iterator[Dict], serializer: JSONSerializer) -> int:
+        """Сериализация действий массовой операции так же, как это делают хелперы клиента Elasticsearch.
+
+        Args:
+            actions: Действия массовой операции
+            serializer: Сериализатор JSON
+
+        Returns:
+            int: Размер тел запросов в байтах
+        """
+        return sum(
+            len(serializer.dumps(line).encode('utf-8')) + 1
+            for action in actions
+            for line in filter(None, expand_action(action))
+        )
+
+    @classmethod
+    def measure(cls, func: Callable, src: pd.DataFrame, dest: pd.DataFrame) -> str:
+        """Замер времени выполнения функции сравнения.
+
+        Args:
+            func: Функция сравнения датафреймов
+            src: Датафрейм источника
+            dest: Датафрейм получателя
+
+        Returns:
+            str: Время выполнения в секундах или описание ошибки
+        """
+        start = time.perf_counter()
+        try:
+            func(src.copy(), dest.copy(), 'id')
+        except TypeError as exc:
+            return 'error ({exc})'.format(exc=exc)
+        return '{seconds:.3f}s'.format(seconds=time.perf_counter() - start)
@@ -0,0 +1,110 @@
+import gc
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+from django.test.utils import override_settings
+
+from app.etl.operators import Join, Load, Select, Transform
+from app.etl.transfer import Targets
+from app.models import Process
+
+Timings = Dict[str, float]
+
+
+class StageTimer:
+    """Лучшее время этапов по итогам нескольких замеров."""
+
+    def __init__(self) -> None:
+        """При инициализации замеров нет."""
+        self.timings: Timings = {}
+
+    def measure(self, stage: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Замер времени выполнения этапа после сборки мусора, которая иначе попадала бы в замер.
+
+        Args:
+            stage: Название этапа
+            func: Функция этапа
+            args: Позиционные аргументы функции
+            kwargs: Именованные аргументы функции
+
+        Returns:
+            Any: Результат функции
+        """
+        gc.collect()
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - started
+        self.timings[stage] = min(self.timings.get(stage, elapsed), elapsed)
+        return result
+
+
+class BenchmarkStages:
+    """Замеры операторов ETL по отдельности на данных процесса."""
+
+    changed_share = 100
+
+    @classmethod
+    def run_operators(cls, process: Process, timer: StageTimer) -> pd.DataFrame:
+        """Замер извлечения, объединения, преобразования и загрузки данных процесса.
+
+        Args:
+            process: Процесс
+            timer: Время этапов
+
+        Returns:
+            pd.DataFrame: Загруженный в получателя датафрейм
+        """
+        relations = process.relationships.all()
+        source, table = process.source, process.from_table
+        df = timer.measure('select', pd.DataFrame().pipe, Select, source, table, columns=process.source_columns)
+        df = timer.measure('join', df.pipe, Join, source, table, relations, process.index_col)
+        df = timer.measure('transform', df.pipe, Transform, process.model, relations)
+        timer.measure('load', df.pipe, Load, process.target, process.to_table)
+        Targets.refresh(process)
+        return df
+
+    @classmethod
+    def run_sync(cls, process: Process, df: pd.DataFrame, timer: StageTimer) -> Optional[str]:
+        """Замер синхронизации получателя оператором Sync с чтением данных получателя, без снимка состояния.
+
+        Args:
+            process: Процесс
+            df: Загруженный в получателя датафрейм
+            timer: Время этапов
+
+        Returns:
+            Optional[str]: Описание проблемы, если синхронизация изменила не те строки
+        """
+        source_df = cls.get_changed_source(df, process.index_col)
+        with override_settings(ETL_SYNC_STATE=False):
+            synced = timer.measure('sync', Targets.sync_target, source_df, process.primary_target)
+        expected = max(len(df) // cls.changed_share, 1)
+        changes = (synced.inserted_rows, synced.updated_rows, synced.deleted_rows)
+        if changes == (expected,) * 3:
+            return None
+        return '{target}: sync changes {changes}, expected {expected} of each'.format(
+            target=process.target.type, changes=changes, expected=expected,
+        )
+
+    @classmethod
+    def get_changed_source(cls, df: pd.DataFrame, idx_col: str) -> pd.DataFrame:
+        """Изменение загруженных в получателя данных для замера синхронизации.
+
+        Из данных удаляется, изменяется и добавляется к ним по одной сотой строк.
+
+        Args:
+            df: Загруженный в получателя датафрейм
+            idx_col: Колонка для индексации данных
+
+        Returns:
+            pd.DataFrame: Датафрейм источника для синхронизации
+        """
+        share = max(len(df) // cls.changed_share, 1)
+        added = df.iloc[:share].copy()
+        added[idx_col] = [uuid.uuid5(uuid.NAMESPACE_OID, str(num)) for num in range(share)]
+        added.index = pd.Index(added[idx_col], name=df.index.name)
+        changed = pd.concat([df.iloc[share:], added])
+        changed.iloc[:share, changed.columns.get_loc('title')] = 'Changed movie'
+        return changed
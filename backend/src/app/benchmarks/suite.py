@@ -0,0 +1,104 @@
+import contextlib
+import os
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional
+
+from django.test.utils import override_settings
+
+from app.enums import DatabaseType
+from app.benchmarks.elastic_stub import ElasticStub
+from app.benchmarks.fixtures import BenchmarkFixtures
+from app.benchmarks.stages import BenchmarkStages, StageTimer, Timings
+from app.benchmarks.synthetic import SyntheticMovies
+from app.models import Process
+from app.tasks import sync_data, transfer_data
+
+
+class BenchmarkSuite:
+    """Замеры операторов ETL и задач процесса целиком на синтетической базе фильмов.
+
+    Метаданные процессов создаются на время замеров и удаляются после них.
+    Каждый этап замеряется несколько раз, в результат попадает лучшее время.
+    """
+
+    stages = ('select', 'join', 'transform', 'load', 'sync', 'transfer_data', 'sync_data')
+    targets = (DatabaseType.sqlite, DatabaseType.elasticsearch)
+
+    def __init__(self, workdir: str, source: str, stub: ElasticStub, elastic_uri: str):
+        """При инициализации ожидает получить рабочую папку, базу источника и заглушку Elasticsearch.
+
+        Args:
+            workdir: Папка для получателей SQLite и снимков состояния
+            source: Путь к базе источника из SyntheticMovies
+            stub: Заглушка Elasticsearch
+            elastic_uri: Адрес заглушки
+        """
+        self.workdir = workdir
+        self.source = source
+        self.stub = stub
+        self.elastic_uri = elastic_uri
+        self.problems: List[str] = []
+
+    @classmethod
+    @contextlib.contextmanager
+    def session(
+        cls, data_dir: str, rows: int, extract_cache: bool = False,
+    ) -> Iterator['BenchmarkSuite']:
+        """Подготовка окружения замеров для базы с заданным количеством фильмов.
+
+        Снимки состояния получателей хранятся во временной папке. Кэш извлечённых таблиц по умолчанию
+        отключается, иначе повторные замеры извлечения читали бы кэш вместо источника.
+
+        Args:
+            data_dir: Папка для сгенерированных баз
+            rows: Количество фильмов
+            extract_cache: Не отключать кэш извлечённых таблиц
+
+        Yields:
+            Iterator[BenchmarkSuite]: Набор замеров
+        """
+        stub = ElasticStub()
+        with contextlib.ExitStack() as stack:
+            workdir = stack.enter_context(tempfile.TemporaryDirectory(prefix='etl-benchmark-'))
+            suite = cls(workdir, SyntheticMovies.create(data_dir, rows), stub, stack.enter_context(stub.running()))
+            options: Dict[str, Any] = {'ETL_STATE_DIR': os.path.join(workdir, 'state')}
+            if not extract_cache:
+                options['ETL_EXTRACT_CACHE_MAX_BYTES'] = 0
+            stack.enter_context(override_settings(**options))
+            BenchmarkFixtures.cleanup()
+            stack.callback(BenchmarkFixtures.cleanup)
+            yield suite
+
+    def run(self, target: str, repeat: int = 1, chunk_size: Optional[int] = None) -> Timings:
+        """Замер этапов передачи фильмов в получателя.
+
+        Args:
+            target: Тип получателя из BenchmarkSuite.targets
+            repeat: Количество повторов каждого этапа
+            chunk_size: Размер части для передачи данных частями в замерах задач целиком
+
+        Returns:
+            Timings: Лучшее время каждого этапа в секундах
+        """
+        process = BenchmarkFixtures.create_process(
+            self.source, target, BenchmarkFixtures.get_target_uri(target, self.workdir, self.elastic_uri), chunk_size,
+        )
+        timer = StageTimer()
+        for _ in range(repeat):
+            self.run_stages(process, timer)
+        return timer.timings
+
+    def run_stages(self, process: Process, timer: StageTimer) -> None:
+        """Один замер всех этапов: операторов по отдельности и задач передачи и синхронизации целиком.
+
+        Args:
+            process: Процесс
+            timer: Лучшее время этапов, которое обновляется по итогам замера
+        """
+        BenchmarkFixtures.reset(process, self.stub)
+        problem = BenchmarkStages.run_sync(process, BenchmarkStages.run_operators(process, timer), timer)
+        if problem:
+            self.problems.append(problem)
+        BenchmarkFixtures.reset(process, self.stub)
+        timer.measure('transfer_data', transfer_data, process.id)
+        timer.measure('sync_data', sync_data, process.id)
@@ -0,0 +1,192 @@
+import contextlib
+import os
+import sqlite3
+import uuid
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+class SyntheticMovies:
+    """Генератор синтетической базы фильмов SQLite со схемой таблиц content из movies_database.sql.
+
+    На каждый фильм приходится два жанра и три персоны в ролях актёра, сценариста и режиссёра. Данные зависят
+    только от количества фильмов, поэтому сгенерированный файл переиспользуется между запусками замеров.
+    """
+
+    version = 1
+    genres = 30
+    genres_per_film = 2
+    roles = ('actor', 'writer', 'director')
+    created = '2021-06-16 20:14:09.221838+00'
+    schema = (
+        'CREATE TABLE film_work (id TEXT PRIMARY KEY, title TEXT NOT NULL, description TEXT, creation_date TEXT, '
+        'rating REAL, type TEXT NOT NULL, created TEXT, modified TEXT)',
+        'CREATE TABLE genre (id TEXT PRIMARY KEY, name TEXT NOT NULL, description TEXT, created TEXT, modified TEXT)',
+        'CREATE TABLE person (id TEXT PRIMARY KEY, full_name TEXT NOT NULL, created TEXT, modified TEXT)',
+        'CREATE TABLE genre_film_work (id TEXT PRIMARY KEY, film_work_id TEXT NOT NULL, genre_id TEXT NOT NULL, '
+        'created TEXT)',
+        'CREATE TABLE person_film_work (id TEXT PRIMARY KEY, film_work_id TEXT NOT NULL, person_id TEXT NOT NULL, '
+        'role TEXT NOT NULL, created TEXT)',
+        'CREATE INDEX genre_film_work_film_work_id ON genre_film_work (film_work_id)',
+        'CREATE INDEX person_film_work_film_work_id ON person_film_work (film_work_id)',
+    )
+
+    @classmethod
+    def create(cls, directory: str, rows: int) -> str:
+        """Получение файла базы с заданным количеством фильмов, файл генерируется, если его ещё нет.
+
+        Args:
+            directory: Папка для сгенерированных баз
+            rows: Количество фильмов
+
+        Returns:
+            str: Путь к файлу базы
+        """
+        path = os.path.join(directory, 'movies-{rows}-v{version}.sqlite'.format(rows=rows, version=cls.version))
+        if not os.path.exists(path):
+            os.makedirs(directory, exist_ok=True)
+            partial = '{path}.partial'.format(path=path)
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(partial)
+            cls.generate(partial, rows)
+            os.replace(partial, path)
+        return path
+
+    @classmethod
+    def generate(cls, path: str, rows: int) -> None:
+        """Генерация базы фильмов.
+
+        Args:
+            path: Путь к файлу базы
+            rows: Количество фильмов
+        """
+        with contextlib.closing(sqlite3.connect(path)) as conn:
+            conn.execute('PRAGMA journal_mode = OFF')
+            conn.execute('PRAGMA synchronous = OFF')
+            for statement in cls.schema:
+                conn.execute(statement)
+            for table, df in cls.get_tables(rows).items():
+                conn.executemany(
+                    'INSERT INTO {table} VALUES ({params})'.format(table=table, params=', '.join('?' * df.shape[1])),
+                    df.itertuples(index=False, name=None),
+                )
+            conn.commit()
+
+    @classmethod
+    def get_tables(cls, rows: int) -> Dict[str, pd.DataFrame]:
+        """Генерация таблиц базы фильмов.
+
+        Args:
+            rows: Количество фильмов
+
+        Returns:
+            Dict[str, pd.DataFrame]: Датафреймы таблиц по их названиям
+        """
+        rng = np.random.default_rng(rows)
+        film_ids = cls.get_ids(rng, rows)
+        genre_ids = cls.get_ids(rng, cls.genres)
+        person_ids = cls.get_ids(rng, max(rows // 2, len(cls.roles)))
+        return {
+            'film_work': cls.get_film_work(rng, film_ids),
+            'genre': pd.DataFrame({
+                'id': genre_ids,
+                'name': ['Genre {0}'.format(num) for num in range(cls.genres)],
+                'description': None,
+                'created': cls.created,
+                'modified': cls.created,
+            }),
+            'person': pd.DataFrame({
+                'id': person_ids,
+                'full_name': pd.Series(range(len(person_ids))).map('Person {0}'.format),
+                'created': cls.created,
+                'modified': cls.created,
+            }),
+            'genre_film_work': cls.get_genre_links(rng, film_ids, genre_ids),
+            'person_film_work': cls.get_person_links(rng, film_ids, person_ids),
+        }
+
+    @classmethod
+    def get_film_work(cls, rng: np.random.Generator, film_ids: List[str]) -> pd.DataFrame:
+        """Генерация фильмов, часть необязательных полей которых не заполнена.
+
+        Args:
+            rng: Генератор случайных чисел
+            film_ids: Идентификаторы фильмов
+
+        Returns:
+            pd.DataFrame: Таблица фильмов
+        """
+        rows = len(film_ids)
+        return pd.DataFrame({
+            'id': film_ids,
+            'title': pd.Series(rng.integers(10 ** 6, size=rows)).map('Movie {0}'.format),
+            'description': pd.Series(rng.integers(10 ** 6, size=rows)).map('Plot of movie {0}.'.format).where(
+                rng.integers(10, size=rows) > 0, None,
+            ),
+            'creation_date': pd.Series(
+                pd.Timestamp('1950-01-01') + pd.to_timedelta(rng.integers(365 * 70, size=rows), unit='D'),
+            ).dt.strftime('%Y-%m-%d').where(rng.integers(5, size=rows) > 0, None),
+            'rating': np.where(rng.integers(20, size=rows) > 0, rng.integers(100, size=rows) / 10, np.nan),
+            'type': np.where(rng.integers(10, size=rows) > 2, 'movie', 'tv_show'),
+            'created': cls.created,
+            'modified': cls.created,
+        })
+
+    @classmethod
+    def get_genre_links(cls, rng: np.random.Generator, film_ids: List[str], genre_ids: List[str]) -> pd.DataFrame:
+        """Генерация связей фильмов с соседними по списку жанрами.
+
+        Args:
+            rng: Генератор случайных чисел
+            film_ids: Идентификаторы фильмов
+            genre_ids: Идентификаторы жанров
+
+        Returns:
+            pd.DataFrame: Таблица связей фильмов и жанров
+        """
+        rows = len(film_ids)
+        offsets = np.tile(np.arange(cls.genres_per_film), rows)
+        return pd.DataFrame({
+            'id': cls.get_ids(rng, rows * cls.genres_per_film),
+            'film_work_id': np.repeat(film_ids, cls.genres_per_film),
+            'genre_id': np.asarray(genre_ids)[
+                (np.repeat(rng.integers(cls.genres, size=rows), cls.genres_per_film) + offsets) % cls.genres
+            ],
+            'created': cls.created,
+        })
+
+    @classmethod
+    def get_person_links(cls, rng: np.random.Generator, film_ids: List[str], person_ids: List[str]) -> pd.DataFrame:
+        """Генерация связей фильмов со случайными персонами в каждой из ролей.
+
+        Args:
+            rng: Генератор случайных чисел
+            film_ids: Идентификаторы фильмов
+            person_ids: Идентификаторы персон
+
+        Returns:
+            pd.DataFrame: Таблица связей фильмов и персон
+        """
+        links = len(film_ids) * len(cls.roles)
+        return pd.DataFrame({
+            'id': cls.get_ids(rng, links),
+            'film_work_id': np.repeat(film_ids, len(cls.roles)),
+            'person_id': np.asarray(person_ids)[rng.integers(len(person_ids), size=links)],
+            'role': np.tile(cls.roles, len(film_ids)),
+            'created': cls.created,
+        })
+
+    @classmethod
+    def get_ids(cls, rng: np.random.Generator, count: int) -> List[str]:
+        """Генерация случайных идентификаторов UUID.
+
+        Args:
+            rng: Генератор случайных чисел
+            count: Количество идентификаторов
+
+        Returns:
+            List[str]: Идентификаторы в текстовом виде
+        """
+        return [str(uuid.UUID(bytes=bytes(raw))) for raw in np.frombuffer(rng.bytes(16 * count), dtype='V16')]
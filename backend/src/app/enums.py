@@ -33,3 +33,10 @@ class ProcessStatus(models.TextChoices):
 
     active = 'active'
     disabled = 'disabled'
+
+
+class RunStatus(models.TextChoices):
+    """Вспомогательная модель для выбора итога запуска процесса."""
+
+    success = 'success'
+    failure = 'failure'
@@ -1,7 +1,10 @@
-from typing import Dict, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from app.etl.crud import Columns
+from app.etl.hashing import Comparable, Hashing
 from app.models import Relationship
 
 
@@ -21,40 +24,137 @@ class Aggregation:
         Returns:
             pd.DataFrame: Датафрейм, состоящий из полученной колонки
         """
-        return (
-            pd.merge(
-                left=dfs[relation.through_table].drop(idx_col, axis='columns'),
-                right=dfs[relation.table],
-                how='left',
-                left_on=relation.table + relation.suffix,
-                right_on=idx_col,
-            )
-            .query(relation.condition if relation.condition is not None else 'index == index')
-            .groupby(by=tbl + relation.suffix)[[col.name for col in relation.model.columns.all()]]
-            .apply(func=lambda row: list(row.to_numpy().flat) if relation.flat else row.to_dict('records'))
-            .to_frame(relation.related_name)
+        merged = pd.merge(
+            left=dfs[relation.through_table].drop(idx_col, axis='columns'),
+            right=dfs[relation.table],
+            how='left',
+            left_on=relation.table + relation.suffix,
+            right_on=idx_col,
+        ).query(relation.condition if relation.condition is not None else 'index == index')
+        columns = [col.name for col in relation.model.columns.all()]
+        return Aggregation.get_nested(merged, tbl + relation.suffix, columns, relation.flat).to_frame(
+            relation.related_name,
         )
 
     @staticmethod
-    def get_data_changes(src: pd.DataFrame, dest: pd.DataFrame, idx_col: str) -> Tuple[pd.DataFrame, ...]:
-        """Функция для сравения датафреймов таблиц источника и получателя данных.
+    def get_nested(df: pd.DataFrame, by: str, columns: List[str], flat: bool) -> pd.Series:
+        """Группировка строк в списки вложенных объектов без вызова функции Python для каждой группы.
+
+        Строки сортируются по ключу группы, после чего списки нарезаются по границам групп. Результат совпадает
+        с groupby(by)[columns].apply: группы отсортированы по ключу, строки с пустым ключом отбрасываются,
+        порядок строк внутри группы сохраняется.
+
+        Args:
+            df: Датафрейм
+            by: Колонка с ключом группы
+            columns: Колонки вложенных объектов
+            flat: Собирать плоский список значений вместо списка словарей
+
+        Returns:
+            pd.Series: Списки вложенных объектов, проиндексированные по ключу группы
+        """
+        codes, uniques = pd.factorize(df[by], sort=True)
+        order = np.argsort(codes, kind='stable')
+        order = order[codes[order] >= 0]
+        width = len(columns) if flat else 1
+        ends = np.cumsum(np.bincount(codes[order], minlength=len(uniques))) * width
+        return pd.Series(
+            Aggregation.split_groups(Aggregation.get_nested_values(df[columns].iloc[order], flat), ends),
+            index=pd.Index(uniques, name=by),
+            dtype=object,
+        )
+
+    @staticmethod
+    def get_nested_values(rows: pd.DataFrame, flat: bool) -> List[Any]:
+        """Получение вложенных объектов всех групп подряд.
+
+        Args:
+            rows: Строки вложенных объектов, отсортированные по ключу группы
+            flat: Собирать плоский список значений вместо списка словарей
+
+        Returns:
+            List[Any]: Словари строк или значения всех колонок строк по порядку
+        """
+        if flat:
+            return list(rows.to_numpy().reshape(-1))
+        return [dict(zip(rows.columns, row)) for row in zip(*rows.to_dict('list').values())]
+
+    @staticmethod
+    def split_groups(nested: List[Any], ends: np.ndarray) -> List[List[Any]]:
+        """Нарезка вложенных объектов на списки по границам групп.
+
+        Args:
+            nested: Вложенные объекты всех групп подряд
+            ends: Границы окончания групп
+
+        Returns:
+            List[List[Any]]: Списки вложенных объектов групп
+        """
+        return [nested[start:end] for start, end in zip([0, *ends[:-1].tolist()], ends.tolist())]
+
+    @staticmethod
+    def get_data_changes(
+        src: pd.DataFrame, dest: pd.DataFrame, idx_col: str, types: Optional[Columns] = None,
+    ) -> Tuple[pd.DataFrame, ...]:
+        """Функция для сравения датафреймов таблиц источника и получателя по хешам содержимого строк.
+
+        Если переданы типы колонок, строки сравниваются в виде Comparable.get_frame, поэтому данные
+        получателя можно сравнивать без преобразования в Transform.
 
         Args:
             src: Датафрейм источника
             dest: Датафрейм получателя
             idx_col: Название колонки для индексации данных
+            types: Типы данных колонок для сравнения в общем для источника и получателя виде
 
         Returns:
             tuple[pandas.DataFrame, ...]: Датафреймы с новыми, обновленными и удаленными данными
         """
         dest.set_index(idx_col, inplace=True, drop=False)
-        changes = src[~src.apply(tuple, axis='columns').isin(dest.apply(tuple, axis='columns'))]
-        deleted = dest[  # type: ignore[call-overload]
-            ~dest.apply(tuple, axis='columns').isin(src.apply(tuple, axis='columns'))
-        ].drop(changes.index.values, errors='ignore')
-        if not changes.empty:
-            new = changes[~changes[idx_col].isin(dest[idx_col])]
-            modified = changes[changes[idx_col].isin(dest[idx_col])]
-        else:
-            new, modified = changes, changes
-        return new, modified, deleted
+        src_form, dest_form = src, dest
+        if types is not None:
+            src_form, dest_form = Comparable.get_frame(src, types), Comparable.get_frame(dest, types)
+        in_dest = src_form[idx_col].isin(dest_form[idx_col]).to_numpy()
+        in_src = dest_form[idx_col].isin(src_form[idx_col]).to_numpy()
+        modified = Aggregation.get_modified(src_form[in_dest], dest_form[in_src], idx_col, src.columns)
+        return src[~in_dest], src[in_dest][modified], dest[~in_src]
+
+    @staticmethod
+    def get_modified(src: pd.DataFrame, dest: pd.DataFrame, idx_col: str, columns: pd.Index) -> np.ndarray:
+        """Сравнение хешей строк источника и получателя с одинаковыми ключами.
+
+        Args:
+            src: Строки источника, ключи которых есть в получателе
+            dest: Строки получателя, ключи которых есть в источнике
+            idx_col: Название колонки для индексации данных
+            columns: Колонки, по которым сравниваются строки
+
+        Returns:
+            np.ndarray: Маска изменённых строк источника
+        """
+        dest_hashes = pd.Series(Hashing.get_hashes(dest, columns), index=dest[idx_col].to_numpy())
+        dest_hashes = dest_hashes[~dest_hashes.index.duplicated()]
+        matched = dest_hashes.reindex(src[idx_col].to_numpy()).to_numpy()
+        return Hashing.get_hashes(src, columns) != matched
+
+    @staticmethod
+    def get_state_changes(
+        keys: pd.Index, hashes: np.ndarray, state: pd.Series, complete: bool,
+    ) -> Tuple[np.ndarray, np.ndarray, pd.Index]:
+        """Функция для сравнения строк источника со снимком состояния получателя по хешам содержимого строк.
+
+        Args:
+            keys: Ключи строк источника
+            hashes: Хеши строк источника
+            state: Хеши строк получателя с уникальными ключами в индексе
+            complete: Источник содержит все строки, поэтому отсутствующие в нём ключи снимка считаются удалёнными
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, pd.Index]: Маски новых и обновлённых строк источника и ключи удалённых строк
+        """
+        positions = state.index.get_indexer(keys)
+        in_state = positions >= 0
+        modified = in_state.copy()
+        modified[in_state] = state.to_numpy()[positions[in_state]] != hashes[in_state]
+        deleted = state.index[~state.index.isin(keys)] if complete else state.index[:0]
+        return ~in_state, modified, deleted
@@ -0,0 +1,3 @@
+from app.etl.async_crud.base import AsyncCRUD
+from app.etl.async_crud.elastic import AsyncElasticEngine
+from app.etl.async_crud.sql import AsyncPostgresEngine, AsyncSQLEngine, AsyncSQLiteEngine
@@ -0,0 +1,140 @@
+import abc
+import asyncio
+import itertools
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+import pandas as pd
+from django.conf import settings
+
+
+class AsyncLoader(abc.ABC):
+    """Абстрактный асинхронный ETL-сервис для загрузки данных."""
+
+    @abc.abstractmethod
+    async def create(self, df: pd.DataFrame, uri: str, resource: str) -> int:
+        """Вставка данных.
+
+        Args:
+            df: Датафрейм
+            uri: Имя хоста БД
+            resource: Название ресурса, куда вставляем данные
+        """
+
+    @abc.abstractmethod
+    async def update(self, df: pd.DataFrame, uri: str, resource: str) -> int:
+        """Обновление данных.
+
+        Args:
+            df: Датафрейм
+            uri: Имя хоста БД
+            resource: Название ресурса, где изменяем данные
+        """
+
+    @abc.abstractmethod
+    async def delete(self, df: pd.DataFrame, uri: str, resource: str) -> int:
+        """Удаление данных.
+
+        Args:
+            df: Датафрейм
+            uri: Имя хоста БД
+            resource: Название ресурса, от куда удаляем данные
+        """
+
+    async def refresh(self, uri: str, resource: str):
+        """Публикация загруженных данных для чтения после завершения запуска процесса.
+
+        Args:
+            uri: Имя хоста БД
+            resource: Название ресурса
+        """
+
+
+class AsyncCRUD(AsyncLoader):
+    """Абстрактный асинхронный ETL-сервис, движки которого регистрируются по типу базы данных.
+
+    Части данных отправляются одновременно: в работе находится не больше concurrency запросов
+    (по умолчанию ETL_ASYNC_CONCURRENCY), поэтому воркер не простаивает в ожидании ответа на каждый запрос.
+    """
+
+    engines: Optional[Dict] = None
+    concurrency: Optional[int] = None
+
+    def __init__(self, db_type: str):
+        """При инициализации ожидает получить тип базы данных.
+
+        Args:
+            db_type: Тип базы данных
+        """
+        self.db_type = db_type
+
+    @classmethod
+    def get_subclasses(cls) -> Iterator[type]:
+        """Вспомогательный метод для получения все наследников данного класса.
+
+        Yields:
+            Iterator[type]:  Наследники класса
+        """
+        for subclass in cls.__subclasses__():
+            yield from subclass.get_subclasses()
+            yield subclass
+
+    @classmethod
+    def get_engine(cls, db_type: str) -> 'AsyncCRUD':
+        """Получение асинхронного движка базы данных.
+
+        Args:
+            db_type: Тип БД
+
+        Returns:
+            AsyncCRUD: Объект асинхронного CRUD сервиса
+        """
+        if cls.engines is None:
+            cls.engines = {}
+            for engine_cls in cls.get_subclasses():
+                engine = engine_cls()
+                cls.engines[engine.db_type] = engine
+        return cls.engines[db_type]
+
+    async def drain(self, parts: Iterator[Any], send: Callable[[Any], Awaitable[List]]) -> List:
+        """Отправка частей данных одновременно не больше чем concurrency запросами.
+
+        Части разбирают из общего итератора несколько корутин, поэтому в памяти находятся только отправляемые
+        части. При ошибке одной отправки остальные отменяются.
+
+        Args:
+            parts: Части данных
+            send: Отправка одной части, возвращающая список результатов
+
+        Returns:
+            List: Результаты отправки всех частей
+        """
+        workers = [
+            asyncio.ensure_future(self.work(parts, send))
+            for _ in range(self.concurrency or settings.ETL_ASYNC_CONCURRENCY)
+        ]
+        try:
+            responses = await asyncio.gather(*workers)
+        except BaseException:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+        return list(itertools.chain.from_iterable(responses))
+
+    @classmethod
+    async def work(cls, parts: Iterator[Any], send: Callable[[Any], Awaitable[List]]) -> List:
+        """Последовательная отправка частей данных, пока они не закончатся в общем итераторе.
+
+        Args:
+            parts: Части данных
+            send: Отправка одной части
+
+        Returns:
+            List: Результаты отправки
+        """
+        responses = []
+        part = next(parts, None)
+        while part is not None:
+            responses.extend(await send(part))
+            part = next(parts, None)
+        return responses
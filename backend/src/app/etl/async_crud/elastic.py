@@ -0,0 +1,134 @@
+import itertools
+from typing import Any, Dict, Iterable, List, Tuple
+
+import pandas as pd
+from django.conf import settings
+from elasticsearch import exceptions as es_exc
+from elasticsearch.helpers import async_streaming_bulk
+from elasticsearch.helpers import errors as es_errors
+
+from app.etl import errors as etl_errors
+from app.etl.async_crud.base import AsyncCRUD
+from app.etl.connections import AsyncConnectionRegistry
+from app.etl.crud.elastic_bulk import ElasticBulk
+
+
+class AsyncElasticEngine(AsyncCRUD):
+    """Асинхронный ETL-сервис для загрузки данных в Elasticsearch."""
+
+    def __init__(self):
+        """При инициализации отправляем родительскому классу тип базы данных для регистрации."""
+        super().__init__('elasticsearch')
+
+    async def create(self, df: pd.DataFrame, uri: str, resource: str) -> int:
+        """Вставка данных в индекс одновременными массовыми запросами.
+
+        Args:
+            df: Датафрейм
+            uri: Имя хоста
+            resource: Название индекса
+
+        Raises:
+            LoadTableError: Ошибка индекса
+            LoadConnectionError: Ошибка подключения
+
+        Returns:
+            int: Количество вставленных документов
+        """
+        try:
+            responses = await self.bulk(uri, ElasticBulk.get_actions(df, resource))
+        except es_errors.BulkIndexError as exc:
+            raise etl_errors.LoadTableError(str(exc.errors[0]))
+        except es_exc.ConnectionError as exc:
+            raise etl_errors.LoadConnectionError(exc.error)
+        return sum(ok for ok, _ in responses)
+
+    async def update(self, df: pd.DataFrame, uri: str, resource: str) -> int:
+        """Обновление данных в индексе.
+
+        Args:
+            df: Датафрейм
+            uri: Имя хоста
+            resource: Название индекса
+
+        Returns:
+            int: Количество обновленных документов
+        """
+        return await self.create(df, uri, resource)
+
+    async def delete(self, df: pd.DataFrame, uri: str, resource: str) -> int:
+        """Удаление документов из индекса одновременными массовыми запросами по идентификаторам.
+
+        Документы, которых уже нет в индексе, пропускаются, об остальных ошибках сообщается в лог.
+
+        Args:
+            df: Датафрейм
+            uri: Имя хоста
+            resource: Название индекса
+
+        Raises:
+            LoadTableError: Ошибка индекса
+            LoadConnectionError: Ошибка подключения
+
+        Returns:
+            int: Количество удалённых документов
+        """
+        try:
+            responses = await self.bulk(uri, ElasticBulk.get_delete_actions(df, resource), raise_on_error=False)
+        except es_exc.NotFoundError as exc:
+            raise etl_errors.LoadTableError(exc.error)
+        except es_exc.ConnectionError as exc:
+            raise etl_errors.LoadConnectionError(exc.error)
+        return ElasticBulk.count_deleted(responses, resource)
+
+    async def refresh(self, uri: str, resource: str):
+        """Обновление индекса, чтобы загруженные за запуск документы стали доступны для поиска.
+
+        Args:
+            uri: Имя хоста
+            resource: Название индекса
+
+        Raises:
+            LoadConnectionError: Ошибка подключения
+        """
+        try:
+            await AsyncConnectionRegistry.elastic(uri).indices.refresh(index=resource, ignore_unavailable=True)
+        except es_exc.ConnectionError as exc:
+            raise etl_errors.LoadConnectionError(exc.error)
+
+    async def bulk(self, uri: str, actions: Iterable[Dict], **kwargs) -> List[Tuple[bool, Dict]]:
+        """Отправка действий пачками с ограничением по количеству и размеру, несколько пачек одновременно.
+
+        Индекс при этом не обновляется: это делает refresh в конце запуска процесса.
+
+        Args:
+            uri: Имя хоста
+            actions: Действия массовой операции
+            kwargs: Дополнительные параметры хелпера массовой операции
+
+        Returns:
+            List[Tuple[bool, Dict]]: Результаты выполнения действий
+        """
+        elastic = AsyncConnectionRegistry.elastic(uri)
+        size = settings.ETL_ES_BULK_CHUNK_SIZE
+        actions = iter(actions)
+        chunks = iter(lambda: list(itertools.islice(actions, size)), [])
+        return await self.drain(chunks, lambda chunk: self.send(elastic, chunk, **kwargs))
+
+    @classmethod
+    async def send(cls, elastic: Any, chunk: List[Dict], **kwargs) -> List[Tuple[bool, Dict]]:
+        """Отправка одной пачки действий.
+
+        Args:
+            elastic: Асинхронный клиент Elasticsearch
+            chunk: Действия
+            kwargs: Дополнительные параметры хелпера массовой операции
+
+        Returns:
+            List[Tuple[bool, Dict]]: Результаты выполнения действий
+        """
+        return [
+            response async for response in async_streaming_bulk(
+                elastic, chunk, chunk_size=len(chunk), max_chunk_bytes=settings.ETL_ES_BULK_MAX_BYTES, **kwargs,
+            )
+        ]
@@ -0,0 +1,160 @@
+from typing import Callable, List
+
+import pandas as pd
+from django.conf import settings
+from sqlalchemy import exc as sql_exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.etl import errors as etl_errors
+from app.etl.async_crud.base import AsyncCRUD
+from app.etl.connections import AsyncConnectionRegistry
+from app.etl.crud import CRUD, SQLEngine
+
+
+class AsyncSQLEngine(AsyncCRUD):
+    """Асинхронный ETL-сервис для загрузки данных в SQL базы данных.
+
+    Части датафрейма по ETL_SQL_BATCH_SIZE строк загружаются одновременно, каждая в своей транзакции.
+    Запросы строит синхронный движок того же типа базы данных, которому передаётся подключение асинхронного драйвера.
+    """
+
+    def __init__(self, db_type: str = 'sql'):
+        """При инициализации отправляем родительскому классу тип базы данных и находим синхронный движок того же типа.
+
+        Args:
+            db_type: Тип базы данных
+        """
+        super().__init__(db_type)
+        self.sync_engine: SQLEngine = CRUD.get_engine(db_type)  # type: ignore[assignment]
+
+    async def create(self, df: pd.DataFrame, uri: str, resource: str) -> int:
+        """Вставка данных в таблицу одновременными транзакциями.
+
+        Args:
+            df: Датафрейм
+            uri: Имя хоста
+            resource: Название таблицы
+
+        Raises:
+            LoadTableError: Ошибка таблицы
+            LoadConnectionError: Ошибка подключения
+
+        Returns:
+            int: Количество вставленных строк
+        """
+        sql_engine = AsyncConnectionRegistry.sql_engine(uri)
+        try:
+            async with sql_engine.begin() as sql_conn:
+                await sql_conn.run_sync(self.sync_engine.create_table, df, resource)
+        except (sql_exc.DBAPIError, OSError) as exc:
+            raise self.get_load_error(exc)
+        await self.apply_batches(uri, df, self.sync_engine.insert_rows, resource)
+        return df[df.columns[0]].count()
+
+    async def update(self, df: pd.DataFrame, uri: str, resource: str) -> int:
+        """Обновление строк таблицы, совпадающих по ключу из индекса датафрейма.
+
+        Args:
+            df: Датафрейм, проиндексированный по ключевой колонке
+            uri: Имя хоста
+            resource: Название таблицы
+
+        Returns:
+            int: Количество обновлённых строк
+        """
+        df, key = self.sync_engine.get_staged_frame(df)
+        affected = await self.apply_batches(
+            uri, df, self.sync_engine.apply_batch, resource, self.sync_engine.upsert, key,
+        )
+        return sum(affected)
+
+    async def delete(self, df: pd.DataFrame, uri: str, resource: str) -> int:
+        """Удаление строк таблицы, совпадающих по ключу из индекса датафрейма.
+
+        Args:
+            df: Датафрейм, проиндексированный по ключевой колонке
+            uri: Имя хоста
+            resource: Название таблицы
+
+        Returns:
+            int: Количество удалённых строк
+        """
+        df, key = self.sync_engine.get_staged_frame(df.index.to_frame(index=False), df.index.name)
+        affected = await self.apply_batches(
+            uri, df, self.sync_engine.apply_batch, resource, self.sync_engine.delete_staged, key,
+        )
+        return sum(affected)
+
+    async def apply_batches(self, uri: str, df: pd.DataFrame, apply: Callable, *args) -> List:
+        """Применение синхронной функции к частям датафрейма в одновременных транзакциях.
+
+        Args:
+            uri: Имя хоста
+            df: Датафрейм
+            apply: Функция, которая получает подключение, часть датафрейма и дополнительные аргументы
+            args: Дополнительные аргументы функции
+
+        Raises:
+            LoadTableError: Ошибка таблицы
+            LoadConnectionError: Ошибка подключения
+
+        Returns:
+            List: Результаты функции для каждой части
+        """
+        sql_engine = AsyncConnectionRegistry.sql_engine(uri)
+        size = settings.ETL_SQL_BATCH_SIZE
+        batches = (df.iloc[start:start + size] for start in range(0, len(df), size))
+        try:
+            return await self.drain(batches, lambda batch: self.send(sql_engine, apply, batch, *args))
+        except (sql_exc.DBAPIError, sql_exc.NoSuchTableError, OSError) as exc:
+            raise self.get_load_error(exc)
+
+    @classmethod
+    async def send(cls, sql_engine: AsyncEngine, apply: Callable, batch: pd.DataFrame, *args) -> List:
+        """Применение синхронной функции к части датафрейма в отдельной транзакции.
+
+        Args:
+            sql_engine: Асинхронный движок SQLAlchemy
+            apply: Функция, которая получает подключение, часть датафрейма и дополнительные аргументы
+            batch: Часть датафрейма
+            args: Дополнительные аргументы функции
+
+        Returns:
+            List: Результат функции
+        """
+        async with sql_engine.begin() as sql_conn:
+            return [await sql_conn.run_sync(apply, batch, *args)]
+
+    def get_load_error(self, exc: Exception) -> etl_errors.LoadError:
+        """Получение ошибки загрузки по исключению драйвера.
+
+        Args:
+            exc: Исключение
+
+        Returns:
+            LoadError: Ошибка таблицы или подключения
+        """
+        if isinstance(exc, OSError):
+            return etl_errors.LoadConnectionError(str(exc))
+        return self.sync_engine.get_load_error(exc)  # type: ignore[arg-type]
+
+
+class AsyncSQLiteEngine(AsyncSQLEngine):
+    """Асинхронный ETL-сервис для загрузки данных в SQLite базы данных.
+
+    SQLite допускает только одну пишущую транзакцию, поэтому части загружаются по очереди.
+    """
+
+    concurrency = 1
+
+    def __init__(self):
+        """При инициализации отправляем родительскому классу тип базы данных для регистрации."""
+        super().__init__('sqlite')
+
+
+class AsyncPostgresEngine(AsyncSQLEngine):
+    """Асинхронный ETL-сервис для загрузки данных в PostgreSQL базы данных."""
+
+    def __init__(self):
+        """При инициализации отправляем родительскому классу тип базы данных для регистрации."""
+        super().__init__('postgresql')
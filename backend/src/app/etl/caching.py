@@ -0,0 +1,344 @@
+import contextlib
+import hashlib
+import os
+import threading
+import time
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Tuple, Type
+
+import pandas as pd
+import pyarrow as pa
+import sqlalchemy
+from django.conf import settings
+from django.core.cache import cache
+from pydantic import BaseModel
+
+
+def get_version(key: str) -> int:
+    """Получение версии метаданных из общего кэша Django.
+
+    Args:
+        key: Ключ версии
+
+    Returns:
+        int: Текущая версия
+    """
+    return cache.get_or_set(key, 0, timeout=None)
+
+
+def bump_version(key: str) -> int:
+    """Увеличение версии метаданных в общем кэше Django.
+
+    Args:
+        key: Ключ версии
+
+    Returns:
+        int: Новая версия
+    """
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+        return 1
+
+
+class CacheInfo(NamedTuple):
+    """Статистика кэша схем валидации."""
+
+    hits: int
+    misses: int
+    size: int
+    version: int
+
+
+class SchemaCache:
+    """ETL-сервис кэширования скомпилированных схем валидации в памяти процесса.
+
+    Версия кэша хранится в общем кэше Django, поэтому сброс из веб-процесса виден всем воркерам.
+    Чтобы не обращаться к общему кэшу при каждой валидации, версия перечитывается не чаще,
+    чем раз в ETL_SCHEMA_VERSION_TTL секунд.
+    """
+
+    version_key = 'etl:schema-version'
+    version = 0
+    checked = float('-inf')
+    schemas: Dict[Hashable, Type[BaseModel]] = {}
+    hits = 0
+    misses = 0
+
+    @classmethod
+    def get(cls, key: Hashable) -> Optional[Type[BaseModel]]:
+        """Получение схемы из кэша с учётом актуальной версии метаданных.
+
+        Args:
+            key: Ключ схемы
+
+        Returns:
+            Optional[Type[BaseModel]]: Схема валидации или None, если её нет в кэше
+        """
+        version = cls.get_shared_version()
+        if version != cls.version:
+            cls.schemas = {}
+            cls.version = version
+        schema = cls.schemas.get(key)
+        if schema is None:
+            cls.misses += 1
+        else:
+            cls.hits += 1
+        return schema
+
+    @classmethod
+    def get_shared_version(cls) -> int:
+        """Получение версии кэша из общего кэша, если её не перечитывали дольше ETL_SCHEMA_VERSION_TTL секунд.
+
+        Returns:
+            int: Версия кэша, между перечитываниями - текущая версия процесса
+        """
+        now = time.monotonic()
+        if now - cls.checked < settings.ETL_SCHEMA_VERSION_TTL:
+            return cls.version
+        cls.checked = now
+        return get_version(cls.version_key)
+
+    @classmethod
+    def set(cls, key: Hashable, schema: Type[BaseModel]) -> None:
+        """Сохранение схемы в кэш.
+
+        Args:
+            key: Ключ схемы
+            schema: Схема валидации
+        """
+        cls.schemas[key] = schema
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Сброс кэша схем во всех процессах через увеличение версии метаданных."""
+        bump_version(cls.version_key)
+        cls.schemas = {}
+        cls.checked = float('-inf')
+
+    @classmethod
+    def cache_info(cls) -> CacheInfo:
+        """Получение статистики кэша.
+
+        Returns:
+            CacheInfo: Количество попаданий, промахов, схем в кэше и текущая версия
+        """
+        return CacheInfo(hits=cls.hits, misses=cls.misses, size=len(cls.schemas), version=cls.version)
+
+
+class ExtractCache:
+    """ETL-сервис кэширования извлечённых из SQL баз данных таблиц в файлах Arrow, общих для процессов воркера.
+
+    Снимок переиспользуется, пока не изменился отпечаток прочитанных таблиц из TableFingerprint.
+    Давно не читавшиеся снимки удаляются, когда их общий размер превышает лимит из настроек.
+    """
+
+    suffix = '.arrow'
+    fingerprint_key = b'etl_fingerprint'
+
+    @classmethod
+    def read_sql(
+        cls,
+        sql_conn: sqlalchemy.Connection,
+        uri: str,
+        tables: List[str],
+        statement: sqlalchemy.Select,
+        parse_dates: List[str],
+    ) -> pd.DataFrame:
+        """Чтение результата запроса из снимка или из базы данных с сохранением снимка.
+
+        Args:
+            sql_conn: Подключение к БД
+            uri: Имя хоста БД
+            tables: Таблицы, из которых читает запрос
+            statement: Запрос SQLAlchemy
+            parse_dates: Колонки, которые нужно разобрать как даты
+
+        Returns:
+            pd.DataFrame: Датафрейм с результатом запроса
+        """
+        fingerprint = TableFingerprint.get(sql_conn, uri, tables) if settings.ETL_EXTRACT_CACHE_MAX_BYTES else None
+        if fingerprint is None:
+            return pd.read_sql(statement, sql_conn, parse_dates=parse_dates)
+        compiled = statement.compile(dialect=sql_conn.dialect)
+        key = repr((uri, str(compiled), sorted(compiled.params.items()), parse_dates))
+        path = os.path.join(settings.ETL_EXTRACT_CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + cls.suffix)
+        df = cls.load(path, fingerprint)
+        if df is None:
+            df = pd.read_sql(statement, sql_conn, parse_dates=parse_dates)
+            cls.store(path, fingerprint, df)
+        return df
+
+    @classmethod
+    def load(cls, path: str, fingerprint: bytes) -> Optional[pd.DataFrame]:
+        """Чтение снимка через отображение файла в память, если его отпечаток совпадает с текущим.
+
+        Args:
+            path: Путь к файлу снимка
+            fingerprint: Текущий отпечаток таблиц
+
+        Returns:
+            Optional[pd.DataFrame]: Датафрейм или None, если снимка нет или он устарел
+        """
+        try:
+            with pa.memory_map(path) as source:
+                reader = pa.ipc.open_file(source)
+                if (reader.schema.metadata or {}).get(cls.fingerprint_key) != fingerprint:
+                    return None
+                df = cls.to_frame(reader.read_all())
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path)
+        return df
+
+    @classmethod
+    def to_frame(cls, table: pa.Table) -> pd.DataFrame:
+        """Преобразование таблицы снимка в датафрейм в том виде, в каком его возвращает база данных.
+
+        Arrow превращает списки в numpy.ndarray, а схемы валидации ожидают списки,
+        поэтому вложенные колонки преобразуются в объекты Python отдельно.
+
+        Args:
+            table: Таблица снимка
+
+        Returns:
+            pd.DataFrame: Датафрейм
+        """
+        df = table.to_pandas()
+        for name, column in zip(table.column_names, table.itercolumns()):
+            if pa.types.is_nested(column.type):
+                df[name] = pd.Series(column.to_pylist(), index=df.index, dtype=object)
+        return df
+
+    @classmethod
+    def store(cls, path: str, fingerprint: bytes, df: pd.DataFrame) -> None:
+        """Атомарное сохранение снимка. Датафреймы, которые Arrow не может сохранить без потерь, не кэшируются.
+
+        Args:
+            path: Путь к файлу снимка
+            fingerprint: Текущий отпечаток таблиц
+            df: Датафрейм
+        """
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except pa.ArrowException:
+            return
+        schema = table.schema.with_metadata({**(table.schema.metadata or {}), cls.fingerprint_key: fingerprint})
+        os.makedirs(settings.ETL_EXTRACT_CACHE_DIR, exist_ok=True)
+        temp_path = '{path}.{pid}.tmp'.format(path=path, pid=os.getpid())
+        with pa.OSFile(temp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, schema) as writer:
+                writer.write_table(table.cast(schema))
+        os.replace(temp_path, path)
+        cls.evict()
+
+    @classmethod
+    def evict(cls) -> None:
+        """Удаление давно не читавшихся снимков, пока их общий размер превышает лимит."""
+        snapshots = cls.get_snapshots()
+        total = sum(snapshot[1] for snapshot in snapshots)
+        for _, size, path in snapshots:
+            if total <= settings.ETL_EXTRACT_CACHE_MAX_BYTES:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            total -= size
+
+    @classmethod
+    def get_snapshots(cls) -> List[Tuple[float, int, str]]:
+        """Получение снимков, отсортированных от давно не читавшихся к недавним.
+
+        Returns:
+            List[Tuple[float, int, str]]: Время последнего чтения, размер и путь каждого снимка
+        """
+        with os.scandir(settings.ETL_EXTRACT_CACHE_DIR) as entries:
+            paths = [entry.path for entry in entries if entry.name.endswith(cls.suffix)]
+        snapshots = []
+        for path in paths:
+            with contextlib.suppress(FileNotFoundError):
+                stat = os.stat(path)
+                snapshots.append((stat.st_mtime, stat.st_size, path))
+        return sorted(snapshots)
+
+
+class TableFingerprint:
+    """ETL-сервис получения отпечатка состояния таблиц SQL базы данных для проверки снимков ExtractCache.
+
+    Отпечаток таблицы - количество строк и максимум колонки из настроек, а для таблиц SQLite без такой колонки -
+    PRAGMA data_version. Значения data_version сравнимы только в рамках одного подключения, поэтому такие снимки
+    переиспользует только создавший их процесс.
+    """
+
+    pid = 0
+    monitors: Dict[str, Tuple[Any, int]] = {}
+    lock = threading.Lock()
+
+    @classmethod
+    def get(cls, sql_conn: sqlalchemy.Connection, uri: str, tables: List[str]) -> Optional[bytes]:
+        """Получение отпечатка состояния таблиц.
+
+        Args:
+            sql_conn: Подключение к БД
+            uri: Имя хоста БД
+            tables: Названия таблиц, в том числе вместе со схемой через точку
+
+        Returns:
+            Optional[bytes]: Отпечаток или None, если его нельзя получить и снимок не используется
+        """
+        parts = []
+        for resource in tables:
+            part = cls.get_part(sql_conn, uri, resource)
+            if part is None:
+                return None
+            parts.append(part)
+        return repr(parts).encode()
+
+    @classmethod
+    def get_part(cls, sql_conn: sqlalchemy.Connection, uri: str, resource: str) -> Optional[str]:
+        """Получение отпечатка одной таблицы.
+
+        Args:
+            sql_conn: Подключение к БД
+            uri: Имя хоста БД
+            resource: Название таблицы, в том числе вместе со схемой через точку
+
+        Returns:
+            Optional[str]: Отпечаток таблицы или None, если его нельзя получить
+        """
+        column = settings.ETL_EXTRACT_CACHE_COLUMN
+        schema, _, name = resource.rpartition('.')
+        existing = sqlalchemy.inspect(sql_conn).get_columns(name, schema=schema or None)
+        if column and column in {col['name'] for col in existing}:
+            table = sqlalchemy.table(name, sqlalchemy.column(column), schema=schema or None)
+            return repr(tuple(sql_conn.execute(
+                sqlalchemy.select(sqlalchemy.func.count(), sqlalchemy.func.max(table.c[column])),
+            ).one()))
+        if sql_conn.dialect.name == 'sqlite':
+            return cls.get_data_version(uri)
+        return None
+
+    @classmethod
+    def get_data_version(cls, uri: str) -> str:
+        """Получение PRAGMA data_version базы SQLite через отдельное подключение процесса, которое только читает.
+
+        Args:
+            uri: Имя хоста БД
+
+        Returns:
+            str: Версия данных вместе с идентификаторами процесса и подключения
+        """
+        with cls.lock:
+            if cls.pid != os.getpid():
+                cls.monitors = {}
+                cls.pid = os.getpid()
+            if uri not in cls.monitors:
+                monitor = sqlalchemy.create_engine(
+                    uri, poolclass=sqlalchemy.NullPool, connect_args={'check_same_thread': False},
+                ).raw_connection()
+                cls.monitors[uri] = monitor, time.time_ns()
+            monitor, token = cls.monitors[uri]
+            cursor = monitor.cursor()
+            cursor.execute('PRAGMA data_version')
+            version = cursor.fetchone()[0]
+        return '{pid}:{token}:{version}'.format(pid=cls.pid, token=token, version=version)
@@ -0,0 +1,80 @@
+import re
+from types import MappingProxyType
+from typing import Any, Dict
+
+import sqlalchemy
+from django.conf import settings
+from elasticsearch import AsyncElasticsearch, Elasticsearch
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.etl.serializers import OrjsonSerializer
+
+
+class ClientFactory:
+    """ETL-сервис создания клиентов баз данных с настройками пулов подключений из настроек проекта."""
+
+    drivers = MappingProxyType({'sqlite': 'sqlite+aiosqlite', 'postgresql': 'postgresql+asyncpg'})
+
+    @classmethod
+    def sql_engine(cls, uri: str) -> sqlalchemy.Engine:
+        """Создание движка SQLAlchemy с настройками пула из настроек проекта.
+
+        Args:
+            uri: Имя хоста БД
+
+        Returns:
+            sqlalchemy.Engine: Движок SQLAlchemy
+        """
+        url = sqlalchemy.make_url(uri)
+        options: Dict[str, Any] = {'pool_pre_ping': True}
+        if url.get_dialect().get_pool_class(url) is sqlalchemy.QueuePool:  # type: ignore[attr-defined]
+            options.update(pool_size=settings.ETL_POOL_SIZE, max_overflow=settings.ETL_POOL_MAX_OVERFLOW)
+        return sqlalchemy.create_engine(uri, **options)
+
+    @classmethod
+    def elastic(cls, uri: str) -> Elasticsearch:
+        """Создание клиента Elasticsearch с размером пула из настроек проекта и быстрым сериализатором JSON.
+
+        Args:
+            uri: Имя хоста
+
+        Returns:
+            Elasticsearch: Клиент Elasticsearch
+        """
+        return Elasticsearch(uri, maxsize=settings.ETL_POOL_SIZE, serializer=OrjsonSerializer())
+
+    @classmethod
+    def async_sql_engine(cls, uri: str) -> AsyncEngine:
+        """Создание асинхронного движка SQLAlchemy для URI синхронного драйвера.
+
+        Параметр options подключения к PostgreSQL драйвер asyncpg не поддерживает, поэтому настройки из него
+        передаются как server_settings.
+
+        Args:
+            uri: Имя хоста БД
+
+        Returns:
+            AsyncEngine: Асинхронный движок SQLAlchemy
+        """
+        url = sqlalchemy.make_url(uri)
+        url = url.set(drivername=cls.drivers.get(url.get_backend_name(), url.drivername))
+        options: Dict[str, Any] = {'pool_pre_ping': True}
+        if url.get_backend_name() == 'postgresql' and 'options' in url.query:
+            server_settings = dict(re.findall(r'-c\s*([^=\s]+)=(\S+)', str(url.query['options'])))
+            url = url.difference_update_query(['options'])
+            options.update(connect_args={'server_settings': server_settings})
+        if issubclass(url.get_dialect().get_pool_class(url), sqlalchemy.QueuePool):  # type: ignore[attr-defined]
+            options.update(pool_size=settings.ETL_POOL_SIZE, max_overflow=settings.ETL_POOL_MAX_OVERFLOW)
+        return create_async_engine(url, **options)
+
+    @classmethod
+    def async_elastic(cls, uri: str) -> AsyncElasticsearch:
+        """Создание асинхронного клиента Elasticsearch с быстрым сериализатором JSON.
+
+        Args:
+            uri: Имя хоста
+
+        Returns:
+            AsyncElasticsearch: Асинхронный клиент Elasticsearch
+        """
+        return AsyncElasticsearch(uri, maxsize=settings.ETL_POOL_SIZE, serializer=OrjsonSerializer())
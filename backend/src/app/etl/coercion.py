@@ -0,0 +1,299 @@
+import copy
+import datetime
+import itertools
+import uuid
+from typing import Any, Callable, List, Optional, Tuple, Type
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+from pydantic.datetime_parse import parse_date, parse_datetime
+from pydantic.fields import SHAPE_LIST, ModelField
+
+
+class Coercion:
+    """ETL-сервис векторного приведения колонок датафрейма к типам полей схемы валидации.
+
+    Значения, которые не удаётся привести так же, как это сделал бы pydantic, помечаются как ошибочные,
+    чтобы их строки прошли построчную валидацию схемой.
+    """
+
+    @classmethod
+    def coerce_frame(cls, schema: Type[BaseModel], df: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+        """Приведение всех колонок датафрейма к полям схемы.
+
+        Args:
+            schema: Схема валидации данных
+            df: Датафрейм
+
+        Returns:
+            Tuple[pd.DataFrame, np.ndarray]: Датафрейм с колонками под псевдонимами полей и маска ошибочных строк
+        """
+        columns = {}
+        invalid = np.zeros(len(df), dtype=bool)
+        for field in schema.__fields__.values():
+            coerced, bad = cls.coerce_column(df, field)
+            columns[field.alias] = coerced
+            invalid |= bad
+        return pd.DataFrame(columns, index=df.index, dtype=object), invalid
+
+    @classmethod
+    def get_input_column(cls, df: pd.DataFrame, field: ModelField) -> Optional[pd.Series]:
+        """Поиск колонки датафрейма для поля схемы: сначала по псевдониму, затем по имени.
+
+        Args:
+            df: Датафрейм
+            field: Поле схемы
+
+        Returns:
+            pd.Series: Колонка датафрейма или None, если её нет
+        """
+        for name in (field.alias, field.name):
+            if name in df.columns:
+                return df[name]
+        return None
+
+    @classmethod
+    def get_missing_column(cls, field: ModelField, length: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Заполнение отсутствующей колонки значением по умолчанию без его валидации.
+
+        Args:
+            field: Поле схемы
+            length: Количество строк
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Значения по умолчанию и маска ошибочных значений обязательного поля
+        """
+        column = pd.Series([field.get_default() for _ in range(length)], dtype=object).to_numpy()
+        return column, np.full(length, field.required)
+
+    @classmethod
+    def coerce_column(cls, df: pd.DataFrame, field: ModelField) -> Tuple[np.ndarray, np.ndarray]:
+        """Приведение колонки к типу поля с заменой пустых значений значением по умолчанию.
+
+        Args:
+            df: Датафрейм
+            field: Поле схемы
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Приведённые значения и маска ошибочных значений
+        """
+        series = cls.get_input_column(df, field)
+        if series is None:
+            return cls.get_missing_column(field, len(df))
+        null = series.isna().to_numpy()
+        column, bad = cls.get_defaults(field, null)
+        converted = cls.convert(series[~null], field)
+        column[~null] = converted[0]
+        bad[~null] = converted[1]
+        return column, bad
+
+    @classmethod
+    def get_defaults(cls, field: ModelField, null: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Заполнение пустых значений колонки значением по умолчанию, которое проверяется один раз.
+
+        Args:
+            field: Поле схемы
+            null: Маска пустых значений
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Значения по умолчанию на месте пустых и маска ошибочных значений
+        """
+        column = np.empty(len(null), dtype=object)
+        if not null.any():
+            return column, np.zeros(len(null), dtype=bool)
+        default, errors = field.validate(field.default, {}, loc=field.alias)
+        column[null] = pd.Series([copy.copy(default) for _ in range(null.sum())], dtype=object).to_numpy()
+        return column, null & bool(errors)
+
+    @classmethod
+    def convert(cls, series: pd.Series, field: ModelField) -> Tuple[np.ndarray, np.ndarray]:
+        """Приведение непустых значений к типу поля.
+
+        Args:
+            series: Непустые значения колонки
+            field: Поле схемы
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Приведённые значения и маска ошибочных значений
+        """
+        if field.shape == SHAPE_LIST:
+            return ListCoercion.convert(series, field.sub_fields[0])  # type: ignore[index]
+        converters = {
+            str: ScalarCoercion.convert_str,
+            int: ScalarCoercion.convert_int,
+            float: ScalarCoercion.convert_float,
+            datetime.date: ScalarCoercion.convert_date,
+            datetime.datetime: ScalarCoercion.convert_datetime,
+            uuid.UUID: ScalarCoercion.convert_uuid,
+        }
+        return converters[field.type_](series)
+
+
+class ListCoercion:
+    """ETL-сервис приведения колонок со списками через плоскую колонку всех элементов списков."""
+
+    @classmethod
+    def convert(cls, series: pd.Series, field: ModelField) -> Tuple[np.ndarray, np.ndarray]:
+        """Приведение списков вложенных объектов или значений.
+
+        Args:
+            series: Колонка со списками
+            field: Поле схемы для элемента списка
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Приведённые списки и маска ошибочных списков
+        """
+        bad = ~np.fromiter((isinstance(cell, list) for cell in series), dtype=bool, count=len(series))
+        lists = [cell for cell in series if isinstance(cell, list)]
+        lengths = np.zeros(len(series), dtype=int)
+        lengths[~bad] = [len(cell) for cell in lists]
+        coerced, element_bad = cls.convert_elements(list(itertools.chain.from_iterable(lists)), field)
+        bad[np.unique(np.repeat(np.arange(len(series)), lengths)[element_bad])] = True
+        return cls.split(coerced, lengths), bad
+
+    @classmethod
+    def convert_elements(cls, elements: List[Any], field: ModelField) -> Tuple[List[Any], np.ndarray]:
+        """Приведение элементов всех списков колонки: вложенных объектов по схеме или значений по типу поля.
+
+        Args:
+            elements: Элементы списков
+            field: Поле схемы для элемента списка
+
+        Returns:
+            Tuple[List[Any], np.ndarray]: Приведённые элементы и маска ошибочных элементов
+        """
+        if isinstance(field.type_, type) and issubclass(field.type_, BaseModel):
+            is_dict = np.fromiter((isinstance(element, dict) for element in elements), dtype=bool, count=len(elements))
+            frame, bad = Coercion.coerce_frame(field.type_, pd.DataFrame([
+                element if isinstance(element, dict) else {} for element in elements
+            ]))
+            return frame.to_dict('records'), bad | ~is_dict
+        converted, bad = Coercion.convert(pd.Series(elements, dtype=object), field)
+        return list(converted), bad
+
+    @classmethod
+    def split(cls, elements: List[Any], lengths: np.ndarray) -> np.ndarray:
+        """Разбиение плоского списка элементов обратно на списки исходных длин.
+
+        Args:
+            elements: Приведённые элементы списков
+            lengths: Длины списков
+
+        Returns:
+            np.ndarray: Колонка со списками
+        """
+        bounds = np.concatenate(([0], np.cumsum(lengths)))
+        column = [elements[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+        return pd.Series(column, dtype=object).to_numpy()
+
+
+class ScalarCoercion:
+    """ETL-сервис приведения непустых значений колонки к скалярному типу поля так же, как это делает pydantic."""
+
+    @classmethod
+    def convert_str(cls, series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """Приведение к строкам: строковые значения остаются как есть.
+
+        Args:
+            series: Непустые значения колонки
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Приведённые значения и маска ошибочных значений
+        """
+        column = series.to_numpy(dtype=object)
+        return column, series.map(type).to_numpy() != str
+
+    @classmethod
+    def convert_int(cls, series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """Приведение к целым числам из целочисленных и дробных колонок с отбрасыванием дробной части.
+
+        Args:
+            series: Непустые значения колонки
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Приведённые значения и маска ошибочных значений
+        """
+        if pd.api.types.is_integer_dtype(series):
+            return series.astype(object).to_numpy(), np.zeros(series.size, dtype=bool)
+        if pd.api.types.is_float_dtype(series):
+            numbers = series.to_numpy(dtype='float64')
+            bad = ~np.isfinite(numbers) | (np.abs(numbers) >= 2 ** 63)
+            return np.where(bad, 0, numbers).astype('int64').astype(object), bad
+        return series.to_numpy(dtype=object), series.map(type).to_numpy() != int
+
+    @classmethod
+    def convert_float(cls, series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """Приведение к дробным числам из числовых колонок.
+
+        Args:
+            series: Непустые значения колонки
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Приведённые значения и маска ошибочных значений
+        """
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            return series.astype('float64').astype(object).to_numpy(), np.zeros(series.size, dtype=bool)
+        types = series.map(type).to_numpy()
+        bad = (types != float) & (types != int)
+        return np.where(bad, series, series.where(~bad, 0).astype('float64')).astype(object), bad
+
+    @classmethod
+    def convert_date(cls, series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """Приведение к датам тем же разбором строк, что использует pydantic.
+
+        Args:
+            series: Непустые значения колонки
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Приведённые значения и маска ошибочных значений
+        """
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series.dt.date.to_numpy(dtype=object), np.zeros(series.size, dtype=bool)
+        return cls.parse(series, parse_date)
+
+    @classmethod
+    def convert_datetime(cls, series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """Приведение к дате и времени тем же разбором строк, что использует pydantic.
+
+        Args:
+            series: Непустые значения колонки
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Приведённые значения и маска ошибочных значений
+        """
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series.astype(object).to_numpy(), np.zeros(series.size, dtype=bool)
+        return cls.parse(series, parse_datetime)
+
+    @classmethod
+    def convert_uuid(cls, series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """Приведение строк к UUID.
+
+        Args:
+            series: Непустые значения колонки
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Приведённые значения и маска ошибочных значений
+        """
+        return cls.parse(series, lambda cell: cell if isinstance(cell, uuid.UUID) else uuid.UUID(cell))
+
+    @classmethod
+    def parse(cls, series: pd.Series, parser: Callable) -> Tuple[np.ndarray, np.ndarray]:
+        """Поэлементный разбор значений колонки с пометкой значений, которые не удалось разобрать.
+
+        Args:
+            series: Непустые значения колонки
+            parser: Функция разбора значения
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Приведённые значения и маска ошибочных значений
+        """
+        column = np.empty(len(series), dtype=object)
+        bad = np.zeros(series.size, dtype=bool)
+        for num, cell in enumerate(series):
+            try:
+                column[num] = parser(cell)
+            except (ValueError, TypeError, AttributeError):
+                bad[num] = True
+        return column, bad
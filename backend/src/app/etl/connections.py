@@ -0,0 +1,189 @@
+import asyncio
+import contextlib
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterator, Tuple
+
+import sqlalchemy
+from django.conf import settings
+from elasticsearch import AsyncElasticsearch, Elasticsearch
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.etl.caching import bump_version, get_version
+from app.etl.clients import ClientFactory
+
+
+class ConnectionRegistry:
+    """ETL-сервис для переиспользования пулов подключений к базам данных в процессе воркера.
+
+    Пулы хранятся по URI базы данных и закрываются после простоя или при изменении баз данных.
+    Версия реестра хранится в общем кэше Django, поэтому изменение из веб-процесса видно всем воркерам.
+    Чтобы не обращаться к общему кэшу при каждом получении клиента, версия перечитывается не чаще,
+    чем раз в ETL_POOL_VERSION_TTL секунд.
+    """
+
+    version_key = 'etl:connections-version'
+    version = 0
+    checked = float('-inf')
+    pid = 0
+    clients: Dict[str, Tuple[Any, float]] = {}
+    lock = threading.Lock()
+
+    @classmethod
+    def sql_engine(cls, uri: str) -> sqlalchemy.Engine:
+        """Получение движка SQLAlchemy с пулом подключений.
+
+        Args:
+            uri: Имя хоста БД
+
+        Returns:
+            sqlalchemy.Engine: Движок SQLAlchemy
+        """
+        return cls.get(uri, ClientFactory.sql_engine)
+
+    @classmethod
+    @contextlib.contextmanager
+    def elastic(cls, uri: str) -> Iterator[Elasticsearch]:
+        """Получение клиента Elasticsearch с пулом подключений без его закрытия по выходу из блока.
+
+        Args:
+            uri: Имя хоста
+
+        Yields:
+            Iterator[Elasticsearch]: Клиент Elasticsearch
+        """
+        yield cls.get(uri, ClientFactory.elastic)
+
+    @classmethod
+    def get(cls, uri: str, factory: Callable[[str], Any]) -> Any:
+        """Получение клиента из реестра или его создание.
+
+        Args:
+            uri: Имя хоста БД
+            factory: Функция создания клиента
+
+        Returns:
+            Any: Клиент базы данных
+        """
+        version = cls.get_shared_version()
+        with cls.lock:
+            if cls.pid != os.getpid():
+                cls.clients = {}
+                cls.pid = os.getpid()
+            if cls.version != version:
+                cls.close_idle(float('inf'))
+                cls.version = version
+            cls.close_idle(time.monotonic() - settings.ETL_POOL_IDLE_TIMEOUT)
+            client = cls.clients[uri][0] if uri in cls.clients else factory(uri)
+            cls.clients[uri] = client, time.monotonic()
+        return client
+
+    @classmethod
+    def get_shared_version(cls) -> int:
+        """Получение версии реестра из общего кэша, если её не перечитывали дольше ETL_POOL_VERSION_TTL секунд.
+
+        Returns:
+            int: Версия реестра, между перечитываниями - текущая версия процесса
+        """
+        now = time.monotonic()
+        if now - cls.checked < settings.ETL_POOL_VERSION_TTL:
+            return cls.version
+        cls.checked = now
+        return get_version(cls.version_key)
+
+    @classmethod
+    def close_idle(cls, deadline: float) -> None:
+        """Закрытие пулов, которые не использовались с заданного момента.
+
+        Клиенты Elasticsearch не закрываются явно: их может ещё использовать незавершённый scroll,
+        а подключения закроются вместе с последней ссылкой на клиент.
+
+        Args:
+            deadline: Момент по time.monotonic, бесконечность закрывает все пулы процесса
+        """
+        for uri, (client, used) in list(cls.clients.items()):
+            if used >= deadline:
+                continue
+            cls.clients.pop(uri)
+            if isinstance(client, sqlalchemy.Engine):
+                client.dispose()
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Закрытие пулов во всех процессах через увеличение версии реестра."""
+        bump_version(cls.version_key)
+        with cls.lock:
+            cls.close_idle(float('inf'))
+            cls.checked = float('-inf')
+
+
+class AsyncConnectionRegistry:
+    """ETL-сервис подключений асинхронных движков к базам данных.
+
+    Асинхронные клиенты привязаны к циклу событий, в котором они созданы, поэтому реестр хранит их по циклу
+    событий и URI, а закрывает по завершении цикла.
+    """
+
+    clients: Dict[Tuple[int, str], Any] = {}
+
+    @classmethod
+    def sql_engine(cls, uri: str) -> AsyncEngine:
+        """Получение асинхронного движка SQLAlchemy с пулом подключений.
+
+        Args:
+            uri: Имя хоста БД
+
+        Returns:
+            AsyncEngine: Асинхронный движок SQLAlchemy
+        """
+        return cls.get(uri, ClientFactory.async_sql_engine)
+
+    @classmethod
+    def elastic(cls, uri: str) -> AsyncElasticsearch:
+        """Получение асинхронного клиента Elasticsearch.
+
+        Args:
+            uri: Имя хоста
+
+        Returns:
+            AsyncElasticsearch: Асинхронный клиент Elasticsearch
+        """
+        return cls.get(uri, ClientFactory.async_elastic)
+
+    @classmethod
+    def get(cls, uri: str, factory: Callable[[str], Any]) -> Any:
+        """Получение клиента текущего цикла событий из реестра или его создание.
+
+        Args:
+            uri: Имя хоста БД
+            factory: Функция создания клиента
+
+        Returns:
+            Any: Клиент базы данных
+        """
+        key = (id(asyncio.get_running_loop()), uri)
+        if key not in cls.clients:
+            cls.clients[key] = factory(uri)
+        return cls.clients[key]
+
+    @classmethod
+    async def close_all(cls) -> None:
+        """Закрытие всех клиентов текущего цикла событий."""
+        loop_id = id(asyncio.get_running_loop())
+        keys = [key for key in cls.clients if key[0] == loop_id]
+        await asyncio.gather(*(cls.close(cls.clients.pop(key)) for key in keys))
+
+    @classmethod
+    def close(cls, client: Any) -> Awaitable[None]:
+        """Закрытие пула подключений асинхронного клиента.
+
+        Args:
+            client: Асинхронный клиент базы данных
+
+        Returns:
+            Awaitable[None]: Корутина закрытия
+        """
+        if isinstance(client, AsyncEngine):
+            return client.dispose()
+        return client.close()
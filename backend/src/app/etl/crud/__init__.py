@@ -0,0 +1,5 @@
+from app.etl.crud.base import CRUD, Columns, Partition, Selection
+from app.etl.crud.elastic import ElasticEngine
+from app.etl.crud.postgres import PostgresEngine
+from app.etl.crud.sql import SQLEngine
+from app.etl.crud.sqlite import SQLiteEngine
@@ -0,0 +1,182 @@
+import abc
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from app.models import Relationship
+
+Columns = Dict[str, Optional[str]]
+Partition = Dict[str, Any]
+
+
+class Selection(NamedTuple):
+    """Отбор извлекаемых данных. По умолчанию извлекаются все данные ресурса."""
+
+    filters: Optional[Dict[str, Iterable]] = None
+    watermark: Optional[Tuple[str, Any]] = None
+    columns: Optional[Columns] = None
+    partition: Optional[Partition] = None
+
+
+class Extractor(abc.ABC):
+    """Абстрактный ETL-сервис для извлечения данных."""
+
+    db_type: str
+
+    @abc.abstractmethod
+    def read(self, uri: str, resource: str, selection: Optional[Selection] = None) -> pd.DataFrame:
+        """Чтение данных.
+
+        Args:
+            uri: Имя хоста БД
+            resource: Название ресурса, от куда извлекаем данные
+            selection: Отбор данных: фильтры, отметка, колонки и часть из get_partitions
+        """
+
+    @abc.abstractmethod
+    def get_partitions(self, uri: str, resource: str, idx_col: str, count: int) -> List[Partition]:
+        """Разбиение данных на части, которые можно извлекать независимо друг от друга.
+
+        Args:
+            uri: Имя хоста БД
+            resource: Название ресурса, от куда извлекаем данные
+            idx_col: Колонка для индексации данных
+            count: Желаемое количество частей
+        """
+
+    @abc.abstractmethod
+    def count(self, uri: str, resource: str) -> int:
+        """Подсчёт количества данных.
+
+        Args:
+            uri: Имя хоста БД
+            resource: Название ресурса, где считаем данные
+        """
+
+    @abc.abstractmethod
+    def read_chunks(
+        self,
+        uri: str,
+        resource: str,
+        size: int,
+        columns: Optional[Columns] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Потоковое чтение данных частями.
+
+        Args:
+            uri: Имя хоста БД
+            resource: Название ресурса, от куда извлекаем данные
+            size: Количество строк в одной части
+            columns: Извлекаемые колонки и их типы данных, по умолчанию все колонки
+        """
+
+    def read_joined(
+        self,
+        uri: str,
+        resource: str,
+        relations: Iterable[Relationship],
+        idx_col: str,
+        selection: Optional[Selection] = None,
+    ) -> pd.DataFrame:
+        """Чтение данных вместе со связанными объектами одним запросом к базе данных.
+
+        Args:
+            uri: Имя хоста БД
+            resource: Название ресурса, от куда извлекаем данные
+            relations: Связи с другими таблицами
+            idx_col: Колонка для индексации данных
+            selection: Отбор данных: фильтры, отметка и колонки
+
+        Raises:
+            NotImplementedError: База данных не умеет собирать связанные объекты
+        """
+        raise NotImplementedError(self.db_type)
+
+
+class Loader(abc.ABC):
+    """Абстрактный ETL-сервис для загрузки данных."""
+
+    @abc.abstractmethod
+    def create(self, df: pd.DataFrame, uri: str, resource: str) -> int:
+        """Вставка данных.
+
+        Args:
+            df: Датафрейм
+            uri: Имя хоста БД
+            resource: Название ресурса, куда вставляем данные
+        """
+
+    @abc.abstractmethod
+    def update(self, df: pd.DataFrame, uri: str, resource: str):
+        """Обновление данных.
+
+        Args:
+            df: Датафрейм
+            uri: Имя хоста БД
+            resource: Название ресурса, где изменяем данные
+        """
+
+    @abc.abstractmethod
+    def delete(self, df: pd.DataFrame, uri: str, resource: str):
+        """Удаление данных.
+
+        Args:
+            df: Датафрейм
+            uri: Имя хоста БД
+            resource: Название ресурса, от куда удаляем данные
+        """
+
+    def refresh(self, uri: str, resource: str):
+        """Публикация загруженных данных для чтения после завершения запуска процесса.
+
+        По умолчанию ничего не делает, так как данные доступны сразу после фиксации транзакции.
+
+        Args:
+            uri: Имя хоста БД
+            resource: Название ресурса, куда загружались данные
+        """
+
+
+class CRUD(Extractor, Loader):
+    """Абстрактный ETL-сервис для выполнения CRUD-операций.
+
+    Движки баз данных собираются из реализаций извлечения и загрузки и регистрируются по типу базы данных.
+    """
+
+    engines: Optional[Dict] = None
+
+    def __init__(self, db_type: str):
+        """При инициализации ожидает получить тип базы данных.
+
+        Args:
+            db_type: Тип базы данных
+        """
+        self.db_type = db_type
+
+    @classmethod
+    def get_subclasses(cls) -> Iterator[type]:
+        """Вспомогательный метод для получения все наследников данного класса.
+
+        Yields:
+            Iterator[type]:  Наследники класса
+        """
+        for subclass in cls.__subclasses__():
+            yield from subclass.get_subclasses()
+            yield subclass
+
+    @classmethod
+    def get_engine(cls, db_type: str) -> 'CRUD':
+        """Получение движка базы данных для реализации CRUD сервиса.
+
+        Args:
+            db_type: Тип БД
+
+        Returns:
+            CRUD: Объект CRUD сервиса
+        """
+        if cls.engines is None:
+            cls.engines = {}
+            for engine_cls in cls.get_subclasses():
+                engine = engine_cls()
+                cls.engines[engine.db_type] = engine
+        return cls.engines[db_type]
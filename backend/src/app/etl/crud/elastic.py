@@ -0,0 +1,249 @@
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+from django.conf import settings
+from elasticsearch import exceptions as es_exc
+from elasticsearch.helpers import errors as es_errors
+from elasticsearch_dsl import Search, query
+
+from app.etl import errors as etl_errors
+from app.etl.connections import ConnectionRegistry
+from app.etl.crud.base import CRUD, Columns, Extractor, Loader, Partition, Selection
+from app.etl.crud.elastic_bulk import ElasticBulk
+
+
+class ElasticExtractor(Extractor):
+    """ETL-сервис для извлечения данных из Elasticsearch."""
+
+    def read(self, uri: str, resource: str, selection: Optional[Selection] = None) -> pd.DataFrame:
+        """Чтение данных из индекса параллельными срезами scroll.
+
+        Args:
+            uri: Имя хоста
+            resource: Название индекса
+            selection: Допустимые значения полей, отметка, извлекаемые поля и срез scroll из get_partitions
+
+        Raises:
+            ExtractTableError: Ошибка индекса
+            ExtractConnectionError: Ошибка подключения
+
+        Returns:
+            pd.DataFrame: Датафрейм индекса
+        """
+        try:
+            with ConnectionRegistry.elastic(uri) as elastic:
+                cursor = self.select(Search(using=elastic, index=resource), selection or Selection())
+                if selection and selection.partition:
+                    df = pd.DataFrame(self.scan(cursor.extra(slice=selection.partition), slices=1))
+                else:
+                    df = pd.DataFrame(self.scan(cursor, settings.ETL_ES_READ_SLICES))
+        except es_exc.NotFoundError as exc:
+            raise etl_errors.ExtractTableError(exc.error)
+        except es_exc.ConnectionError as exc:
+            raise etl_errors.ExtractConnectionError(exc.error)
+        return df
+
+    @classmethod
+    def select(cls, cursor: Search, selection: Selection) -> Search:
+        """Отбор документов и полей в запросе к индексу.
+
+        Args:
+            cursor: Запрос Elasticsearch
+            selection: Допустимые значения полей, отметка и извлекаемые поля
+
+        Returns:
+            Search: Запрос Elasticsearch
+        """
+        for field, accepted in (selection.filters or {}).items():
+            cursor = cursor.filter(query.Terms(**{field: list(accepted)}))
+        if selection.watermark is not None:
+            cursor = cursor.filter(query.Range(**{selection.watermark[0]: {'gte': selection.watermark[1]}}))
+        if selection.columns is not None:
+            cursor = cursor.source(list(selection.columns))
+        return cursor
+
+    def get_partitions(self, uri: str, resource: str, idx_col: str, count: int) -> List[Partition]:
+        """Разбиение индекса на срезы scroll, в которые документы попадают по хешу идентификатора.
+
+        Args:
+            uri: Имя хоста
+            resource: Название индекса
+            idx_col: Поле для индексации данных, срезы строятся по _id
+            count: Количество срезов
+
+        Returns:
+            List[Partition]: Параметры срезов scroll
+        """
+        if count < 2:
+            return [{}]
+        return [{'id': num, 'max': count} for num in range(count)]
+
+    def count(self, uri: str, resource: str) -> int:
+        """Подсчёт количества документов в индексе.
+
+        Args:
+            uri: Имя хоста
+            resource: Название индекса
+
+        Raises:
+            ExtractTableError: Ошибка индекса
+            ExtractConnectionError: Ошибка подключения
+
+        Returns:
+            int: Количество документов
+        """
+        try:
+            with ConnectionRegistry.elastic(uri) as elastic:
+                return elastic.count(index=resource)['count']
+        except es_exc.NotFoundError as exc:
+            raise etl_errors.ExtractTableError(exc.error)
+        except es_exc.ConnectionError as exc:
+            raise etl_errors.ExtractConnectionError(exc.error)
+
+    @classmethod
+    def scan(cls, cursor: Search, slices: int) -> List[Dict]:
+        """Извлечение всех документов запроса, при нескольких срезах - одновременно в пуле потоков.
+
+        Args:
+            cursor: Запрос Elasticsearch
+            slices: Количество срезов scroll
+
+        Returns:
+            List[Dict]: Документы
+        """
+        if slices < 2:
+            return [doc.to_dict() for doc in cursor.scan()]
+        with ThreadPoolExecutor(max_workers=slices) as pool:
+            parts = pool.map(
+                lambda num: [doc.to_dict() for doc in cursor.extra(slice={'id': num, 'max': slices}).scan()],
+                range(slices),
+            )
+            return list(itertools.chain.from_iterable(parts))
+
+    def read_chunks(
+        self,
+        uri: str,
+        resource: str,
+        size: int,
+        columns: Optional[Columns] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Потоковое чтение данных из индекса частями через scroll.
+
+        Args:
+            uri: Имя хоста
+            resource: Название индекса
+            size: Количество документов в одной части
+            columns: Извлекаемые поля документов и их типы данных, по умолчанию все поля
+
+        Raises:
+            ExtractTableError: Ошибка индекса
+            ExtractConnectionError: Ошибка подключения
+
+        Yields:
+            Iterator[pd.DataFrame]: Датафреймы с частями индекса
+        """
+        try:
+            with ConnectionRegistry.elastic(uri) as elastic:
+                cursor = Search(using=elastic, index=resource).params(size=size)
+                if columns is not None:
+                    cursor = cursor.source(list(columns))
+                docs = (doc.to_dict() for doc in cursor.scan())
+                while chunk := list(itertools.islice(docs, size)):
+                    yield pd.DataFrame(chunk)
+        except es_exc.NotFoundError as exc:
+            raise etl_errors.ExtractTableError(exc.error)
+        except es_exc.ConnectionError as exc:
+            raise etl_errors.ExtractConnectionError(exc.error)
+
+
+class ElasticLoader(Loader):
+    """ETL-сервис для загрузки данных в Elasticsearch."""
+
+    def create(self, df: pd.DataFrame, uri: str, resource: str) -> int:
+        """Вставка данных в индекс.
+
+        Args:
+            df: Датафрейм
+            uri: Имя хоста
+            resource: Название индекса
+
+        Raises:
+            LoadTableError: Ошибка индекса
+            LoadConnectionError: Ошибка подключения
+
+        Returns:
+            int: Количество вставленных документов
+        """
+        try:
+            with ConnectionRegistry.elastic(uri) as elastic:
+                result = sum(ok for ok, _ in ElasticBulk.bulk(elastic, ElasticBulk.get_actions(df, resource)))
+        except es_errors.BulkIndexError as exc:
+            raise etl_errors.LoadTableError(str(exc.errors[0]))
+        except es_exc.ConnectionError as exc:
+            raise etl_errors.LoadConnectionError(exc.error)
+        return result
+
+    def update(self, df: pd.DataFrame, uri: str, resource: str) -> int:
+        """Обновление данных в индексе.
+
+        Args:
+            df: Датафрейм
+            uri: Имя хоста
+            resource: Название индекса
+
+        Returns:
+            int: Количество обновленных документов
+        """
+        return self.create(df, uri, resource)
+
+    def delete(self, df: pd.DataFrame, uri: str, resource: str):
+        """Удаление данных в индексе пачками действий массовой операции по идентификаторам документов.
+
+        Args:
+            df: Датафрейм
+            uri: Имя хоста
+            resource: Название индекса
+
+        Raises:
+            LoadTableError: Ошибка индекса
+            LoadConnectionError: Ошибка подключения
+
+        Returns:
+            int: Количество удалённых документов
+        """
+        try:
+            with ConnectionRegistry.elastic(uri) as elastic:
+                responses = list(ElasticBulk.bulk(
+                    elastic, ElasticBulk.get_delete_actions(df, resource), raise_on_error=False,
+                ))
+        except es_exc.NotFoundError as exc:
+            raise etl_errors.LoadTableError(exc.error)
+        except es_exc.ConnectionError as exc:
+            raise etl_errors.LoadConnectionError(exc.error)
+        return ElasticBulk.count_deleted(responses, resource)
+
+    def refresh(self, uri: str, resource: str):
+        """Обновление индекса, чтобы загруженные за запуск документы стали доступны для поиска.
+
+        Args:
+            uri: Имя хоста
+            resource: Название индекса
+
+        Raises:
+            LoadConnectionError: Ошибка подключения
+        """
+        try:
+            with ConnectionRegistry.elastic(uri) as elastic:
+                elastic.indices.refresh(index=resource, ignore_unavailable=True)
+        except es_exc.ConnectionError as exc:
+            raise etl_errors.LoadConnectionError(exc.error)
+
+
+class ElasticEngine(ElasticExtractor, ElasticLoader, CRUD):
+    """ETL-сервис для выполнения CRUD-операций в Elasticsearch."""
+
+    def __init__(self):
+        """При инициализации отправляем родительскому классу тип базы данных для регистрации."""
+        super().__init__('elasticsearch')
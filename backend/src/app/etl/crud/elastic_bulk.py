@@ -0,0 +1,87 @@
+import logging
+from http import HTTPStatus
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import pandas as pd
+from django.conf import settings
+from elasticsearch import Elasticsearch
+from elasticsearch.helpers import parallel_bulk, streaming_bulk
+
+logger = logging.getLogger(__name__)
+
+
+class ElasticBulk:
+    """ETL-сервис массовых операций Elasticsearch, общий для синхронного и асинхронного движков."""
+
+    @classmethod
+    def get_actions(cls, df: pd.DataFrame, index: str) -> Iterator[Dict]:
+        """Построение действий для массовой вставки документов за один проход по колонкам датафрейма.
+
+        Args:
+            df: Датафрейм
+            index: Название индекса
+
+        Yields:
+            Iterator[Dict]: Действия массовой вставки
+        """
+        for idx, document in zip(df.index, df.to_dict('records')):
+            yield {
+                '_index': index,
+                '_id': idx,
+                '_source': document,
+            }
+
+    @classmethod
+    def get_delete_actions(cls, df: pd.DataFrame, index: str) -> Iterator[Dict]:
+        """Построение действий для массового удаления документов по идентификаторам из индекса датафрейма.
+
+        Args:
+            df: Датафрейм
+            index: Название индекса
+
+        Yields:
+            Iterator[Dict]: Действия массового удаления
+        """
+        for idx in df.index:
+            yield {'_op_type': 'delete', '_index': index, '_id': idx}
+
+    @classmethod
+    def bulk(cls, elastic: Elasticsearch, actions: Iterable[Dict], **kwargs) -> Iterator[Tuple[bool, Dict]]:
+        """Отправка действий пачками с ограничением по количеству и размеру, в несколько потоков при их наличии.
+
+        Индекс при этом не обновляется: это делает refresh в конце запуска процесса.
+
+        Args:
+            elastic: Клиент Elasticsearch
+            actions: Действия массовой операции
+            kwargs: Дополнительные параметры хелпера массовой операции
+
+        Returns:
+            Iterator[Tuple[bool, Dict]]: Результаты выполнения действий
+        """
+        options = {
+            'chunk_size': settings.ETL_ES_BULK_CHUNK_SIZE,
+            'max_chunk_bytes': settings.ETL_ES_BULK_MAX_BYTES,
+            **kwargs,
+        }
+        if settings.ETL_ES_BULK_THREADS > 1:
+            return parallel_bulk(elastic, actions, thread_count=settings.ETL_ES_BULK_THREADS, **options)
+        return streaming_bulk(elastic, actions, **options)
+
+    @classmethod
+    def count_deleted(cls, responses: List[Tuple[bool, Dict]], index: str) -> int:
+        """Подсчёт удалённых документов по результатам массового удаления.
+
+        Документы, которых уже нет в индексе, пропускаются, об остальных ошибках сообщается в лог.
+
+        Args:
+            responses: Результаты выполнения действий
+            index: Название индекса
+
+        Returns:
+            int: Количество удалённых документов
+        """
+        for deleted, response in responses:
+            if not deleted and response['delete'].get('status') != HTTPStatus.NOT_FOUND:
+                logger.warning('Документ не удалён из индекса %s: %s', index, response['delete'])
+        return sum(success for success, _ in responses)
@@ -0,0 +1,51 @@
+import pandas as pd
+import sqlalchemy
+
+from app.etl.crud.postgres_copy import PostgresCopy
+from app.etl.crud.sql import SQLEngine
+
+
+class PostgresEngine(SQLEngine):
+    """ETL-сервис для выполнения CRUD-операций в PostgreSQL базах данных."""
+
+    stream_results = True
+    delete_using = True
+
+    def __init__(self):
+        """При инициализации отправляем родительскому классу тип базы данных для регистрации."""
+        super().__init__('postgresql')
+
+    @classmethod
+    def create_table(cls, sql_conn: sqlalchemy.Connection, df: pd.DataFrame, resource: str) -> None:
+        """Создание таблицы, которой ещё нет, под блокировкой её названия до конца транзакции.
+
+        Одновременные CREATE TABLE IF NOT EXISTS в PostgreSQL не исключают друг друга: вторая транзакция
+        ждёт первую и завершается ошибкой уникальности в системном каталоге. Под блокировкой вторая
+        транзакция видит уже созданную таблицу.
+
+        Args:
+            sql_conn: Подключение к БД
+            df: Датафрейм
+            resource: Название таблицы
+        """
+        if not sqlalchemy.inspect(sql_conn).has_table(resource):
+            lock = sqlalchemy.text('SELECT pg_advisory_xact_lock(hashtext(:resource))')
+            sql_conn.execute(lock, {'resource': resource})
+            super().create_table(sql_conn, df, resource)
+
+    def insert_rows(self, sql_conn: sqlalchemy.Connection, df: pd.DataFrame, resource: str) -> None:
+        """Вставка строк датафрейма в таблицу через COPY FROM STDIN, см. PostgresCopy.
+
+        Таблица, которой ещё нет, создаётся по типам колонок датафрейма так же, как при обычной вставке.
+        Через асинхронный драйвер asyncpg данные передаются его собственной реализацией COPY.
+
+        Args:
+            sql_conn: Подключение к БД
+            df: Датафрейм
+            resource: Название таблицы
+        """
+        self.create_table(sql_conn, df, resource)
+        if sql_conn.dialect.driver == 'asyncpg':
+            PostgresCopy.copy_async(sql_conn, df, resource)
+        else:
+            PostgresCopy.copy(sql_conn, df, resource)
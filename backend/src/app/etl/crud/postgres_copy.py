@@ -0,0 +1,158 @@
+import datetime
+import io
+from types import MappingProxyType
+from typing import Any
+
+import pandas as pd
+import sqlalchemy
+from django.conf import settings
+from sqlalchemy import exc as sql_exc
+from sqlalchemy.util import await_only
+
+from app.etl.serializers import OrjsonSerializer
+
+
+class PostgresCopy:
+    """ETL-сервис вставки строк в PostgreSQL через COPY FROM STDIN частями в текстовом формате."""
+
+    escapes = MappingProxyType(str.maketrans({'\\': r'\\', '\n': r'\n', '\r': r'\r', '\t': r'\t'}))
+    null = r'\N'
+    booleans = MappingProxyType({True: 'true', False: 'false'})
+    serializer = OrjsonSerializer()
+
+    @classmethod
+    def copy(cls, sql_conn: sqlalchemy.Connection, df: pd.DataFrame, resource: str) -> None:
+        """Вставка строк через COPY курсора psycopg2.
+
+        Ошибки psycopg2 определяются через модуль DBAPI диалекта, чтобы модуль загружался без драйвера.
+
+        Args:
+            sql_conn: Подключение к БД
+            df: Датафрейм
+            resource: Название таблицы
+
+        Raises:
+            DBAPIError: Ошибка выполнения COPY, обёрнутая так же, как ошибки запросов SQLAlchemy
+        """
+        quote = sql_conn.dialect.identifier_preparer.quote
+        statement = 'COPY {table} ({columns}) FROM STDIN'.format(
+            table=quote(resource), columns=', '.join(quote(col) for col in df.columns),
+        )
+        driver_error = sql_conn.dialect.dbapi.Error  # type: ignore[union-attr]
+        cursor = sql_conn.connection.cursor()
+        try:
+            for start in range(0, len(df), settings.ETL_PG_COPY_CHUNK_SIZE):
+                cursor.copy_expert(statement, io.StringIO(cls.get_text(
+                    df.iloc[start:start + settings.ETL_PG_COPY_CHUNK_SIZE],
+                )))
+        except driver_error as exc:
+            raise sql_exc.DBAPIError.instance(statement, None, exc, driver_error)
+        finally:
+            cursor.close()
+
+    @classmethod
+    def copy_async(cls, sql_conn: sqlalchemy.Connection, df: pd.DataFrame, resource: str) -> None:
+        """Вставка строк через COPY подключения asyncpg из синхронного кода, выполняемого в run_sync.
+
+        Драйвер импортируется при вызове, так как модуль загружается и без асинхронных драйверов.
+
+        Args:
+            sql_conn: Подключение к БД
+            df: Датафрейм
+            resource: Название таблицы
+
+        Raises:
+            DBAPIError: Ошибка выполнения COPY, обёрнутая так же, как ошибки запросов SQLAlchemy
+        """
+        import asyncpg  # noqa: WPS433
+
+        driver_conn = sql_conn.connection.driver_connection
+        try:
+            for start in range(0, len(df), settings.ETL_PG_COPY_CHUNK_SIZE):
+                copy_text = cls.get_text(df.iloc[start:start + settings.ETL_PG_COPY_CHUNK_SIZE])
+                await_only(driver_conn.copy_to_table(  # type: ignore[union-attr]
+                    resource, source=io.BytesIO(copy_text.encode()), columns=list(df.columns), format='text',
+                ))
+        except asyncpg.PostgresError as exc:
+            raise sql_exc.DBAPIError.instance('COPY', None, exc, asyncpg.PostgresError)
+
+    @classmethod
+    def get_text(cls, df: pd.DataFrame) -> str:
+        """Построение данных для COPY в текстовом формате: колонки через табуляцию, строки через перевод строки.
+
+        Args:
+            df: Датафрейм
+
+        Returns:
+            str: Данные для COPY
+        """
+        lines = None
+        for _, col in df.items():
+            text = cls.get_column(col)
+            lines = text if lines is None else lines.str.cat(text, sep='\t')
+        return '' if lines is None else lines.str.cat(sep='\n')
+
+    @classmethod
+    def get_column(cls, col: pd.Series) -> pd.Series:
+        """Преобразование колонки в текстовые значения COPY. Вложенные списки и словари сохраняются как JSON.
+
+        Args:
+            col: Колонка датафрейма
+
+        Returns:
+            pd.Series: Экранированные текстовые значения колонки
+        """
+        if pd.api.types.is_bool_dtype(col.dtype):
+            text = col.map(cls.booleans)
+        elif pd.api.types.is_float_dtype(col.dtype):
+            text = cls.get_floats(col)
+        elif col.dtype != object:
+            text = col.astype(str)
+        elif pd.api.types.infer_dtype(col, skipna=True) == 'string':
+            text = col
+        else:
+            text = col.map(cls.get_value)
+        nulls = col.isna()
+        text = text.where(~nulls, cls.null)
+        blob = ''.join(text[~nulls])
+        if any(chr(code) in blob for code in cls.escapes):
+            text = text.str.translate(dict(cls.escapes)).where(~nulls, cls.null)
+        return text
+
+    @classmethod
+    def get_floats(cls, col: pd.Series) -> pd.Series:
+        """Преобразование колонки чисел с плавающей точкой в текст.
+
+        Колонка целых чисел с пропусками хранится в pandas как float64, а целочисленные колонки PostgreSQL
+        не принимают значения вида 1.0, поэтому целые значения выводятся без дробной части.
+
+        Args:
+            col: Колонка датафрейма
+
+        Returns:
+            pd.Series: Текстовые значения колонки
+        """
+        numbers = col.dropna()
+        if (numbers == numbers.round()).all():
+            return col.astype('Int64').astype(str)
+        return col.astype(str)
+
+    @classmethod
+    def get_value(cls, value: Any) -> Any:
+        """Преобразование значения колонки с объектами в текст.
+
+        Args:
+            value: Значение
+
+        Returns:
+            Any: Текстовое значение или исходное пустое значение
+        """
+        if isinstance(value, (list, dict)):
+            return cls.serializer.dumps(value)
+        if isinstance(value, bool):
+            return cls.booleans[value]
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        if isinstance(value, (datetime.date, datetime.time)):
+            return value.isoformat()
+        return value if pd.isna(value) else str(value)
@@ -0,0 +1,308 @@
+from typing import Iterable, Iterator, List, Optional
+
+import pandas as pd
+import sqlalchemy
+from sqlalchemy import exc as sql_exc
+
+from app.etl import errors as etl_errors
+from app.etl.connections import ConnectionRegistry
+from app.etl.crud.base import CRUD, Columns, Extractor, Loader, Partition, Selection
+from app.etl.crud.sql_query import SQLQuery, SQLTables
+from app.etl.crud.staging import StagedChanges
+from app.etl.planner import JoinPlanner
+from app.models import Relationship
+
+
+class SQLExtractor(Extractor):
+    """ETL-сервис для извлечения данных из SQL баз данных."""
+
+    stream_results = False
+
+    def read(self, uri: str, resource: str, selection: Optional[Selection] = None) -> pd.DataFrame:
+        """Чтение данных из таблицы.
+
+        Args:
+            uri: Имя хоста
+            resource: Название таблицы
+            selection: Допустимые значения колонок, отметка, извлекаемые колонки и диапазон из get_partitions
+
+        Raises:
+            ExtractTableError: Ошибка таблицы
+            ExtractConnectionError: Ошибка подключения
+
+        Returns:
+            pd.DataFrame: Датафрейм таблицы
+        """
+        selection = selection or Selection()
+        cached = selection.filters is None and selection.watermark is None and not selection.partition
+        try:
+            with ConnectionRegistry.sql_engine(uri).connect() as sql_conn:
+                projection = SQLTables.get_projection(sql_conn, resource, selection.columns)
+                statement = SQLQuery.get_query(
+                    resource, selection.filters, selection.watermark, projection, selection.partition,
+                )
+                return SQLQuery.fetch(sql_conn, uri, [resource] if cached else None, statement, projection)
+        except (sql_exc.OperationalError, sql_exc.ProgrammingError, sql_exc.NoSuchTableError) as exc:
+            raise self.get_extract_error(exc)
+
+    def get_partitions(self, uri: str, resource: str, idx_col: str, count: int) -> List[Partition]:
+        """Разбиение таблицы на диапазоны значений колонки примерно одинакового размера.
+
+        Границы диапазонов - значения колонки в отсортированной таблице на равных расстояниях друг от друга.
+
+        Args:
+            uri: Имя хоста
+            resource: Название таблицы, в том числе вместе со схемой через точку
+            idx_col: Колонка для индексации данных
+            count: Желаемое количество диапазонов, совпадающие границы объединяются
+
+        Raises:
+            ExtractTableError: Ошибка таблицы
+            ExtractConnectionError: Ошибка подключения
+
+        Returns:
+            List[Partition]: Колонки и границы диапазонов
+        """
+        statement = SQLQuery.get_query(resource, columns=[idx_col]).order_by(sqlalchemy.column(idx_col)).limit(1)
+        try:
+            with ConnectionRegistry.sql_engine(uri).connect() as sql_conn:
+                total = sql_conn.execute(
+                    statement.with_only_columns(sqlalchemy.func.count()).order_by(None).limit(None),
+                ).scalar_one()
+                bounds = [
+                    sql_conn.execute(statement.offset(total * num // count)).scalar() for num in range(1, count)
+                ]
+        except (sql_exc.OperationalError, sql_exc.ProgrammingError) as exc:
+            raise self.get_extract_error(exc)
+        return SQLQuery.get_ranges(idx_col, bounds)
+
+    def count(self, uri: str, resource: str) -> int:
+        """Подсчёт количества строк таблицы.
+
+        Args:
+            uri: Имя хоста
+            resource: Название таблицы, в том числе вместе со схемой через точку
+
+        Raises:
+            ExtractTableError: Ошибка таблицы
+            ExtractConnectionError: Ошибка подключения
+
+        Returns:
+            int: Количество строк
+        """
+        try:
+            with ConnectionRegistry.sql_engine(uri).connect() as sql_conn:
+                return sql_conn.execute(
+                    SQLQuery.get_query(resource).with_only_columns(sqlalchemy.func.count()),
+                ).scalar_one()
+        except (sql_exc.OperationalError, sql_exc.ProgrammingError) as exc:
+            raise self.get_extract_error(exc)
+
+    def read_chunks(
+        self,
+        uri: str,
+        resource: str,
+        size: int,
+        columns: Optional[Columns] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Потоковое чтение данных из таблицы частями.
+
+        Для движков с поддержкой серверных курсоров строки не буферизуются драйвером целиком.
+
+        Args:
+            uri: Имя хоста
+            resource: Название таблицы
+            size: Количество строк в одной части
+            columns: Извлекаемые колонки и их типы данных, по умолчанию все колонки
+
+        Raises:
+            ExtractTableError: Ошибка таблицы
+            ExtractConnectionError: Ошибка подключения
+
+        Yields:
+            Iterator[pd.DataFrame]: Датафреймы с частями таблицы
+        """
+        try:
+            with ConnectionRegistry.sql_engine(uri).connect() as sql_conn:
+                projection = SQLTables.get_projection(sql_conn, resource, columns)
+                sql_conn = sql_conn.execution_options(stream_results=self.stream_results, max_row_buffer=size)
+                for chunk in pd.read_sql(
+                    SQLQuery.get_query(resource, columns=projection),
+                    sql_conn,
+                    parse_dates=SQLQuery.get_date_columns(projection),
+                    chunksize=size,
+                ):
+                    yield SQLQuery.cast(chunk, projection)
+        except (sql_exc.OperationalError, sql_exc.ProgrammingError, sql_exc.NoSuchTableError) as exc:
+            raise self.get_extract_error(exc)
+
+    def read_joined(
+        self,
+        uri: str,
+        resource: str,
+        relations: Iterable[Relationship],
+        idx_col: str,
+        selection: Optional[Selection] = None,
+    ) -> pd.DataFrame:
+        """Чтение данных из таблицы вместе со связанными объектами, собранными в JSON-массивы на стороне БД.
+
+        Args:
+            uri: Имя хоста
+            resource: Название таблицы
+            relations: Связи с другими таблицами
+            idx_col: Колонка для индексации данных
+            selection: Допустимые значения колонок, отметка и извлекаемые колонки
+
+        Raises:
+            ExtractTableError: Ошибка таблицы
+            ExtractConnectionError: Ошибка подключения
+
+        Returns:
+            pd.DataFrame: Датафрейм таблицы, проиндексированный по колонке idx_col
+        """
+        selection = selection or Selection()
+        cached = selection.filters is None and selection.watermark is None
+        try:
+            with ConnectionRegistry.sql_engine(uri).connect() as sql_conn:
+                projection = SQLTables.get_projection(sql_conn, resource, selection.columns)
+                df = SQLQuery.fetch(
+                    sql_conn,
+                    uri,
+                    SQLTables.get_tables(resource, relations) if cached else None,
+                    JoinPlanner(sql_conn, resource, idx_col).get_statement(
+                        relations, projection, selection.filters, selection.watermark,
+                    ),
+                    projection,
+                )
+        except (sql_exc.OperationalError, sql_exc.ProgrammingError, sql_exc.NoSuchTableError) as exc:
+            raise self.get_extract_error(exc)
+        return df.assign(**{
+            rel.related_name: df[rel.related_name].map(SQLQuery.parse_documents) for rel in relations
+        }).set_index(idx_col, drop=False)
+
+    @classmethod
+    def get_extract_error(cls, exc: sql_exc.SQLAlchemyError) -> etl_errors.ExtractError:
+        """Преобразование ошибки SQLAlchemy в ошибку извлечения данных.
+
+        Args:
+            exc: Ошибка SQLAlchemy
+
+        Returns:
+            ExtractError: Ошибка таблицы, если запрос был отправлен или таблицы нет, иначе ошибка подключения
+        """
+        if isinstance(exc, sql_exc.NoSuchTableError):
+            return etl_errors.ExtractTableError(detail=str(exc))
+        if exc.statement:  # type: ignore[attr-defined]
+            return etl_errors.ExtractTableError(detail=str(exc.orig))  # type: ignore[attr-defined]
+        return etl_errors.ExtractConnectionError(detail=str(exc.orig))  # type: ignore[attr-defined]
+
+
+class SQLLoader(StagedChanges, Loader):
+    """ETL-сервис для загрузки данных в SQL базы данных.
+
+    Обновление и удаление строк выполняются через временную таблицу, см. StagedChanges.
+    """
+
+    def create(self, df: pd.DataFrame, uri: str, resource: str):
+        """Вставка данных в таблицу.
+
+        Args:
+            df: Датафрейм
+            uri: Имя хоста
+            resource: Название индекса
+
+        Raises:
+            LoadTableError: Ошибка таблицы
+            LoadConnectionError: Ошибка подключения
+
+        Returns:
+            int: Количество вставленных строк
+        """
+        try:
+            with ConnectionRegistry.sql_engine(uri).begin() as sql_conn:
+                self.insert_rows(sql_conn, df, resource)
+                result = df[df.columns[0]].count()
+        except sql_exc.DBAPIError as exc:
+            raise self.get_load_error(exc)
+        return result
+
+    def insert_rows(self, sql_conn: sqlalchemy.Connection, df: pd.DataFrame, resource: str) -> None:
+        """Вставка строк датафрейма в таблицу с её созданием, если таблицы ещё нет.
+
+        Args:
+            sql_conn: Подключение к БД
+            df: Датафрейм
+            resource: Название таблицы
+        """
+        self.create_table(sql_conn, df, resource)
+        df.to_sql(resource, sql_conn, if_exists='append', index=False)
+
+    @classmethod
+    def create_table(cls, sql_conn: sqlalchemy.Connection, df: pd.DataFrame, resource: str) -> None:
+        """Создание таблицы, которой ещё нет, с типами колонок, которые pandas выводит из данных датафрейма.
+
+        Таблица создаётся через CREATE TABLE IF NOT EXISTS, так как части источника загружаются параллельно
+        и каждая задача может застать таблицу ещё не созданной.
+
+        Args:
+            sql_conn: Подключение к БД
+            df: Датафрейм
+            resource: Название таблицы
+        """
+        if not sqlalchemy.inspect(sql_conn).has_table(resource):
+            schema = pd.io.sql.get_schema(df, resource, con=sql_conn)  # type: ignore[attr-defined]
+            sql_conn.execute(sqlalchemy.text(schema.replace('CREATE TABLE', 'CREATE TABLE IF NOT EXISTS', 1)))
+
+    def update(self, df: pd.DataFrame, uri: str, resource: str) -> int:
+        """Обновление строк таблицы, совпадающих по ключу из индекса датафрейма.
+
+        Args:
+            df: Датафрейм, проиндексированный по ключевой колонке
+            uri: Имя хоста
+            resource: Название таблицы
+
+        Returns:
+            int: Количество обновлённых строк
+        """
+        return self.apply_staged(df, uri, resource, self.upsert)
+
+    def delete(self, df: pd.DataFrame, uri: str, resource: str) -> int:
+        """Удаление строк таблицы, совпадающих по ключу из индекса датафрейма.
+
+        Args:
+            df: Датафрейм, проиндексированный по ключевой колонке
+            uri: Имя хоста
+            resource: Название таблицы
+
+        Returns:
+            int: Количество удалённых строк
+        """
+        return self.apply_staged(df.index.to_frame(index=False), uri, resource, self.delete_staged, df.index.name)
+
+    @classmethod
+    def get_load_error(cls, exc: sql_exc.SQLAlchemyError) -> etl_errors.LoadError:
+        """Преобразование ошибки SQLAlchemy в ошибку загрузки данных.
+
+        Args:
+            exc: Ошибка SQLAlchemy
+
+        Returns:
+            LoadError: Ошибка таблицы, если запрос был отправлен или таблицы нет, иначе ошибка подключения
+        """
+        if isinstance(exc, sql_exc.NoSuchTableError):
+            return etl_errors.LoadTableError(detail=str(exc))
+        if exc.statement:  # type: ignore[attr-defined]
+            return etl_errors.LoadTableError(detail=str(exc.orig))  # type: ignore[attr-defined]
+        return etl_errors.LoadConnectionError(detail=str(exc.orig))  # type: ignore[attr-defined]
+
+
+class SQLEngine(SQLExtractor, SQLLoader, CRUD):
+    """ETL-сервис для выполнения CRUD-операций в SQL базах данных."""
+
+    def __init__(self, db_type: str = 'sql'):
+        """При инициализации отправляем родительскому классу тип базы данных для регистрации.
+
+        Args:
+            db_type: Тип базы данных, по умолчанию общий движок SQL баз данных
+        """
+        super().__init__(db_type)
@@ -0,0 +1,235 @@
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import orjson
+import pandas as pd
+import sqlalchemy
+from sqlalchemy.sql import expression as sql_expr
+
+from app.enums import DataType
+from app.etl.caching import ExtractCache
+from app.etl.crud.base import Columns, Partition
+from app.models import Relationship
+
+
+class SQLQuery:
+    """ETL-сервис построения запросов на чтение таблиц и приведения прочитанных данных к типам модели."""
+
+    dtypes = MappingProxyType({DataType.int: 'Int64', DataType.float: 'float64'})
+
+    @classmethod
+    def get_query(
+        cls,
+        resource: str,
+        filters: Optional[Dict[str, Iterable]] = None,
+        watermark: Optional[Tuple[str, Any]] = None,
+        columns: Optional[Iterable[str]] = None,
+        partition: Optional[Partition] = None,
+    ) -> sql_expr.Select:
+        """Построение запроса на чтение таблицы.
+
+        Args:
+            resource: Название таблицы, в том числе вместе со схемой через точку
+            filters: Допустимые значения колонок для отбора строк
+            watermark: Колонка и значение, начиная с которого извлекаются строки
+            columns: Извлекаемые колонки, по умолчанию все
+            partition: Диапазон значений колонки из get_partitions, по умолчанию все строки
+
+        Returns:
+            sql_expr.Select: Запрос SQLAlchemy
+        """
+        schema, _, name = resource.rpartition('.')
+        if columns is None:
+            statement = sqlalchemy.select(sqlalchemy.text('*'))
+        else:
+            statement = sqlalchemy.select(*map(sqlalchemy.column, columns))
+        statement = statement.select_from(sqlalchemy.table(name, schema=schema or None))
+        for column, accepted in (filters or {}).items():
+            statement = statement.where(sqlalchemy.column(column).in_(list(accepted)))
+        if watermark is not None:
+            statement = statement.where(sqlalchemy.column(watermark[0]) >= watermark[1])
+        if partition:
+            statement = statement.where(*cls.get_bounds(partition))
+        return statement
+
+    @classmethod
+    def get_bounds(cls, partition: Partition) -> List[sql_expr.ColumnElement]:
+        """Построение условий на диапазон значений колонки: нижняя граница включается, верхняя - нет.
+
+        Args:
+            partition: Колонка и границы диапазона, пустая граница не ограничивает диапазон
+
+        Returns:
+            List[sql_expr.ColumnElement]: Условия
+        """
+        column: sql_expr.ColumnClause[Any] = sqlalchemy.column(partition['column'])
+        bounds = []
+        if partition['lower'] is not None:
+            bounds.append(column >= partition['lower'])
+        if partition['upper'] is not None:
+            bounds.append(column < partition['upper'])
+        return bounds
+
+    @classmethod
+    def get_ranges(cls, column: str, bounds: Iterable[Any]) -> List[Partition]:
+        """Построение диапазонов значений колонки по их границам. Пустые и совпадающие границы пропускаются.
+
+        Границы приводятся к значениям, которые можно передать в аргументах задачи Celery: числа и строки
+        передаются как есть, остальные значения - строковым представлением.
+
+        Args:
+            column: Колонка
+            bounds: Значения колонки на границах диапазонов в порядке возрастания
+
+        Returns:
+            List[Partition]: Колонки и границы диапазонов, крайние диапазоны не ограничены с одной стороны
+        """
+        edges = [None, *dict.fromkeys(
+            bound if isinstance(bound, (int, float, str)) else str(bound) for bound in bounds if bound is not None
+        ), None]
+        return [{'column': column, 'lower': lower, 'upper': upper} for lower, upper in zip(edges[:-1], edges[1:])]
+
+    @classmethod
+    def fetch(
+        cls,
+        sql_conn: sqlalchemy.Connection,
+        uri: str,
+        tables: Optional[List[str]],
+        statement: sql_expr.Select,
+        projection: Optional[Columns],
+    ) -> pd.DataFrame:
+        """Выполнение запроса на чтение с приведением колонок к типам модели.
+
+        Запросы, которые читают таблицы целиком, выполняются через кэш извлечённых таблиц.
+
+        Args:
+            sql_conn: Подключение к БД
+            uri: Имя хоста
+            tables: Таблицы, которые запрос читает целиком, или None, если запрос отбирает строки
+            statement: Запрос SQLAlchemy
+            projection: Извлекаемые колонки и их типы данных
+
+        Returns:
+            pd.DataFrame: Датафрейм
+        """
+        parse_dates = SQLQuery.get_date_columns(projection)
+        if tables is None:
+            df = pd.read_sql(statement, sql_conn, parse_dates=parse_dates)
+        else:
+            df = ExtractCache.read_sql(sql_conn, uri, tables, statement, parse_dates)
+        return SQLQuery.cast(df, projection)
+
+    @classmethod
+    def get_date_columns(cls, columns: Optional[Columns]) -> List[str]:
+        """Получение колонок, которые нужно разобрать как даты при чтении.
+
+        Args:
+            columns: Колонки и их типы данных
+
+        Returns:
+            List[str]: Колонки с датами
+        """
+        return [col for col, col_type in (columns or {}).items() if col_type in {DataType.date, DataType.datetime}]
+
+    @classmethod
+    def cast(cls, df: pd.DataFrame, columns: Optional[Columns]) -> pd.DataFrame:
+        """Приведение числовых колонок к типам модели. Колонки, которые привести не удалось, остаются как есть.
+
+        Args:
+            df: Датафрейм
+            columns: Колонки и их типы данных
+
+        Returns:
+            pd.DataFrame: Датафрейм
+        """
+        dtypes = {
+            col: cls.dtypes[str(col_type)] for col, col_type in (columns or {}).items() if col_type in cls.dtypes
+        }
+        return df.astype(dtypes, errors='ignore') if dtypes else df
+
+    @classmethod
+    def parse_documents(cls, documents: Any) -> Any:
+        """Разбор JSON-массива связанных объектов, если драйвер БД вернул его строкой.
+
+        Args:
+            documents: JSON-массив или уже разобранный список
+
+        Returns:
+            Any: Список связанных объектов или пустое значение
+        """
+        return orjson.loads(documents) if isinstance(documents, str) else documents
+
+
+class SQLTables:
+    """ETL-сервис получения сведений о колонках и ключах таблиц из базы данных."""
+
+    @classmethod
+    def get_table(cls, sql_conn: sqlalchemy.Connection, resource: str) -> sql_expr.TableClause:
+        """Получение таблицы с колонками из базы данных, но без их типов.
+
+        Args:
+            sql_conn: Подключение к БД
+            resource: Название таблицы, в том числе вместе со схемой через точку
+
+        Returns:
+            sql_expr.TableClause: Таблица
+        """
+        schema, _, name = resource.rpartition('.')
+        existing = sqlalchemy.inspect(sql_conn).get_columns(name, schema=schema or None)
+        return sqlalchemy.table(name, *(sqlalchemy.column(col['name']) for col in existing), schema=schema or None)
+
+    @classmethod
+    def get_projection(
+        cls,
+        sql_conn: sqlalchemy.Connection,
+        resource: str,
+        columns: Optional[Columns],
+    ) -> Optional[Columns]:
+        """Отбор запрошенных колонок, которые есть в таблице, в порядке колонок таблицы.
+
+        Args:
+            sql_conn: Подключение к БД
+            resource: Название таблицы, в том числе вместе со схемой через точку
+            columns: Запрошенные колонки и их типы данных
+
+        Returns:
+            Optional[Columns]: Колонки и их типы данных или None, если читаются все колонки
+        """
+        if columns is None:
+            return None
+        existing = cls.get_table(sql_conn, resource).c.keys()
+        return {col: columns[col] for col in existing if col in columns} or None
+
+    @classmethod
+    def get_tables(cls, resource: str, relations: Iterable[Relationship]) -> List[str]:
+        """Получение всех таблиц, из которых читает запрос со связанными объектами.
+
+        Args:
+            resource: Название таблицы
+            relations: Связи с другими таблицами
+
+        Returns:
+            List[str]: Названия таблиц без повторов
+        """
+        return list(dict.fromkeys([resource, *(tbl for rel in relations for tbl in (rel.through_table, rel.table))]))
+
+    @classmethod
+    def is_unique(cls, sql_conn: sqlalchemy.Connection, target: sql_expr.TableClause, key: str) -> bool:
+        """Проверка, что ключевая колонка - первичный ключ таблицы или у неё есть уникальный индекс.
+
+        Args:
+            sql_conn: Подключение к БД
+            target: Таблица получателя
+            key: Ключевая колонка
+
+        Returns:
+            bool: Можно ли использовать колонку в ON CONFLICT
+        """
+        inspector = sqlalchemy.inspect(sql_conn)
+        primary = inspector.get_pk_constraint(target.name, schema=target.schema)
+        constraints = inspector.get_unique_constraints(target.name, schema=target.schema)
+        indexes = inspector.get_indexes(target.name, schema=target.schema)
+        unique: List[List[Any]] = [primary['constrained_columns']]
+        unique.extend(constraint['column_names'] for constraint in constraints)
+        unique.extend(index['column_names'] for index in indexes if index['unique'])
+        return [key] in unique
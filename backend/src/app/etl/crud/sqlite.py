@@ -0,0 +1,78 @@
+import pandas as pd
+import sqlalchemy
+from django.conf import settings
+from sqlalchemy import exc as sql_exc
+
+from app.etl.connections import ConnectionRegistry
+from app.etl.crud.sql import SQLEngine
+from app.etl.crud.sqlite_bulk import SQLiteBulkLoad
+
+
+class SQLiteEngine(SQLEngine):
+    """ETL-сервис для выполнения CRUD-операций в SQLite базах данных."""
+
+    def __init__(self):
+        """При инициализации отправляем родительскому классу тип базы данных для регистрации."""
+        super().__init__('sqlite')
+
+    def create(self, df: pd.DataFrame, uri: str, resource: str):
+        """Вставка данных в таблицу в режиме массовой загрузки: каждая часть строк вставляется в своей транзакции.
+
+        Args:
+            df: Датафрейм
+            uri: Имя хоста
+            resource: Название индекса
+
+        Raises:
+            LoadTableError: Ошибка таблицы
+            LoadConnectionError: Ошибка подключения
+
+        Returns:
+            int: Количество вставленных строк
+        """
+        if not settings.ETL_SQLITE_BULK_LOAD:
+            return super().create(df, uri, resource)
+        try:
+            with ConnectionRegistry.sql_engine(uri).connect() as sql_conn:
+                with SQLiteBulkLoad.bulk_load(sql_conn, resource):
+                    self.insert_batches(sql_conn, df, resource)
+        except sql_exc.DBAPIError as exc:
+            raise self.get_load_error(exc)
+        return df[df.columns[0]].count()
+
+    def insert_batches(self, sql_conn: sqlalchemy.Connection, df: pd.DataFrame, resource: str) -> None:
+        """Вставка строк датафрейма частями по ETL_SQLITE_BATCH_SIZE, каждая часть - в своей транзакции.
+
+        Args:
+            sql_conn: Подключение к БД
+            df: Датафрейм
+            resource: Название таблицы
+        """
+        size = settings.ETL_SQLITE_BATCH_SIZE
+        for start in range(0, len(df), size):
+            with sql_conn.begin():
+                self.insert_rows(sql_conn, df.iloc[start:start + size], resource)
+
+    def insert_rows(self, sql_conn: sqlalchemy.Connection, df: pd.DataFrame, resource: str) -> None:
+        """Вставка строк датафрейма в таблицу одним executemany без обработки значений в SQLAlchemy.
+
+        Значения сохраняются в тех же форматах, что и при вставке через DataFrame.to_sql, а вложенные списки
+        и словари - как JSON.
+
+        Args:
+            sql_conn: Подключение к БД
+            df: Датафрейм
+            resource: Название таблицы
+        """
+        if not settings.ETL_SQLITE_BULK_LOAD:
+            return super().insert_rows(sql_conn, df, resource)
+        self.create_table(sql_conn, df, resource)
+        quote = sql_conn.dialect.identifier_preparer.quote
+        statement = 'INSERT INTO {table} ({columns}) VALUES ({params})'.format(
+            table=quote(resource),
+            columns=', '.join(quote(col) for col in df.columns),
+            params=', '.join('?' for _ in df.columns),
+        )
+        rows = list(zip(*(SQLiteBulkLoad.get_column_values(col) for _, col in df.items())))
+        if rows:
+            sql_conn.exec_driver_sql(statement, rows)
@@ -0,0 +1,147 @@
+import contextlib
+import datetime
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+import pandas as pd
+import sqlalchemy
+from django.conf import settings
+
+from app.etl.serializers import OrjsonSerializer
+
+
+class SQLiteBulkLoad:
+    """ETL-сервис массовой загрузки в SQLite: настройка подключения и подготовка значений для executemany."""
+
+    datetime_formats = MappingProxyType({
+        datetime.datetime: '%Y-%m-%d %H:%M:%S.%f',
+        datetime.date: '%Y-%m-%d',
+        datetime.time: '%H:%M:%S.%f',
+    })
+    serializer = OrjsonSerializer()
+
+    @classmethod
+    @contextlib.contextmanager
+    def bulk_load(cls, sql_conn: sqlalchemy.Connection, resource: str) -> Iterator[None]:
+        """Настройка подключения для массовой загрузки на время блока.
+
+        Журнал переводится в режим WAL, который сохраняется в файле базы данных. Параметры synchronous и
+        cache_size действуют только для подключения и восстанавливаются по выходу из блока. Если таблица пуста и
+        это разрешено настройками, её вторичные индексы удаляются перед загрузкой и строятся заново после неё.
+
+        Args:
+            sql_conn: Подключение к БД
+            resource: Название таблицы
+
+        Yields:
+            Iterator[None]: Подключение настроено
+        """
+        pragmas = {
+            'synchronous': settings.ETL_SQLITE_SYNCHRONOUS,
+            'cache_size': settings.ETL_SQLITE_CACHE_SIZE,
+        }
+        previous = {
+            pragma: sql_conn.exec_driver_sql('PRAGMA {pragma}'.format(pragma=pragma)).scalar() for pragma in pragmas
+        }
+        sql_conn.exec_driver_sql('PRAGMA journal_mode=WAL')
+        cls.set_pragmas(sql_conn, pragmas)
+        indexes = cls.drop_indexes(sql_conn, resource) if settings.ETL_SQLITE_REBUILD_INDEXES else []
+        sql_conn.commit()
+        try:
+            yield
+        finally:
+            cls.restore(sql_conn, indexes, previous)
+
+    @classmethod
+    def restore(cls, sql_conn: sqlalchemy.Connection, indexes: List[str], pragmas: Dict[str, Any]) -> None:
+        """Построение удалённых индексов и восстановление параметров подключения после массовой загрузки.
+
+        Args:
+            sql_conn: Подключение к БД
+            indexes: Определения удалённых индексов
+            pragmas: Прежние значения параметров подключения
+        """
+        for index in indexes:
+            sql_conn.exec_driver_sql(index)
+        cls.set_pragmas(sql_conn, pragmas)
+        sql_conn.commit()
+
+    @classmethod
+    def set_pragmas(cls, sql_conn: sqlalchemy.Connection, pragmas: Dict[str, Any]) -> None:
+        """Установка параметров подключения SQLite.
+
+        Args:
+            sql_conn: Подключение к БД
+            pragmas: Значения параметров
+        """
+        for pragma, value in pragmas.items():
+            sql_conn.exec_driver_sql('PRAGMA {pragma}={value}'.format(pragma=pragma, value=value))
+
+    @classmethod
+    def drop_indexes(cls, sql_conn: sqlalchemy.Connection, resource: str) -> List[str]:
+        """Удаление вторичных индексов пустой таблицы перед полной загрузкой.
+
+        Индексы первичного ключа и ограничений уникальности не удаляются, у них нет определения в sqlite_master.
+
+        Args:
+            sql_conn: Подключение к БД
+            resource: Название таблицы
+
+        Returns:
+            List[str]: Определения удалённых индексов для их построения после загрузки
+        """
+        quote = sql_conn.dialect.identifier_preparer.quote
+        if not sqlalchemy.inspect(sql_conn).has_table(resource):
+            return []
+        if sql_conn.exec_driver_sql('SELECT 1 FROM {table} LIMIT 1'.format(table=quote(resource))).first():
+            return []
+        indexes = sql_conn.exec_driver_sql(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+            (resource,),
+        ).all()
+        for name, _ in indexes:
+            sql_conn.exec_driver_sql('DROP INDEX {index}'.format(index=quote(name)))
+        return [definition for _, definition in indexes]
+
+    @classmethod
+    def get_column_values(cls, col: pd.Series) -> List[Any]:
+        """Преобразование колонки в значения Python, которые модуль sqlite3 передаёт в запрос без адаптеров.
+
+        Даты и время обычно повторяются, поэтому каждое уникальное значение форматируется один раз.
+
+        Args:
+            col: Колонка датафрейма
+
+        Returns:
+            List[Any]: Значения колонки
+        """
+        nulls = col.isna()
+        inferred = pd.api.types.infer_dtype(col, skipna=True) if col.dtype == object else None
+        if pd.api.types.is_datetime64_any_dtype(col.dtype):
+            col = col.dt.strftime(cls.datetime_formats[datetime.datetime])
+        elif inferred in {'date', 'datetime', 'time'}:
+            codes, uniques = pd.factorize(col)
+            col = pd.Series(np.array([*map(cls.get_value, uniques), None], dtype=object)[codes], index=col.index)
+        elif inferred not in {None, 'string'}:
+            col = col.map(cls.get_value)
+        return col.astype(object).where(~nulls, None).tolist()
+
+    @classmethod
+    def get_value(cls, value: Any) -> Any:
+        """Преобразование значения колонки с объектами в значение, которое поддерживает SQLite.
+
+        Args:
+            value: Значение
+
+        Returns:
+            Any: Значение для вставки
+        """
+        if isinstance(value, (list, dict)):
+            return cls.serializer.dumps(value)
+        if isinstance(value, (str, int, float, bytes)) or pd.isna(value):
+            return value
+        for value_type, value_format in cls.datetime_formats.items():
+            if isinstance(value, value_type):
+                return format(value, value_format)
+        return str(value)
@@ -0,0 +1,204 @@
+import uuid
+from types import MappingProxyType
+from typing import Callable, Optional, Tuple
+
+import pandas as pd
+import sqlalchemy
+from django.conf import settings
+from sqlalchemy import exc as sql_exc
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.sql import expression as sql_expr
+
+from app.etl import errors as etl_errors
+from app.etl.connections import ConnectionRegistry
+from app.etl.crud.sql_query import SQLTables
+
+StagedApply = Callable[[sqlalchemy.Connection, sql_expr.TableClause, sql_expr.TableClause, str], int]
+
+
+class StagedChanges:
+    """ETL-сервис применения изменений к таблице SQL базы данных через временную таблицу.
+
+    Строки попадают во временную таблицу через insert_rows движка, поэтому каждая база данных использует свой
+    самый быстрый способ вставки. Движок также преобразует ошибки SQLAlchemy через get_load_error.
+    """
+
+    delete_using = False
+    upserts = MappingProxyType({'postgresql': postgresql.insert, 'sqlite': sqlite.insert})
+    insert_rows: Callable[[sqlalchemy.Connection, pd.DataFrame, str], None]
+    get_load_error: Callable[[sql_exc.SQLAlchemyError], etl_errors.LoadError]
+
+    def apply_staged(
+        self,
+        df: pd.DataFrame,
+        uri: str,
+        resource: str,
+        apply: StagedApply,
+        key: Optional[str] = None,
+    ) -> int:
+        """Применение изменений к таблице через временную таблицу частями, каждая часть - в своей транзакции.
+
+        Args:
+            df: Датафрейм, проиндексированный по ключевой колонке
+            uri: Имя хоста
+            resource: Название таблицы
+            apply: Функция, которая применяет строки временной таблицы к таблице и возвращает количество строк
+            key: Ключевая колонка, по умолчанию название индекса датафрейма
+
+        Raises:
+            LoadTableError: Ошибка таблицы
+            LoadConnectionError: Ошибка подключения
+
+        Returns:
+            int: Количество изменённых строк
+        """
+        df, key = self.get_staged_frame(df, key)
+        affected = 0
+        try:
+            for start in range(0, len(df), settings.ETL_SQL_BATCH_SIZE):
+                with ConnectionRegistry.sql_engine(uri).begin() as sql_conn:
+                    affected += self.apply_batch(
+                        sql_conn, df.iloc[start:start + settings.ETL_SQL_BATCH_SIZE], resource, apply, key,
+                    )
+        except (sql_exc.DBAPIError, sql_exc.NoSuchTableError) as exc:
+            raise self.get_load_error(exc)
+        return affected
+
+    @classmethod
+    def get_staged_frame(cls, df: pd.DataFrame, key: Optional[str] = None) -> Tuple[pd.DataFrame, str]:
+        """Подготовка датафрейма к загрузке во временную таблицу: ключевая колонка должна быть среди колонок.
+
+        Args:
+            df: Датафрейм, проиндексированный по ключевой колонке
+            key: Ключевая колонка, по умолчанию название индекса датафрейма
+
+        Raises:
+            LoadTableError: Ключевая колонка не задана
+
+        Returns:
+            Tuple[pd.DataFrame, str]: Датафрейм и ключевая колонка
+        """
+        key = key or df.index.name
+        if key is None:
+            raise etl_errors.LoadTableError(detail='Не задана ключевая колонка для сопоставления строк')
+        return (df if key in df.columns else df.reset_index()), key
+
+    def apply_batch(
+        self,
+        sql_conn: sqlalchemy.Connection,
+        df: pd.DataFrame,
+        resource: str,
+        apply: StagedApply,
+        key: str,
+    ) -> int:
+        """Применение части изменений к таблице через временную таблицу в уже открытой транзакции.
+
+        Args:
+            sql_conn: Подключение к БД
+            df: Часть датафрейма с ключевой колонкой
+            resource: Название таблицы
+            apply: Функция, которая применяет строки временной таблицы к таблице и возвращает количество строк
+            key: Ключевая колонка
+
+        Returns:
+            int: Количество изменённых строк
+        """
+        target, staging = self.stage(sql_conn, df, resource)
+        affected = apply(sql_conn, target, staging, key)
+        sql_conn.execute(sqlalchemy.text('DROP TABLE {name}'.format(name=staging.name)))
+        return affected
+
+    def stage(
+        self,
+        sql_conn: sqlalchemy.Connection,
+        df: pd.DataFrame,
+        resource: str,
+    ) -> Tuple[sql_expr.TableClause, sql_expr.TableClause]:
+        """Создание временной таблицы с колонками таблицы получателя и вставка в неё строк датафрейма.
+
+        Args:
+            sql_conn: Подключение к БД
+            df: Датафрейм
+            resource: Название таблицы, в том числе вместе со схемой через точку
+
+        Returns:
+            Tuple[sql_expr.TableClause, sql_expr.TableClause]: Таблица получателя и временная таблица
+        """
+        target = SQLTables.get_table(sql_conn, resource)
+        staging = sqlalchemy.table(
+            'etl_staging_{suffix}'.format(suffix=uuid.uuid4().hex),
+            *(sqlalchemy.column(col) for col in df.columns if col in target.c),
+        )
+        template = sqlalchemy.select(*(target.c[col] for col in staging.c.keys())).where(sqlalchemy.false())
+        sql_conn.execute(sqlalchemy.text('CREATE TEMPORARY TABLE {name} AS {template}'.format(
+            name=staging.name,
+            template=template.compile(dialect=sql_conn.dialect, compile_kwargs={'literal_binds': True}),
+        )))
+        self.insert_rows(sql_conn, df[staging.c.keys()], staging.name)
+        return target, staging
+
+    def upsert(
+        self,
+        sql_conn: sqlalchemy.Connection,
+        target: sql_expr.TableClause,
+        staging: sql_expr.TableClause,
+        key: str,
+    ) -> int:
+        """Вставка строк временной таблицы с обновлением существующих через INSERT ... ON CONFLICT DO UPDATE.
+
+        Если ключевая колонка таблицы не уникальна, строки обновляются через UPDATE ... FROM.
+
+        Args:
+            sql_conn: Подключение к БД
+            target: Таблица получателя
+            staging: Временная таблица
+            key: Ключевая колонка
+
+        Raises:
+            LoadTableError: База данных не поддерживает вставку с обновлением
+
+        Returns:
+            int: Количество вставленных и обновлённых строк
+        """
+        columns = [col.name for col in staging.c]
+        changes = {col: staging.c[col] for col in columns if col != key}
+        if not SQLTables.is_unique(sql_conn, target, key):
+            statement = sqlalchemy.update(target).values(changes).where(target.c[key] == staging.c[key])
+            return sql_conn.execute(statement).rowcount
+        if sql_conn.dialect.name not in self.upserts:
+            raise etl_errors.LoadTableError(detail='Вставка с обновлением не поддерживается для {dialect}'.format(
+                dialect=sql_conn.dialect.name,
+            ))
+        rows = sqlalchemy.select(staging).where(sqlalchemy.true())
+        insert = self.upserts[sql_conn.dialect.name](target).from_select(columns, rows)
+        if changes:
+            statement = insert.on_conflict_do_update(
+                index_elements=[key], set_={col: insert.excluded[col] for col in changes},
+            )
+        else:
+            statement = insert.on_conflict_do_nothing(index_elements=[key])
+        return sql_conn.execute(statement).rowcount
+
+    def delete_staged(
+        self,
+        sql_conn: sqlalchemy.Connection,
+        target: sql_expr.TableClause,
+        staging: sql_expr.TableClause,
+        key: str,
+    ) -> int:
+        """Удаление строк таблицы с ключами из временной таблицы.
+
+        Args:
+            sql_conn: Подключение к БД
+            target: Таблица получателя
+            staging: Временная таблица
+            key: Ключевая колонка
+
+        Returns:
+            int: Количество удалённых строк
+        """
+        if self.delete_using:
+            condition = target.c[key] == staging.c[key]
+        else:
+            condition = target.c[key].in_(sqlalchemy.select(staging.c[key]))
+        return sql_conn.execute(sqlalchemy.delete(target).where(condition)).rowcount
@@ -0,0 +1,236 @@
+import datetime
+import json
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import orjson
+import pandas as pd
+
+
+def get_json_default(value: Any) -> str:
+    """Строковое представление значений, которые не сериализуются в JSON напрямую.
+
+    Args:
+        value: Значение
+
+    Returns:
+        str: Строковое представление
+    """
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+class Hashing:
+    """ETL-сервис хеширования содержимого строк датафреймов для их сравнения."""
+
+    null = '\x1f'
+    encoder = json.JSONEncoder(sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=get_json_default)
+
+    @classmethod
+    def get_hashes(cls, df: pd.DataFrame, columns: pd.Index) -> np.ndarray:
+        """Вычисление 64-битного хеша содержимого каждой строки датафрейма.
+
+        Args:
+            df: Датафрейм
+            columns: Колонки, по которым сравниваются строки
+
+        Returns:
+            np.ndarray: Хеши строк
+        """
+        canonical = cls.get_canonical_frame(df.reindex(columns=columns))
+        return pd.util.hash_pandas_object(canonical, index=False).to_numpy()
+
+    @classmethod
+    def get_canonical_frame(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """Приведение колонок датафрейма к каноническому виду для хеширования.
+
+        Скалярные значения приводятся к строкам, чтобы одинаковые данные разных типов
+        (int и float, UUID и str, date и ISO-строка) давали один хеш.
+        Колонки со списками заменяются суммой хешей элементов и длиной списка,
+        поэтому порядок вложенных объектов не влияет на результат сравнения.
+
+        Args:
+            df: Датафрейм
+
+        Returns:
+            pd.DataFrame: Датафрейм из строковых и числовых колонок
+        """
+        columns = [
+            canonical
+            for col in df.columns
+            for canonical in cls.get_canonical_columns(df[col].reset_index(drop=True))
+        ]
+        return pd.DataFrame(dict(enumerate(columns)))
+
+    @classmethod
+    def get_canonical_columns(cls, series: pd.Series) -> List[Union[pd.Series, np.ndarray]]:
+        """Приведение одной колонки к каноническому виду.
+
+        Args:
+            series: Колонка с позиционным индексом
+
+        Returns:
+            List[Union[pd.Series, np.ndarray]]: Одна или две (для списков) канонические колонки
+        """
+        inferred = pd.api.types.infer_dtype(series, skipna=True)
+        if inferred == 'boolean':
+            return [series.astype(str).where(series.notna(), cls.null)]
+        if pd.api.types.is_numeric_dtype(series):
+            return [series.astype('float64').astype(str).where(series.notna(), cls.null)]
+        if inferred in {'string', 'date', 'empty'}:
+            return [series.astype(str).where(series.notna(), cls.null)]
+        if (nested := cls.get_nested_hashes(series)) is not None:
+            return list(nested)
+        return [series.map(cls.get_canonical_value)]
+
+    @classmethod
+    def get_nested_hashes(cls, series: pd.Series) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Векторное хеширование колонки со списками словарей или скалярных значений.
+
+        Args:
+            series: Колонка с позиционным индексом
+
+        Returns:
+            Optional[Tuple[np.ndarray, np.ndarray]]: Суммы хешей элементов и длины списков (-1 для пустых значений)
+        """
+        is_list = np.fromiter((isinstance(cell, list) for cell in series), dtype=bool, count=len(series))
+        if not is_list.any() or not (is_list | series.isna().to_numpy()).all():
+            return None
+        exploded = series[is_list].explode().dropna()
+        elements = cls.get_elements(exploded)
+        if elements is None:
+            return None
+        sums = np.zeros(len(series), dtype='uint64')
+        np.add.at(
+            sums,
+            exploded.index.to_numpy(),
+            pd.util.hash_pandas_object(cls.get_canonical_frame(elements), index=False).to_numpy(),
+        )
+        lengths = np.full(len(series), -1)
+        lengths[is_list] = series[is_list].str.len()
+        return sums, lengths
+
+    @classmethod
+    def get_elements(cls, exploded: pd.Series) -> Optional[pd.DataFrame]:
+        """Датафрейм элементов списков: колонки ключей словарей или одна колонка скалярных значений.
+
+        Args:
+            exploded: Непустые элементы всех списков колонки
+
+        Returns:
+            Optional[pd.DataFrame]: Элементы или None, если списки содержат вложенные списки или смесь словарей
+        """
+        element_types = set(map(type, exploded))
+        if element_types == {dict}:
+            return pd.DataFrame(exploded.tolist()).sort_index(axis='columns')
+        if not element_types & {dict, list}:
+            return exploded.to_frame()
+        return None
+
+    @classmethod
+    def get_canonical_value(cls, value: Any) -> str:
+        """Приведение значения ячейки к каноническому строковому виду.
+
+        Вложенные списки сериализуются в JSON с отсортированными элементами и ключами,
+        поэтому порядок связанных объектов не влияет на результат сравнения.
+
+        Args:
+            value: Значение ячейки
+
+        Returns:
+            str: Каноническое представление значения
+        """
+        if value is None or value is pd.NA or value is pd.NaT:
+            return cls.null
+        if isinstance(value, str):
+            return value
+        if isinstance(value, (list, tuple, np.ndarray, dict)):
+            return cls.get_canonical_json(value)
+        if isinstance(value, (int, float, np.number)) and not isinstance(value, (bool, np.bool_)):
+            return cls.null if value != value else str(float(value))  # noqa: WPS312
+        return get_json_default(value)
+
+    @classmethod
+    def get_canonical_json(cls, value: Union[list, tuple, np.ndarray, dict]) -> str:
+        """Сериализация вложенного словаря или списка значений в JSON независимо от порядка ключей и элементов.
+
+        Args:
+            value: Словарь или список значений
+
+        Returns:
+            str: JSON-строка
+        """
+        if isinstance(value, dict):
+            return cls.encoder.encode(value)
+        if len(value) < 2:
+            return cls.encoder.encode(list(value))
+        try:
+            return cls.encoder.encode(sorted(value))
+        except TypeError:
+            return '[{elements}]'.format(elements=','.join(sorted(map(cls.encoder.encode, value))))
+
+
+class Comparable:
+    """ETL-сервис приведения данных получателя и преобразованных данных источника к общему виду для сравнения."""
+
+    temporal_formats = MappingProxyType({'date': '%Y-%m-%d', 'datetime': '%Y-%m-%dT%H:%M:%S.%f%z'})
+
+    @classmethod
+    def get_frame(cls, df: pd.DataFrame, types: Dict[str, Optional[str]]) -> pd.DataFrame:
+        """Приведение колонок к виду, общему для данных получателя и преобразованных данных источника.
+
+        Данные получателя сравниваются с источником без валидации строк в Transform: даты и время приводятся
+        к строкам ISO в UTC, UUID - к строкам, а строки JSON со списками связанных объектов разбираются.
+        Остальные различия представлений значений сглаживает канонический вид хеширования.
+
+        Args:
+            df: Датафрейм
+            types: Типы данных колонок, пустой тип - у колонок связанных объектов и колонок вне модели
+
+        Returns:
+            pd.DataFrame: Датафрейм с теми же колонками и индексом
+        """
+        return pd.DataFrame(
+            {col: cls.get_column(df[col], types.get(col)) for col in df.columns}, index=df.index,
+        )
+
+    @classmethod
+    def get_column(cls, series: pd.Series, col_type: Optional[str]) -> pd.Series:
+        """Приведение одной колонки к общему для источника и получателя виду по её типу данных.
+
+        Args:
+            series: Колонка
+            col_type: Тип данных колонки
+
+        Returns:
+            pd.Series: Колонка, значения которой не удалось привести, остаются как есть
+        """
+        present = series.notna()
+        if col_type in cls.temporal_formats and present.any():
+            parsed = pd.to_datetime(series, utc=True, errors='coerce', format='ISO8601')
+            rendered = parsed.dt.strftime(cls.temporal_formats[str(col_type)])
+            return series.astype(object).where(parsed.isna(), rendered)
+        if col_type == 'UUID':
+            return series.where(~present, series[present].map(str))
+        if col_type is None and series.dtype == object:
+            encoded = series.map(lambda cell: isinstance(cell, str) and cell.startswith('['))
+            if encoded.any():
+                return series.where(~encoded, series[encoded].map(cls.get_decoded_value))
+        return series
+
+    @classmethod
+    def get_decoded_value(cls, value: str) -> Any:
+        """Разбор строки JSON, которую SQL база данных вернула вместо списка связанных объектов.
+
+        Args:
+            value: Строка JSON
+
+        Returns:
+            Any: Разобранное значение или исходная строка, если это не JSON
+        """
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            return value
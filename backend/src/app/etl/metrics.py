@@ -0,0 +1,257 @@
+import contextlib
+import contextvars
+import functools
+import resource
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+import pandas as pd
+
+from app.enums import RunStatus
+from app.etl.profiling import RunProfiler
+from app.models import ProcessRun, RunProfile
+
+OperatorReport = Dict[str, float]
+
+current_run: contextvars.ContextVar[Optional['RunMetrics']] = contextvars.ContextVar('current_run', default=None)
+
+
+def get_peak_rss() -> int:
+    """Получение пикового RSS процесса с момента последнего сброса.
+
+    Returns:
+        int: Пиковый объём резидентной памяти в байтах
+    """
+    with contextlib.suppress(OSError):
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def reset_peak_rss() -> None:
+    """Сброс пикового RSS процесса, чтобы пик запуска не включал память предыдущих задач воркера.
+
+    Без /proc пик считается с момента запуска процесса.
+    """
+    with contextlib.suppress(OSError):
+        with open('/proc/self/clear_refs', 'w') as refs:
+            refs.write('5')
+
+
+def recorded_run(task: Callable[[int], str]) -> Callable[[int], str]:
+    """Декоратор задачи процесса, который сохраняет показатели её запуска в историю запусков процесса.
+
+    Если у процесса отмечено профилирование следующего запуска, задача выполняется под профилировщиком,
+    а отметка снимается.
+
+    Args:
+        task: Функция задачи, которая принимает идентификатор процесса
+
+    Returns:
+        Callable[[int], str]: Функция задачи с записью запуска
+    """
+    @functools.wraps(task)
+    def wrapper(process_id: int) -> str:
+        profiler = RunProfiler(enabled=RunProfile.claim(process_id))
+        status, result = RunStatus.success, ''
+        with RunMetrics.collect() as metrics:
+            try:
+                with profiler.running():
+                    result = task(process_id)
+            except Exception as exc:
+                status, result = RunStatus.failure, repr(exc)
+                raise
+            finally:
+                run = ProcessRun.record(process_id, task.__name__, metrics.report(), status, result)
+                RunProfile.store(run, profiler.archive())
+        return result
+    return wrapper
+
+
+class OperatorStats:
+    """Показатели одного вызова оператора, которые оператор заполняет по ходу работы."""
+
+    sample_size = 10000
+
+    def __init__(self, enabled: bool):
+        """При инициализации ожидает получить признак сбора показателей.
+
+        Args:
+            enabled: Показатели собираются, иначе объёмы данных не оцениваются
+        """
+        self.enabled = enabled
+        self.rows = 0
+        self.rows_written = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def read(self, *dfs: pd.DataFrame) -> None:
+        """Учёт данных, извлечённых оператором.
+
+        Args:
+            dfs: Извлечённые датафреймы
+        """
+        if self.enabled:
+            self.bytes_read += sum(self.get_size(df) for df in dfs)
+
+    def write(self, rows: int, *dfs: pd.DataFrame) -> None:
+        """Учёт данных, записанных оператором в получателя.
+
+        Args:
+            rows: Количество вставленных, обновлённых и удалённых строк
+            dfs: Записанные датафреймы
+        """
+        self.rows_written += int(rows)
+        if self.enabled:
+            self.bytes_written += sum(self.get_size(df) for df in dfs)
+
+    def get_report(self, seconds: float) -> OperatorReport:
+        """Показатели вызова в виде, который суммируется в показателях запуска.
+
+        Args:
+            seconds: Время вызова в секундах
+
+        Returns:
+            OperatorReport: Показатели одного вызова оператора
+        """
+        return {
+            'calls': 1,
+            'seconds': seconds,
+            'rows': self.rows,
+            'rows_written': self.rows_written,
+            'bytes_read': self.bytes_read,
+            'bytes_written': self.bytes_written,
+            'peak_rss': get_peak_rss(),
+        }
+
+    @classmethod
+    def get_size(cls, df: pd.DataFrame) -> int:
+        """Оценка объёма данных датафрейма в памяти. Объём больших датафреймов оценивается по первым строкам.
+
+        Args:
+            df: Датафрейм
+
+        Returns:
+            int: Объём данных в байтах
+        """
+        if len(df) <= cls.sample_size:
+            return int(df.memory_usage(deep=True, index=False).sum())
+        sample = df.iloc[:cls.sample_size].memory_usage(deep=True, index=False).sum()
+        return int(sample * len(df) / cls.sample_size)
+
+
+class RunMetrics:
+    """ETL-сервис сбора показателей запуска процесса по операторам: времени, строк, объёма данных и памяти.
+
+    Сборщик запуска хранится в переменной контекста, поэтому операторы находят его без передачи через аргументы.
+    Потоки конвейера и ветвления выполняются в копии контекста и пишут в тот же сборщик. Время оператора
+    включает время вложенных в него операторов, а извлечённые данные учитывает только оператор, который их читал.
+    """
+
+    fields = ('calls', 'seconds', 'rows', 'rows_written', 'bytes_read', 'bytes_written')
+
+    def __init__(self) -> None:
+        """При инициализации запоминает время начала запуска."""
+        self.started = time.time()
+        self.finished: Optional[float] = None
+        self.peak_rss = 0
+        self.operators: Dict[str, OperatorReport] = {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    @contextlib.contextmanager
+    def collect(cls) -> Iterator['RunMetrics']:
+        """Сбор показателей операторов, которые выполняются внутри блока.
+
+        Yields:
+            Iterator[RunMetrics]: Сборщик показателей запуска
+        """
+        reset_peak_rss()
+        metrics = cls()
+        token = current_run.set(metrics)
+        try:
+            yield metrics
+        finally:
+            current_run.reset(token)
+            metrics.finish()
+
+    @classmethod
+    @contextlib.contextmanager
+    def measure(cls, operator: str) -> Iterator[OperatorStats]:
+        """Замер одного вызова оператора. Вызов учитывается и при ошибке внутри блока.
+
+        Args:
+            operator: Название оператора
+
+        Yields:
+            Iterator[OperatorStats]: Показатели вызова, которые заполняет оператор
+        """
+        metrics = current_run.get()
+        stats = OperatorStats(enabled=metrics is not None)
+        started = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            if metrics is not None:
+                metrics.add_report(operator, stats.get_report(time.perf_counter() - started))
+            RunProfiler.checkpoint_current()
+
+    @classmethod
+    def merge(cls, reports: Iterable[Dict]) -> 'RunMetrics':
+        """Объединение показателей частей запуска, которые выполнялись в разных задачах.
+
+        Args:
+            reports: Показатели частей из RunMetrics.report
+
+        Returns:
+            RunMetrics: Показатели всего запуска
+        """
+        metrics = cls()
+        metrics.started = float('inf')
+        metrics.finished = 0
+        for report in reports:
+            metrics.started = min(metrics.started, report['started'])
+            metrics.finished = max(metrics.finished, report['finished'])
+            metrics.peak_rss = max(metrics.peak_rss, report['peak_rss'])
+            for operator, operator_report in report['operators'].items():
+                metrics.add_report(operator, operator_report)
+        if metrics.finished < metrics.started:
+            metrics.started = time.time()
+            metrics.finished = metrics.started
+        return metrics
+
+    def finish(self) -> None:
+        """Отметка окончания запуска вместе с пиковым RSS за всё время запуска."""
+        self.finished = time.time()
+        self.peak_rss = max(self.peak_rss, get_peak_rss())
+
+    def add_report(self, operator: str, operator_report: OperatorReport) -> None:
+        """Суммирование показателей оператора. Пиковый RSS берётся наибольшим.
+
+        Args:
+            operator: Название оператора
+            operator_report: Показатели одного или нескольких вызовов оператора
+        """
+        with self.lock:
+            total = self.operators.setdefault(operator, dict.fromkeys((*self.fields, 'peak_rss'), 0))
+            for field in self.fields:
+                total[field] += operator_report[field]
+            total['peak_rss'] = max(total['peak_rss'], operator_report['peak_rss'])
+            self.peak_rss = max(self.peak_rss, int(operator_report['peak_rss']))
+
+    def report(self) -> Dict:
+        """Показатели запуска в виде, который сохраняется в истории и передаётся между задачами.
+
+        Returns:
+            Dict: Время начала и окончания, пиковый RSS и показатели операторов
+        """
+        with self.lock:
+            return {
+                'started': self.started,
+                'finished': self.finished or time.time(),
+                'peak_rss': self.peak_rss,
+                'operators': {operator: dict(total) for operator, total in self.operators.items()},
+            }
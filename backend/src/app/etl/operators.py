@@ -1,32 +1,110 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
 import pandas as pd
+from django.conf import settings
 from django.db.models.query import QuerySet
 
 from app.etl.aggregation import Aggregation
-from app.etl.crud import CRUD
+from app.etl.crud import CRUD, Columns, Partition, Selection
+from app.etl.hashing import Comparable, Hashing
+from app.etl.metrics import RunMetrics
+from app.etl.runner import AsyncRunner
+from app.etl.state import StateKeys, TargetState
 from app.etl.validation import Validation
-from app.models import Database, Model, Relationship
+from app.models import Database, Model, ProcessTarget, Relationship
 
 
 class Select(pd.DataFrame):
     """ETL-оператор для извлечения данных из таблицы базы данных."""
 
-    def __init__(self, df: pd.DataFrame, db: Database, tbl: str):
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        db: Database,
+        tbl: str,
+        filters: Optional[Dict[str, Iterable]] = None,
+        watermark: Optional[Tuple[str, Any]] = None,
+        columns: Optional[Columns] = None,
+        partition: Optional[Partition] = None,
+    ):
         """При инициализации ожидает получить данные об источнике.
 
         Args:
             df: Датафрейм
             db: Данные БД
             tbl: Название таблицы
+            filters: Допустимые значения колонок для отбора строк
+            watermark: Колонка и значение, начиная с которого извлекаются строки
+            columns: Извлекаемые колонки и их типы данных, по умолчанию все колонки
+            partition: Часть таблицы из Select.partitions, по умолчанию вся таблица
         """
-        engine = CRUD.get_engine(db.type)
-        df = engine.read(db.uri, tbl)
+        with RunMetrics.measure(type(self).__name__) as stats:
+            engine = CRUD.get_engine(db.type)
+            df = engine.read(db.uri, tbl, Selection(filters, watermark, columns, partition))
+            stats.rows = len(df)
+            stats.read(df)
         super().__init__(data=df)  # type: ignore[call-arg]
 
+    @classmethod
+    def partitions(cls, db: Database, tbl: str, idx_col: str, count: int) -> List[Partition]:
+        """Разбиение таблицы на части, которые извлекаются независимо друг от друга.
+
+        Args:
+            db: Данные БД
+            tbl: Название таблицы
+            idx_col: Колонка для индексации данных
+            count: Желаемое количество частей
+
+        Returns:
+            List[Partition]: Части таблицы
+        """
+        engine = CRUD.get_engine(db.type)
+        return engine.get_partitions(db.uri, tbl, idx_col, count)
+
+    @classmethod
+    def chunks(
+        cls,
+        db: Database,
+        tbl: str,
+        size: int,
+        columns: Optional[Columns] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Потоковое извлечение данных из таблицы частями фиксированного размера.
+
+        Args:
+            db: Данные БД
+            tbl: Название таблицы
+            size: Количество строк в одной части
+            columns: Извлекаемые колонки и их типы данных, по умолчанию все колонки
+
+        Yields:
+            Iterator[pd.DataFrame]: Датафреймы с частями таблицы
+        """
+        engine = CRUD.get_engine(db.type)
+        chunks = engine.read_chunks(db.uri, tbl, size, columns)
+        while True:
+            with RunMetrics.measure(cls.__name__) as stats:
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    stats.rows = len(chunk)
+                    stats.read(chunk)
+            if chunk is None:
+                return
+            yield chunk
+
 
 class Join(pd.DataFrame):
     """ETL-оператор для объединения таблиц по определённым параметрам и получния нужных данных."""
 
-    def __init__(self, df: pd.DataFrame, db: Database, tbl: str, relations: QuerySet[Relationship], idx_col: str):
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        db: Database,
+        tbl: str,
+        relations: QuerySet[Relationship],
+        idx_col: str,
+        chunked: bool = False,
+    ):
         """При инициализации ожидает получить данные об источнике вместе с присоединёнными таблицами.
 
         Args:
@@ -35,12 +113,131 @@ class Join(pd.DataFrame):
             tbl: Название таблицы
             relations: Связи с другими таблицами
             idx_col: Колонка для индексации данных
+            chunked: Датафрейм является частью таблицы, поэтому связанные строки читаются только для неё
+        """
+        with RunMetrics.measure(type(self).__name__) as stats:
+            if not df.empty:
+                columns = self.get_related_columns(relations, tbl, idx_col)
+                dfs = self.read_related(df[idx_col] if chunked else None, db, tbl, relations, idx_col, columns)
+                stats.read(*dfs.values())
+                new_columns = [Aggregation.get_column(dfs, rel, idx_col, tbl) for rel in relations]
+                df = df.set_index(idx_col, drop=False).join(new_columns)  # type: ignore[arg-type]
+            stats.rows = len(df)
+        super().__init__(data=df)  # type: ignore[call-arg]
+
+    @classmethod
+    def get_related_columns(
+        cls,
+        relations: QuerySet[Relationship],
+        tbl: str,
+        idx_col: str,
+    ) -> Dict[str, Optional[Columns]]:
+        """Определение колонок связанных таблиц, которые нужны для агрегации.
+
+        Промежуточные таблицы связей с условием читаются целиком, так как условие может ссылаться на любые колонки.
+
+        Args:
+            relations: Связи с другими таблицами
+            tbl: Название таблицы
+            idx_col: Колонка для индексации данных
+
+        Returns:
+            Dict[str, Optional[Columns]]: Колонки и их типы данных для каждой таблицы
+        """
+        columns: Dict[str, Optional[Columns]] = {}
+        for rel in relations:
+            related = columns.setdefault(rel.table, {idx_col: None})
+            related.update(rel.model.column_types)  # type: ignore[union-attr]
+            if rel.condition:
+                columns[rel.through_table] = None
+            elif (through := columns.setdefault(rel.through_table, {idx_col: None})) is not None:
+                through.update({tbl + rel.suffix: None, rel.table + rel.suffix: None})
+        return columns
+
+    @classmethod
+    def read_related(
+        cls,
+        keys: Optional[pd.Series],
+        db: Database,
+        tbl: str,
+        relations: QuerySet[Relationship],
+        idx_col: str,
+        columns: Dict[str, Optional[Columns]],
+    ) -> Dict[str, pd.DataFrame]:
+        """Чтение строк связанных таблиц, которые относятся к строкам датафрейма, или таблиц целиком.
+
+        Args:
+            keys: Ключи строк датафрейма, если он является частью таблицы
+            db: Данные БД
+            tbl: Название таблицы
+            relations: Связи с другими таблицами
+            idx_col: Колонка для индексации данных
+            columns: Колонки и их типы данных для каждой таблицы
+
+        Returns:
+            Dict[str, pd.DataFrame]: Датафреймы связанных таблиц
+        """
+        engine = CRUD.get_engine(db.type)
+        if keys is None:
+            return {
+                table: engine.read(db.uri, table, Selection(columns=projection))
+                for table, projection in columns.items()
+            }
+        dfs = {}
+        for rel in relations:
+            if rel.through_table not in dfs:
+                dfs[rel.through_table] = engine.read(db.uri, rel.through_table, Selection(
+                    {tbl + rel.suffix: keys}, columns=columns[rel.through_table],
+                ))
+        related_ids: Dict[str, set] = {}
+        for rel in relations:
+            related_ids.setdefault(rel.table, set()).update(dfs[rel.through_table][rel.table + rel.suffix].dropna())
+        for table, ids in related_ids.items():
+            dfs[table] = engine.read(db.uri, table, Selection({idx_col: ids}, columns=columns[table]))
+        return dfs
+
+
+class SelectJoin(pd.DataFrame):
+    """ETL-оператор для извлечения данных вместе со связанными объектами одним запросом к источнику."""
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        db: Database,
+        tbl: str,
+        relations: QuerySet[Relationship],
+        idx_col: str,
+        filters: Optional[Dict[str, Iterable]] = None,
+        watermark: Optional[Tuple[str, Any]] = None,
+        columns: Optional[Columns] = None,
+    ):
+        """При инициализации ожидает получить данные об источнике вместе со связями.
+
+        Если источник не умеет собирать связанные объекты сам, данные извлекаются операторами Select и Join.
+
+        Args:
+            df: Датафрейм
+            db: Данные БД
+            tbl: Название таблицы
+            relations: Связи с другими таблицами
+            idx_col: Колонка для индексации данных
+            filters: Допустимые значения колонок для отбора строк
+            watermark: Колонка и значение, начиная с которого извлекаются строки
+            columns: Извлекаемые колонки и их типы данных, по умолчанию все колонки
         """
-        if not df.empty:
+        with RunMetrics.measure(type(self).__name__) as stats:
             engine = CRUD.get_engine(db.type)
-            dfs = {table: engine.read(db.uri, table) for rel in relations for table in (rel.table, rel.through_table)}
-            new_columns = [Aggregation.get_column(dfs, rel, idx_col, tbl) for rel in relations]
-            df = df.set_index(idx_col, drop=False).join(new_columns)  # type: ignore[arg-type]
+            try:
+                df = engine.read_joined(db.uri, tbl, relations, idx_col, Selection(filters, watermark, columns))
+            except NotImplementedError:
+                df = (
+                    df
+                    .pipe(Select, db, tbl, filters, watermark, columns)
+                    .pipe(Join, db, tbl, relations, idx_col, chunked=filters is not None or watermark is not None)
+                )
+            else:
+                stats.read(df)
+            stats.rows = len(df)
         super().__init__(data=df)  # type: ignore[call-arg]
 
 
@@ -55,9 +252,11 @@ class Transform(pd.DataFrame):
             model: Модель данных
             relations: Данные по связанным таблицам
         """
-        if not df.empty:
-            schema = Validation.get_schema(model, relations)
-            df = df.apply(schema.validate_row, axis='columns')  # type: ignore[assignment]
+        with RunMetrics.measure(type(self).__name__) as stats:
+            if not df.empty:
+                schema = Validation.get_schema(model, relations)
+                df = schema.validate_frame(df)
+            stats.rows = len(df)
         super().__init__(data=df)  # type: ignore[call-arg]
 
 
@@ -72,10 +271,14 @@ class Load(pd.DataFrame):
             db: Данные БД
             tbl: Название таблицы
         """
-        inserted_rows = 0
-        if not df.empty:
-            engine = CRUD.get_engine(db.type)
-            inserted_rows = engine.create(df, db.uri, tbl)
+        with RunMetrics.measure(type(self).__name__) as stats:
+            inserted_rows = 0
+            if not df.empty and settings.ETL_ASYNC_LOAD:
+                inserted_rows = AsyncRunner.create(df, db, tbl)
+            elif not df.empty:
+                inserted_rows = Sync.apply_changes(db, tbl, (df, df.iloc[:0], df.iloc[:0]))[0]
+            stats.rows = len(df)
+            stats.write(inserted_rows, df)
         super().__init__(data=df)  # type: ignore[call-arg]
         self.inserted_rows = inserted_rows
 
@@ -83,7 +286,15 @@ class Load(pd.DataFrame):
 class Sync(pd.DataFrame):
     """ETL-оператор для синхронизации данных между источником и получателем."""
 
-    def __init__(self, df: pd.DataFrame, db: Database, tbl: str, idx_col: str, source_df: pd.DataFrame):
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        db: Database,
+        tbl: str,
+        idx_col: str,
+        source_df: pd.DataFrame,
+        types: Optional[Columns] = None,
+    ):
         """При инициализации ожидает получить данные об источнике и получателе.
 
         Args:
@@ -92,17 +303,117 @@ class Sync(pd.DataFrame):
             tbl: Название таблицы
             idx_col: Колонка для индексации данных
             source_df: Датафрейм источника
+            types: Типы колонок получателя, если его данные сравниваются с источником без преобразования
+        """
+        with RunMetrics.measure(type(self).__name__) as stats:
+            changes: Tuple[pd.DataFrame, ...] = (source_df, source_df.iloc[:0], df)
+            if not df.empty:
+                changes = Aggregation.get_data_changes(source_df, df, idx_col, types)
+            inserted_rows, updated_rows, deleted_rows = self.load_changes(db, tbl, changes)
+            stats.rows = len(source_df)
+            stats.write(inserted_rows + updated_rows + deleted_rows, *changes)
+        super().__init__(data=df)  # type: ignore[call-arg]
+        self.inserted_rows = inserted_rows
+        self.updated_rows = updated_rows
+        self.deleted_rows = deleted_rows
+
+    @classmethod
+    def load_changes(cls, db: Database, tbl: str, changes: Tuple[pd.DataFrame, ...]) -> Tuple[int, int, int]:
+        """Применение изменений к получателю асинхронным движком, если он включён в настройках, или синхронным.
+
+        Args:
+            db: Данные БД
+            tbl: Название таблицы
+            changes: Датафреймы с новыми, обновленными и удаленными данными
+
+        Returns:
+            Tuple[int, int, int]: Количество вставленных, обновлённых и удалённых строк
+        """
+        if settings.ETL_ASYNC_LOAD:
+            return AsyncRunner.apply_changes(db, tbl, changes)
+        return cls.apply_changes(db, tbl, changes)
+
+    @classmethod
+    def apply_changes(cls, db: Database, tbl: str, changes: Tuple[pd.DataFrame, ...]) -> Tuple[int, int, int]:
+        """Вставка, обновление и удаление строк получателя.
+
+        Args:
+            db: Данные БД
+            tbl: Название таблицы
+            changes: Датафреймы с новыми, обновленными и удаленными данными
+
+        Returns:
+            Tuple[int, int, int]: Количество вставленных, обновлённых и удалённых строк
         """
         engine = CRUD.get_engine(db.type)
-        inserted_rows, updated_rows, deleted_rows = 0, 0, 0
-        if not df.empty:
-            new, modified, deleted = Aggregation.get_data_changes(source_df, df, idx_col)
-            inserted_rows = engine.create(new, db.uri, tbl) if not new.empty else 0
-            updated_rows = engine.update(modified, db.uri, tbl) if not modified.empty else 0
-            deleted_rows = engine.delete(deleted, db.uri, tbl) if not deleted.empty else 0
-        else:
-            inserted_rows = engine.create(source_df, db.uri, tbl) if not source_df.empty else 0
+        new, modified, deleted = changes
+        inserted_rows = engine.create(new, db.uri, tbl) if not new.empty else 0
+        updated_rows = engine.update(modified, db.uri, tbl) if not modified.empty else 0
+        deleted_rows = engine.delete(deleted, db.uri, tbl) if not deleted.empty else 0
+        return inserted_rows, updated_rows, deleted_rows
+
+
+class SyncState(pd.DataFrame):
+    """ETL-оператор для синхронизации данных по локальному снимку состояния получателя вместо чтения его данных.
+
+    Получатель читается целиком, только если снимка нет, он сброшен или количество строк получателя разошлось
+    с количеством ключей снимка. После успешной синхронизации снимок обновляется.
+    """
+
+    def __init__(self, df: pd.DataFrame, target: ProcessTarget, complete: bool = True):
+        """При инициализации ожидает получить данные источника и получателя.
+
+        Args:
+            df: Датафрейм источника после преобразования по схеме получателя
+            target: Получатель
+            complete: Датафрейм содержит все строки источника, поэтому отсутствующие в нём строки получателя удаляются
+        """
+        with RunMetrics.measure(type(self).__name__) as stats:
+            db, tbl, idx_col = target.target, target.to_table, target.process.index_col
+            state = TargetState(target.process_id, db.uri, tbl, df.columns)
+            hashes = state.load()
+            replace = hashes is None or len(hashes) != CRUD.get_engine(db.type).count(db.uri, tbl)
+            if hashes is None or replace:
+                hashes = self.read_state(target, df.columns)
+            key_values = df[idx_col] if idx_col in df.columns else pd.Series(dtype=object)
+            comparable = Comparable.get_frame(df, target.target_columns)
+            keys = StateKeys.get_keys(comparable[idx_col] if idx_col in df.columns else key_values)
+            source_hashes = Hashing.get_hashes(comparable, df.columns)
+            new, modified, deleted = Aggregation.get_state_changes(keys, source_hashes, hashes, complete)
+            deleted_keys = StateKeys.restore_keys(deleted, key_values).rename(idx_col)
+            state.begin()
+            changes = (df[new], df[modified], pd.DataFrame({idx_col: deleted_keys}, index=deleted_keys))
+            inserted_rows, updated_rows, deleted_rows = Sync.load_changes(db, tbl, changes)
+            changed = pd.Series(source_hashes[new | modified], index=keys[new | modified])
+            changed = changed[~changed.index.duplicated(keep='last')]
+            if replace:
+                changed = pd.concat([hashes[~hashes.index.isin(changed.index) & ~hashes.index.isin(deleted)], changed])
+            written = inserted_rows + updated_rows + deleted_rows
+            state.commit(changed, deleted, replace, written=written > 0)
+            stats.rows = len(df)
+            stats.write(written, *changes)
         super().__init__(data=df)  # type: ignore[call-arg]
         self.inserted_rows = inserted_rows
         self.updated_rows = updated_rows
         self.deleted_rows = deleted_rows
+
+    @classmethod
+    def read_state(cls, target: ProcessTarget, columns: pd.Index) -> pd.Series:
+        """Чтение всех данных получателя и вычисление хешей его строк для нового снимка без их преобразования.
+
+        Args:
+            target: Получатель
+            columns: Колонки, по которым хешируются строки
+
+        Returns:
+            pd.Series: Хеши строк получателя по уникальным ключам
+        """
+        types = target.target_columns
+        df = pd.DataFrame().pipe(Select, target.target, target.to_table, columns=types)
+        if df.empty:
+            return pd.Series([], index=pd.Index([], dtype=object), dtype='uint64')
+        comparable = Comparable.get_frame(df, types)
+        hashes = pd.Series(
+            Hashing.get_hashes(comparable, columns), index=StateKeys.get_keys(comparable[target.process.index_col]),
+        )
+        return hashes[~hashes.index.duplicated()]
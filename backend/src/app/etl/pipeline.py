@@ -0,0 +1,247 @@
+import contextlib
+import contextvars
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Type
+
+import pandas as pd
+from django.conf import settings
+from django.db import connections
+
+from app.etl import errors as etl_errors
+from app.etl.profiling import RunProfiler
+
+Stage = Callable[[Any], Any]
+
+
+class Pipeline:
+    """ETL-сервис конвейерного выполнения этапов передачи данных частями в отдельных потоках.
+
+    Этапы соединены очередями ограниченного размера: пока загружается одна часть, следующая преобразуется,
+    а ещё одна извлекается. Если следующий этап не успевает, предыдущий ждёт освобождения места в очереди.
+    Ошибка любого этапа останавливает конвейер и выбрасывается в потоке, который читает результаты.
+    Этапы выполняются в копиях контекста вызывающего потока, поэтому операторы пишут показатели в сборщик запуска,
+    а профилируемый запуск профилирует и их.
+    """
+
+    poll_interval = 0.1
+
+    def __init__(self, size: Optional[int] = None):
+        """При инициализации ожидает получить размер очередей между этапами.
+
+        Args:
+            size: Количество частей, которые ждут следующего этапа, по умолчанию ETL_PIPELINE_QUEUE_SIZE
+        """
+        self.size = size or settings.ETL_PIPELINE_QUEUE_SIZE
+        self.stopped = threading.Event()
+        self.finished = object()
+
+    def run(self, chunks: Iterable[pd.DataFrame], transform: Stage, load: Stage) -> Iterator[Any]:
+        """Запуск этапов извлечения, преобразования и загрузки в отдельных потоках.
+
+        Args:
+            chunks: Части данных, которые извлекаются при итерации
+            transform: Преобразование части данных
+            load: Загрузка части данных
+
+        Yields:
+            Iterator[Any]: Результаты загрузки частей в порядке извлечения
+
+        Raises:
+            ExtractError: Ошибка этапа извлечения
+            TransformError: Ошибка валидации на этапе преобразования
+            LoadError: Ошибка этапа загрузки
+            Exception: Ошибка преобразования, которая не относится к ошибкам ETL, как и при последовательной передаче
+        """
+        extracted: queue.Queue = queue.Queue(self.size)
+        transformed: queue.Queue = queue.Queue(self.size)
+        loaded: queue.Queue = queue.Queue(self.size)
+        workers = [
+            StageThreads.get_worker(self.extract, chunks, extracted),
+            StageThreads.get_worker(self.apply, transform, None, extracted, transformed),
+            StageThreads.get_worker(self.apply, load, etl_errors.LoadTableError, transformed, loaded),
+        ]
+        with self.running(workers):
+            while (part := loaded.get()) is not self.finished:
+                if isinstance(part, Exception):
+                    raise part
+                yield part
+
+    @contextlib.contextmanager
+    def running(self, workers: List[threading.Thread]) -> Iterator[None]:
+        """Запуск потоков этапов на время блока. По выходу из блока конвейер останавливается и потоки завершаются.
+
+        Args:
+            workers: Потоки этапов
+
+        Yields:
+            Iterator[None]: Потоки запущены
+        """
+        for worker in workers:
+            worker.start()
+        try:
+            yield
+        finally:
+            self.stopped.set()
+            for worker in workers:
+                worker.join()
+
+    def extract(self, chunks: Iterable[pd.DataFrame], output: queue.Queue) -> None:
+        """Этап извлечения частей данных.
+
+        Args:
+            chunks: Части данных
+            output: Очередь извлечённых частей
+        """
+        part: Any = self.finished
+        try:
+            for chunk in chunks:
+                if not self.put(output, chunk):
+                    return
+        except Exception as exc:
+            part = StageThreads.wrap(exc, etl_errors.ExtractTableError)
+        finally:
+            connections.close_all()
+        self.put(output, part)
+
+    def apply(self, stage: Stage, error: Optional[Type[Exception]], source: queue.Queue, output: queue.Queue) -> None:
+        """Этап, который применяет функцию к каждой части данных и передаёт результат следующему этапу.
+
+        Ошибки предыдущих этапов передаются дальше без обработки.
+
+        Args:
+            stage: Функция этапа
+            error: Тип ошибки для исключений, которые не относятся к ошибкам ETL, или None, чтобы не приводить их
+            source: Очередь частей от предыдущего этапа
+            output: Очередь результатов этапа
+        """
+        try:
+            while (part := self.get(source)) is not self.finished and not isinstance(part, Exception):
+                if not self.put(output, stage(part)):
+                    return
+        except Exception as exc:
+            part = StageThreads.wrap(exc, error)
+        finally:
+            connections.close_all()
+        self.put(output, part)
+
+    def put(self, output: queue.Queue, part: Any) -> bool:
+        """Передача части данных в очередь с ожиданием свободного места, пока конвейер не остановлен.
+
+        Args:
+            output: Очередь
+            part: Часть данных, признак завершения или ошибка
+
+        Returns:
+            bool: Часть данных передана
+        """
+        while not self.stopped.is_set():
+            with contextlib.suppress(queue.Full):
+                output.put(part, timeout=self.poll_interval)
+                return True
+        return False
+
+    def get(self, source: queue.Queue) -> Any:
+        """Получение части данных из очереди, пока конвейер не остановлен.
+
+        Args:
+            source: Очередь
+
+        Returns:
+            Any: Часть данных, ошибка или признак завершения, если конвейер остановлен
+        """
+        while not self.stopped.is_set():
+            with contextlib.suppress(queue.Empty):
+                return source.get(timeout=self.poll_interval)
+        return self.finished
+
+
+class StageThreads:
+    """ETL-сервис выполнения этапов передачи данных в отдельных потоках.
+
+    Потоки выполняются в копиях контекста вызывающего потока и профилируются вместе с запуском.
+    Исключения этапов, которые не относятся к ошибкам ETL, приводятся к ошибке этапа, на котором они возникли.
+    """
+
+    stage_errors = (etl_errors.ExtractError, etl_errors.TransformError, etl_errors.LoadError)
+
+    @classmethod
+    def branch(cls, parts: List[pd.DataFrame], stages: List[Stage]) -> List[Any]:
+        """Применение этапов к своим частям данных одновременно в отдельных потоках.
+
+        Единственный этап выполняется в текущем потоке.
+
+        Args:
+            parts: Части данных, по одной для каждого этапа
+            stages: Функции этапов, например загрузка в каждый из получателей
+
+        Returns:
+            List[Any]: Результаты этапов в порядке их перечисления
+
+        Raises:
+            ExtractError: Ошибка извлечения внутри этапа
+            TransformError: Ошибка преобразования внутри этапа
+            LoadError: Ошибка загрузки внутри этапа
+        """
+        if len(stages) == 1:
+            return [stages[0](parts[0])]
+        with ThreadPoolExecutor(max_workers=len(stages)) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, RunProfiler.wrap(cls.apply_branch), stage, part)
+                for stage, part in zip(stages, parts)
+            ]
+        return [future.result() for future in futures]
+
+    @classmethod
+    def apply_branch(cls, stage: Stage, part: pd.DataFrame) -> Any:
+        """Применение одного этапа в потоке ветвления.
+
+        Args:
+            stage: Функция этапа
+            part: Часть данных
+
+        Returns:
+            Any: Результат этапа
+
+        Raises:
+            LoadError: Ошибка этапа, которая не относится к ошибкам ETL, с исходным исключением в качестве причины
+        """
+        try:
+            return stage(part)
+        except Exception as exc:
+            raise cls.wrap(exc, etl_errors.LoadTableError)
+        finally:
+            connections.close_all()
+
+    @classmethod
+    def get_worker(cls, target: Callable[..., None], *args: Any) -> threading.Thread:
+        """Создание потока этапа, который выполняется в копии контекста вызывающего потока.
+
+        Если запуск профилируется, поток профилируется вместе с ним.
+
+        Args:
+            target: Функция этапа
+            args: Аргументы функции
+
+        Returns:
+            threading.Thread: Поток этапа
+        """
+        return threading.Thread(target=contextvars.copy_context().run, args=(RunProfiler.wrap(target), *args))
+
+    @classmethod
+    def wrap(cls, exc: Exception, error: Optional[Type[Exception]]) -> Exception:
+        """Приведение исключения к ошибке ETL этапа, на котором оно возникло.
+
+        Args:
+            exc: Исключение
+            error: Тип ошибки этапа или None, если исключение не приводится
+
+        Returns:
+            Exception: Исходная ошибка ETL или ошибка этапа с исходным исключением в качестве причины
+        """
+        if error is None or isinstance(exc, cls.stage_errors):
+            return exc
+        wrapped = error(str(exc))
+        wrapped.__cause__ = exc
+        return wrapped
@@ -0,0 +1,313 @@
+import ast
+import functools
+import operator
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import sqlalchemy
+from sqlalchemy.sql import expression as sql_expr
+
+from app.models import Relationship
+
+
+class JoinPlanner:
+    """ETL-сервис построения одного SQL-запроса, который извлекает таблицу вместе со связанными объектами.
+
+    Связанные объекты собираются в JSON-массивы на стороне базы данных. Если связь нельзя выразить запросом,
+    планировщик выбрасывает NotImplementedError, и данные объединяются в pandas.
+    """
+
+    aggregates = {
+        'sqlite': (sqlalchemy.func.json_group_array, sqlalchemy.func.json_object),
+        'postgresql': (sqlalchemy.func.json_agg, sqlalchemy.func.json_build_object),
+    }
+
+    def __init__(self, sql_conn: sqlalchemy.Connection, tbl: str, idx_col: str):
+        """При инициализации ожидает получить подключение к источнику и параметры родительской таблицы.
+
+        Args:
+            sql_conn: Подключение к БД
+            tbl: Название таблицы
+            idx_col: Колонка для индексации данных
+
+        Raises:
+            NotImplementedError: База данных не умеет собирать JSON-массивы
+        """
+        if sql_conn.dialect.name not in self.aggregates:
+            raise NotImplementedError(sql_conn.dialect.name)
+        self.sql_conn = sql_conn
+        self.tbl = tbl
+        self.idx_col = idx_col
+        self.array = self.aggregates[sql_conn.dialect.name][0]
+        self.document = self.aggregates[sql_conn.dialect.name][1]
+        self.main: sql_expr.FromClause = self.get_table(tbl)
+
+    def get_table(self, resource: str) -> sql_expr.TableClause:
+        """Получение таблицы с колонками из базы данных, но без их типов, как и при обычном чтении таблицы.
+
+        Args:
+            resource: Название таблицы, в том числе вместе со схемой через точку
+
+        Returns:
+            sql_expr.TableClause: Таблица
+        """
+        schema, _, name = resource.rpartition('.')
+        existing = sqlalchemy.inspect(self.sql_conn).get_columns(name, schema=schema or None)
+        return sqlalchemy.table(name, *(sqlalchemy.column(col['name']) for col in existing), schema=schema or None)
+
+    def get_statement(
+        self,
+        relations: Iterable[Relationship],
+        columns: Optional[Iterable[str]] = None,
+        filters: Optional[Dict[str, Iterable]] = None,
+        watermark: Optional[Tuple[str, Any]] = None,
+    ) -> sql_expr.Select:
+        """Построение запроса к таблице, где каждая связь - колонка с JSON-массивом связанных объектов.
+
+        Args:
+            relations: Связи с другими таблицами
+            columns: Извлекаемые колонки таблицы, по умолчанию все
+            filters: Допустимые значения колонок для отбора строк
+            watermark: Колонка и значение, начиная с которого извлекаются строки
+
+        Returns:
+            sql_expr.Select: Запрос SQLAlchemy
+        """
+        conditions = self.get_conditions(filters, watermark)
+        subqueries = {rel.related_name: self.get_relation(rel, conditions) for rel in relations}
+        statement = sqlalchemy.select(*([self.main.c[col] for col in columns] if columns is not None else [self.main]))
+        statement = statement.add_columns(*(
+            subquery.c.value.label(related_name) for related_name, subquery in subqueries.items()
+        ))
+        return statement.select_from(functools.reduce(self.join, subqueries.values(), self.main)).where(*conditions)
+
+    def get_conditions(
+        self,
+        filters: Optional[Dict[str, Iterable]] = None,
+        watermark: Optional[Tuple[str, Any]] = None,
+    ) -> List[sql_expr.ColumnElement]:
+        """Построение условий отбора строк родительской таблицы.
+
+        Args:
+            filters: Допустимые значения колонок для отбора строк
+            watermark: Колонка и значение, начиная с которого извлекаются строки
+
+        Returns:
+            List[sql_expr.ColumnElement]: Условия
+        """
+        clauses: List[sql_expr.ColumnElement] = [
+            self.main.c[col].in_(list(accepted)) for col, accepted in (filters or {}).items()
+        ]
+        if watermark is not None:
+            clauses.append(self.main.c[watermark[0]] >= watermark[1])
+        return clauses
+
+    def join(self, joined: sql_expr.FromClause, subquery: sql_expr.Subquery) -> sql_expr.FromClause:
+        """Присоединение подзапроса связи к родительской таблице по её ключу.
+
+        Args:
+            joined: Родительская таблица вместе с уже присоединёнными подзапросами
+            subquery: Подзапрос из get_relation
+
+        Returns:
+            sql_expr.FromClause: Объединение таблиц
+        """
+        return joined.outerjoin(subquery, subquery.c.key == self.main.c[self.idx_col])
+
+    def get_relation(self, rel: Relationship, conditions: List[sql_expr.ColumnElement]) -> sql_expr.Subquery:
+        """Построение подзапроса со связанными объектами, сгруппированными по ключу родительской таблицы.
+
+        Args:
+            rel: Связь с другой таблицей
+            conditions: Условия отбора родительских строк, если извлекаются не все строки
+
+        Returns:
+            sql_expr.Subquery: Подзапрос с колонками key и value
+        """
+        translator = ConditionTranslator(
+            self.get_table(rel.through_table).alias(), self.get_table(rel.table).alias(), self.idx_col,
+        )
+        key = translator.get_column(translator.through, self.tbl + rel.suffix)
+        related_key = translator.get_column(translator.through, rel.table + rel.suffix)
+        statement = sqlalchemy.select(key.label('key'), self.get_value(rel, translator).label('value'))
+        statement = statement.select_from(translator.through.outerjoin(
+            translator.related, related_key == translator.get_column(translator.related, self.idx_col),
+        ))
+        if rel.condition:
+            statement = statement.where(translator.translate(ast.parse(rel.condition, mode='eval').body))
+        if conditions:
+            statement = statement.where(key.in_(sqlalchemy.select(self.main.c[self.idx_col]).where(*conditions)))
+        return statement.group_by(key).subquery()
+
+    def get_value(self, rel: Relationship, translator: 'ConditionTranslator') -> sql_expr.ColumnElement:
+        """Построение агрегата связанных объектов: массива документов или плоского массива значений.
+
+        Args:
+            rel: Связь с другой таблицей
+            translator: Колонки промежуточной и связанной таблиц связи
+
+        Raises:
+            NotImplementedError: Плоская связь с несколькими колонками
+
+        Returns:
+            sql_expr.ColumnElement: Агрегат
+        """
+        names = [col.name for col in rel.model.columns.all()]
+        if rel.flat:
+            if len(names) != 1:
+                raise NotImplementedError(rel.related_name)
+            return self.array(translator.resolve(names[0]))
+        pairs = [part for name in names for part in (sqlalchemy.literal(name), translator.resolve(name))]
+        return self.array(self.document(*pairs))
+
+
+class ConditionTranslator:
+    """ETL-сервис перевода условия связи из синтаксиса pandas.DataFrame.query в выражение SQL.
+
+    Колонки условия ищутся в промежуточной и связанной таблицах так же, как их видит pandas после объединения.
+    Если условие нельзя перевести, выбрасывается NotImplementedError.
+    """
+
+    conjunctions = (ast.BitAnd, ast.BitOr)
+    comparisons: Dict[type, Tuple[Callable, bool]] = {
+        ast.Eq: (operator.eq, False),
+        ast.NotEq: (operator.ne, True),
+        ast.Lt: (operator.lt, False),
+        ast.LtE: (operator.le, False),
+        ast.Gt: (operator.gt, False),
+        ast.GtE: (operator.ge, False),
+        ast.In: (lambda left, right: left.in_(right), False),
+        ast.NotIn: (lambda left, right: left.not_in(right), True),
+    }
+
+    def __init__(self, through: sql_expr.FromClause, related: sql_expr.FromClause, idx_col: str):
+        """При инициализации ожидает получить таблицы связи.
+
+        Args:
+            through: Промежуточная таблица
+            related: Связанная таблица
+            idx_col: Колонка для индексации данных
+        """
+        self.through = through
+        self.related = related
+        self.idx_col = idx_col
+
+    def resolve(self, name: str) -> sql_expr.ColumnElement:
+        """Поиск колонки по имени так же, как её видит pandas после объединения промежуточной и связанной таблиц.
+
+        Args:
+            name: Название колонки, в том числе с суффиксами _x и _y для совпадающих названий
+
+        Raises:
+            NotImplementedError: Колонки нет или её название неоднозначно
+
+        Returns:
+            sql_expr.ColumnElement: Колонка
+        """
+        through_cols = set(self.through.c.keys()) - {self.idx_col}
+        common = through_cols & set(self.related.c.keys())
+        base, _, side = name.rpartition('_')
+        if base in common and side in {'x', 'y'}:
+            return (self.through if side == 'x' else self.related).c[base]
+        if name in common:
+            raise NotImplementedError(name)
+        if name in through_cols:
+            return self.through.c[name]
+        return self.get_column(self.related, name)
+
+    def translate(self, node: ast.AST) -> Any:
+        """Перевод условия связи в выражение SQL.
+
+        Сравнения с пустыми значениями дают тот же результат, что и в pandas.
+
+        Args:
+            node: Узел синтаксического дерева условия
+
+        Returns:
+            Any: Выражение SQL или список значений
+        """
+        if isinstance(node, ast.Compare):
+            return self.compare(node)
+        if isinstance(node, ast.BoolOp) or (isinstance(node, ast.BinOp) and isinstance(node.op, self.conjunctions)):
+            operands = node.values if isinstance(node, ast.BoolOp) else [node.left, node.right]
+            conjunction = sqlalchemy.and_ if isinstance(node.op, (ast.And, ast.BitAnd)) else sqlalchemy.or_
+            return conjunction(*(self.translate(operand) for operand in operands))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.Invert)):
+            return sqlalchemy.not_(self.translate(node.operand))
+        return self.get_operand(node)
+
+    def get_operand(self, node: ast.AST) -> Any:
+        """Перевод операнда условия: колонки, константы или списка констант.
+
+        Args:
+            node: Узел синтаксического дерева условия
+
+        Raises:
+            NotImplementedError: Условие не переводится в SQL
+
+        Returns:
+            Any: Выражение SQL или список значений
+        """
+        if isinstance(node, ast.Name):
+            return self.resolve(node.id)
+        if isinstance(node, ast.Constant) and node.value is not None:
+            return sqlalchemy.literal(node.value)
+        if isinstance(node, (ast.List, ast.Tuple)):
+            return [self.get_operand(elt) for elt in node.elts]
+        raise NotImplementedError(ast.dump(node))
+
+    def compare(self, node: ast.Compare) -> sql_expr.ColumnElement:
+        """Перевод цепочки сравнений, где пустое значение делает ложным любое сравнение, кроме неравенства.
+
+        Args:
+            node: Узел сравнения
+
+        Returns:
+            sql_expr.ColumnElement: Выражение SQL
+        """
+        operands = [self.get_operand(node.left), *map(self.get_operand, node.comparators)]
+        return sqlalchemy.and_(*(
+            self.get_comparison(op, left, right) for op, left, right in zip(node.ops, operands[:-1], operands[1:])
+        ))
+
+    @classmethod
+    def get_comparison(cls, op: ast.cmpop, left: Any, right: Any) -> sql_expr.ColumnElement:
+        """Построение сравнения двух операндов, результат которого для пустых значений совпадает с pandas.
+
+        Как и в pandas, равенство со списком означает вхождение в список.
+
+        Args:
+            op: Оператор сравнения
+            left: Левый операнд
+            right: Правый операнд
+
+        Raises:
+            NotImplementedError: Оператор сравнения не переводится в SQL
+
+        Returns:
+            sql_expr.ColumnElement: Выражение SQL
+        """
+        op_type = op.__class__
+        if isinstance(right, list) and op_type in {ast.Eq, ast.NotEq}:
+            op_type = ast.In if op_type is ast.Eq else ast.NotIn
+        if op_type not in cls.comparisons:
+            raise NotImplementedError(op_type.__name__)
+        compare, negative = cls.comparisons[op_type]
+        return sqlalchemy.func.coalesce(compare(left, right), sqlalchemy.true() if negative else sqlalchemy.false())
+
+    @classmethod
+    def get_column(cls, table: sql_expr.FromClause, name: str) -> sql_expr.ColumnElement:
+        """Получение колонки таблицы по названию.
+
+        Args:
+            table: Таблица
+            name: Название колонки
+
+        Raises:
+            NotImplementedError: Колонки нет в таблице
+
+        Returns:
+            sql_expr.ColumnElement: Колонка
+        """
+        if name not in table.c:
+            raise NotImplementedError(name)
+        return table.c[name]
@@ -0,0 +1,184 @@
+import contextlib
+import contextvars
+import cProfile
+import functools
+import io
+import marshal
+import pstats
+import threading
+import tracemalloc
+import zipfile
+from typing import Any, Callable, Iterator, List, Optional
+
+current_profiler: contextvars.ContextVar[Optional['RunProfiler']] = contextvars.ContextVar(
+    'current_profiler', default=None,
+)
+
+
+class RunProfiler:
+    """ETL-сервис профилирования отдельного запуска процесса через cProfile и tracemalloc.
+
+    Профилировщик запуска хранится в переменной контекста. Потоки конвейера и ветвления, которые запускаются
+    внутри профилируемого блока, профилируются своими экземплярами cProfile, а их статистика объединяется
+    со статистикой вызывающего потока. Без включённого профилирования функции потоков не оборачиваются.
+    """
+
+    top = 50
+
+    def __init__(self, enabled: bool = True):
+        """При инициализации ожидает получить признак профилирования запуска.
+
+        Args:
+            enabled: Запуск профилируется, иначе профилировщик ничего не делает
+        """
+        self.enabled = enabled
+        self.profile = cProfile.Profile()
+        self.thread_profiles: List[cProfile.Profile] = []
+        self.memory = AllocationTracker()
+        self.lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def running(self) -> Iterator[None]:
+        """Профилирование кода внутри блока, если запуск профилируется.
+
+        Yields:
+            Iterator[None]: Профилирование запущено
+        """
+        if not self.enabled:
+            yield
+            return
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start(AllocationTracker.frames)
+        token = current_profiler.set(self)
+        self.profile.enable()
+        try:
+            yield
+        finally:
+            current_profiler.reset(token)
+            self.finish(stop_tracing=not tracing)
+
+    def finish(self, stop_tracing: bool) -> None:
+        """Остановка профилирования вызывающего потока и отслеживания памяти.
+
+        Args:
+            stop_tracing: Остановить tracemalloc, если его запустило профилирование
+        """
+        self.profile.disable()
+        self.memory.finish(stop_tracing)
+
+    @classmethod
+    def checkpoint_current(cls) -> None:
+        """Снимок выделенной памяти для профилировщика текущего запуска, если запуск профилируется."""
+        profiler = current_profiler.get()
+        if profiler is not None:
+            profiler.memory.checkpoint()
+
+    @classmethod
+    def wrap(cls, target: Callable[..., Any]) -> Callable[..., Any]:
+        """Обёртка функции потока, которая профилирует её, если поток запускается внутри профилируемого блока.
+
+        Args:
+            target: Функция потока
+
+        Returns:
+            Callable[..., Any]: Функция потока, без профилирования - исходная функция
+        """
+        profiler = current_profiler.get()
+        if profiler is None:
+            return target
+        return functools.partial(profiler.run_thread, target)
+
+    def run_thread(self, target: Callable[..., Any], *args: Any) -> Any:
+        """Выполнение функции потока под отдельным экземпляром cProfile.
+
+        Args:
+            target: Функция потока
+            args: Аргументы функции
+
+        Returns:
+            Any: Результат функции
+        """
+        profile = cProfile.Profile()
+        with self.lock:
+            self.thread_profiles.append(profile)
+        return profile.runcall(target, *args)
+
+    def archive(self) -> Optional[bytes]:
+        """Сборка архива с результатами профилирования.
+
+        Архив содержит статистику cProfile для pstats и snakeviz, её текстовый отчёт по суммарному и собственному
+        времени функций и места в коде, где было выделено больше всего памяти.
+
+        Returns:
+            Optional[bytes]: Архив ZIP или None, если запуск не профилировался
+        """
+        if not self.enabled:
+            return None
+        stats = pstats.Stats(self.profile)
+        with self.lock:
+            for profile in self.thread_profiles:
+                stats.add(profile)
+        report = io.StringIO()
+        stats.stream = report  # type: ignore[attr-defined]
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('profile.prof', marshal.dumps(stats.stats))  # type: ignore[attr-defined]
+            archive.writestr('profile.txt', report.getvalue())
+            archive.writestr('allocations.txt', self.memory.report(self.top))
+        return buffer.getvalue()
+
+
+class AllocationTracker:
+    """Отслеживание памяти запуска через tracemalloc: пикового объёма и мест выделения в самом большом снимке."""
+
+    frames = 1
+
+    def __init__(self) -> None:
+        """При инициализации снимков памяти ещё нет."""
+        self.allocations: Optional[tracemalloc.Snapshot] = None
+        self.allocated = 0
+        self.traced_peak = 0
+        self.lock = threading.Lock()
+
+    def checkpoint(self) -> None:
+        """Снимок выделенной памяти, если её сейчас больше, чем в предыдущем сохранённом снимке.
+
+        Снимки делаются по окончании операторов, пока их данные ещё в памяти, поэтому в отчёт попадают места
+        выделения памяти в момент, близкий к пику запуска.
+        """
+        allocated = tracemalloc.get_traced_memory()[0]
+        with self.lock:
+            if allocated > self.allocated or self.allocations is None:
+                self.allocations = tracemalloc.take_snapshot()
+                self.allocated = allocated
+
+    def finish(self, stop_tracing: bool) -> None:
+        """Последний снимок выделенной памяти и остановка её отслеживания.
+
+        Args:
+            stop_tracing: Остановить tracemalloc, если его запустило профилирование
+        """
+        self.checkpoint()
+        self.traced_peak = tracemalloc.get_traced_memory()[1]
+        if stop_tracing:
+            tracemalloc.stop()
+
+    def report(self, top: int) -> str:
+        """Текстовый отчёт о местах в коде, где было выделено больше всего памяти.
+
+        Args:
+            top: Количество мест выделения памяти в отчёте
+
+        Returns:
+            str: Пиковый объём отслеживаемой памяти и места выделения памяти в самом большом снимке
+        """
+        lines = [
+            'Peak traced memory: {size} B'.format(size=self.traced_peak),
+            'Largest snapshot: {size} B'.format(size=self.allocated),
+        ]
+        if self.allocations is not None:
+            lines.extend(str(stat) for stat in self.allocations.statistics('lineno')[:top])
+        return '\n'.join(lines)
@@ -0,0 +1,95 @@
+import asyncio
+from typing import Awaitable, Tuple, TypeVar
+
+import pandas as pd
+
+from app.etl.async_crud import AsyncCRUD
+from app.etl.connections import AsyncConnectionRegistry
+from app.models import Database
+
+Result = TypeVar('Result')
+
+
+class AsyncRunner:
+    """ETL-сервис запуска асинхронной загрузки данных из синхронного кода задач Celery.
+
+    Каждый запуск выполняется в своём цикле событий, по завершении которого закрываются его подключения.
+    Асинхронный код, например представления ASGI-приложения, может вызывать движки AsyncCRUD напрямую.
+    """
+
+    @classmethod
+    def run(cls, operation: Awaitable[Result]) -> Result:
+        """Выполнение корутины в новом цикле событий.
+
+        Args:
+            operation: Корутина
+
+        Returns:
+            Result: Результат корутины
+        """
+        return asyncio.run(cls.complete(operation))
+
+    @classmethod
+    async def complete(cls, operation: Awaitable[Result]) -> Result:
+        """Ожидание корутины с закрытием подключений цикла событий после её завершения.
+
+        Args:
+            operation: Корутина
+
+        Returns:
+            Result: Результат корутины
+        """
+        try:
+            return await operation
+        finally:
+            await AsyncConnectionRegistry.close_all()
+
+    @classmethod
+    def create(cls, df: pd.DataFrame, db: Database, tbl: str) -> int:
+        """Вставка данных асинхронным движком получателя.
+
+        Args:
+            df: Датафрейм
+            db: Данные БД
+            tbl: Название таблицы
+
+        Returns:
+            int: Количество вставленных строк
+        """
+        return cls.run(AsyncCRUD.get_engine(db.type).create(df, db.uri, tbl))
+
+    @classmethod
+    def apply_changes(cls, db: Database, tbl: str, changes: Tuple[pd.DataFrame, ...]) -> Tuple[int, int, int]:
+        """Применение изменений асинхронным движком получателя в одном цикле событий.
+
+        Args:
+            db: Данные БД
+            tbl: Название таблицы
+            changes: Датафреймы с новыми, обновленными и удаленными данными
+
+        Returns:
+            Tuple[int, int, int]: Количество вставленных, обновлённых и удалённых строк
+        """
+        return cls.run(cls.get_changes(AsyncCRUD.get_engine(db.type), db.uri, tbl, changes))
+
+    @classmethod
+    async def get_changes(
+        cls, engine: AsyncCRUD, uri: str, tbl: str, changes: Tuple[pd.DataFrame, ...],
+    ) -> Tuple[int, int, int]:
+        """Вставка, обновление и удаление строк друг за другом, каждое из них - одновременными запросами.
+
+        Args:
+            engine: Асинхронный движок получателя
+            uri: Имя хоста
+            tbl: Название таблицы
+            changes: Датафреймы с новыми, обновленными и удаленными данными
+
+        Returns:
+            Tuple[int, int, int]: Количество вставленных, обновлённых и удалённых строк
+        """
+        new, modified, deleted = changes
+        return (
+            await engine.create(new, uri, tbl) if not new.empty else 0,
+            await engine.update(modified, uri, tbl) if not modified.empty else 0,
+            await engine.delete(deleted, uri, tbl) if not deleted.empty else 0,
+        )
@@ -0,0 +1,51 @@
+from typing import Any
+
+import orjson
+from elasticsearch.exceptions import SerializationError
+from elasticsearch.serializer import JSONSerializer
+
+
+class OrjsonSerializer(JSONSerializer):
+    """Сериализатор JSON для клиента Elasticsearch на основе orjson.
+
+    UUID, даты и типы numpy сериализуются самим orjson, остальные значения - стандартным сериализатором клиента.
+    Пустые дробные значения (NaN) сериализуются как null.
+    """
+
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, data: Any) -> str:
+        """Сериализация данных в строку JSON.
+
+        Args:
+            data: Данные
+
+        Raises:
+            SerializationError: Ошибка сериализации
+
+        Returns:
+            str: Строка JSON
+        """
+        if isinstance(data, str):
+            return data
+        try:
+            return orjson.dumps(data, default=self.default, option=self.option).decode()
+        except TypeError as exc:
+            raise SerializationError(data, exc)
+
+    def loads(self, data: Any) -> Any:
+        """Десериализация строки JSON.
+
+        Args:
+            data: Строка JSON
+
+        Raises:
+            SerializationError: Ошибка десериализации
+
+        Returns:
+            Any: Данные
+        """
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError as exc:
+            raise SerializationError(data, exc)
@@ -0,0 +1,161 @@
+import contextlib
+import hashlib
+import os
+import sqlite3
+import uuid
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from app.etl.caching import bump_version, get_version
+
+
+class TargetState:
+    """ETL-сервис локального снимка состояния получателя: ключей строк и хешей их содержимого.
+
+    Снимок хранится в файле SQLite на диске воркера и обновляется после каждой успешной синхронизации, поэтому
+    изменения источника можно найти без чтения данных получателя. Снимок не используется, если его нет на диске
+    воркера, изменился состав колонок, предыдущая синхронизация не завершилась или его сбросили через админку.
+    Версия сброса хранится в общем кэше Django, поэтому сброс из веб-процесса виден всем воркерам.
+
+    Снимок другого воркера не виден, поэтому в общем кэше хранится ещё и номер синхронизации получателя,
+    который увеличивается при каждом сохранении снимка. Снимок с другим номером устарел: получателя
+    с тех пор изменил другой воркер.
+    """
+
+    suffix = '.sqlite'
+    version_key = 'etl:state-version:{process}'
+    generation_key = 'etl:state-generation:{digest}'
+
+    def __init__(self, process_id: int, uri: str, resource: str, columns: Iterable[str]):
+        """При инициализации ожидает получить процесс, получателя и колонки, по которым хешируются строки.
+
+        Args:
+            process_id: Идентификатор процесса
+            uri: Имя хоста получателя
+            resource: Название таблицы или индекса получателя
+            columns: Колонки, по которым хешируются строки
+        """
+        digest = hashlib.sha1(repr((uri, resource)).encode()).hexdigest()
+        self.path = os.path.join(settings.ETL_STATE_DIR, '{process}-{digest}{suffix}'.format(
+            process=process_id, digest=digest, suffix=self.suffix,
+        ))
+        version = get_version(self.version_key.format(process=process_id))
+        self.fingerprint = repr((version, list(columns)))
+        self.counter = self.generation_key.format(digest=digest)
+        self.generation = get_version(self.counter)
+
+    @classmethod
+    def invalidate(cls, process_id: int) -> None:
+        """Сброс снимков процесса на всех воркерах, чтобы следующая синхронизация перечитала получателей.
+
+        Args:
+            process_id: Идентификатор процесса
+        """
+        bump_version(cls.version_key.format(process=process_id))
+
+    def load(self) -> Optional[pd.Series]:
+        """Чтение хешей строк из снимка, сохранённого после успешной синхронизации.
+
+        Returns:
+            Optional[pd.Series]: Хеши строк по ключам или None, если снимка нет или он недействителен
+        """
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with self.connect() as conn:
+                meta = dict(conn.execute('SELECT name, value FROM meta'))
+                if meta.get('fingerprint') != self.fingerprint or meta.get('valid') != '1':
+                    return None
+                if meta.get('generation') != str(self.generation):
+                    return None
+                rows = conn.execute('SELECT key, hash FROM state').fetchall()
+        except sqlite3.DatabaseError:
+            return None
+        keys, hashes = zip(*rows) if rows else ((), ())
+        return pd.Series(np.array(hashes, dtype='int64').view('uint64'), index=pd.Index(keys, dtype=object))
+
+    def begin(self) -> None:
+        """Отметка снимка недействительным на время применения изменений к получателю.
+
+        Если синхронизация прервётся, следующий запуск перечитает получателя вместо устаревшего снимка.
+        """
+        if os.path.exists(self.path):
+            with self.connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('valid', '0')")
+
+    def commit(self, changed: pd.Series, deleted: pd.Index, replace: bool = False, written: bool = True) -> None:
+        """Сохранение хешей изменённых строк после успешной синхронизации.
+
+        Если синхронизация изменила получателя, номер синхронизации получателя увеличивается. Если получателя
+        успели изменить другие воркеры, снимок сохраняется недействительным, так как в нём нет их изменений.
+
+        Args:
+            changed: Хеши новых и изменённых строк по ключам или всех строк при полной перезаписи
+            deleted: Ключи удалённых строк
+            replace: Перезаписать снимок целиком
+            written: Синхронизация изменила данные получателя
+        """
+        generation = bump_version(self.counter) if written else get_version(self.counter)
+        valid = '1' if generation == self.generation + int(written) else '0'
+        with self.connect() as conn:
+            if replace:
+                conn.execute('DELETE FROM state')
+            conn.executemany('DELETE FROM state WHERE key = ?', ((key,) for key in deleted.tolist()))
+            conn.executemany('INSERT OR REPLACE INTO state VALUES (?, ?)', zip(
+                changed.index.tolist(), changed.to_numpy(dtype='uint64').view('int64').tolist(),
+            ))
+            conn.executemany('INSERT OR REPLACE INTO meta VALUES (?, ?)', (
+                ('fingerprint', self.fingerprint), ('generation', str(generation)), ('valid', valid),
+            ))
+
+    @contextlib.contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        """Подключение к файлу снимка в транзакции, которая фиксируется при выходе из блока без ошибок.
+
+        Yields:
+            Iterator[sqlite3.Connection]: Подключение к снимку
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                conn.execute('CREATE TABLE IF NOT EXISTS state (key PRIMARY KEY, hash INTEGER NOT NULL) WITHOUT ROWID')
+                conn.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)')
+                yield conn
+        finally:
+            conn.close()
+
+
+class StateKeys:
+    """ETL-сервис приведения ключей строк к значениям, которые хранятся в снимке состояния получателя, и обратно."""
+
+    @classmethod
+    def get_keys(cls, column: pd.Series) -> pd.Index:
+        """Приведение ключей строк к значениям, которые SQLite хранит без потерь.
+
+        Args:
+            column: Значения ключевой колонки
+
+        Returns:
+            pd.Index: Ключи строк
+        """
+        return pd.Index([str(key) if isinstance(key, uuid.UUID) else key for key in column.tolist()], dtype=object)
+
+    @classmethod
+    def restore_keys(cls, keys: pd.Index, column: pd.Series) -> pd.Index:
+        """Приведение ключей из снимка к типу значений ключевой колонки датафрейма.
+
+        Args:
+            keys: Ключи строк из снимка
+            column: Значения ключевой колонки датафрейма
+
+        Returns:
+            pd.Index: Ключи строк
+        """
+        sample = column.dropna()
+        if not sample.empty and isinstance(sample.iloc[0], uuid.UUID):
+            return keys.map(uuid.UUID)
+        return keys
@@ -0,0 +1,270 @@
+import functools
+from typing import Dict, Iterable, List, Optional
+
+import pandas
+from celery import Signature, Task, chord
+from django.conf import settings
+
+from app.enums import RunStatus
+from app.etl.crud import CRUD
+from app.etl.metrics import RunMetrics
+from app.etl.operators import Join, Load, Select, SelectJoin, Sync, SyncState, Transform
+from app.etl.pipeline import Pipeline, StageThreads
+from app.etl.watermarks import Watermark
+from app.models import Process, ProcessRun, ProcessTarget, Relationship
+
+
+class Targets:
+    """ETL-сервис передачи однажды извлечённых данных источника во все получатели процесса одновременно."""
+
+    @classmethod
+    def refresh(cls, process: Process) -> None:
+        """Публикация загруженных за запуск данных в получателях одним обновлением в конце запуска.
+
+        Args:
+            process: Процесс
+        """
+        for target in process.targets:
+            CRUD.get_engine(target.target.type).refresh(target.target.uri, target.to_table)
+
+    @classmethod
+    def transform(
+        cls, df: pandas.DataFrame, process: Process, relations: Iterable[Relationship],
+    ) -> List[pandas.DataFrame]:
+        """Преобразование извлечённых данных по схеме каждого получателя процесса.
+
+        Args:
+            df: Датафрейм источника
+            process: Процесс
+            relations: Связи с другими таблицами
+
+        Returns:
+            List[pandas.DataFrame]: Датафреймы для каждого получателя
+        """
+        return [df.pipe(Transform, target.model, relations) for target in process.targets]
+
+    @classmethod
+    def load(cls, dfs: List[pandas.DataFrame], process: Process) -> int:
+        """Одновременная загрузка данных во все получатели процесса.
+
+        Args:
+            dfs: Датафреймы для каждого получателя из Targets.transform
+            process: Процесс
+
+        Returns:
+            int: Количество загруженных строк во всех получателях
+        """
+        loaded = StageThreads.branch(dfs, [
+            functools.partial(Load, db=target.target, tbl=target.to_table) for target in process.targets
+        ])
+        return int(sum(df.inserted_rows for df in loaded))
+
+    @classmethod
+    def sync_target(
+        cls,
+        source_df: pandas.DataFrame,
+        target: ProcessTarget,
+        filters: Optional[Dict[str, Iterable]] = None,
+    ) -> pandas.DataFrame:
+        """Синхронизация одного получателя с преобразованными для него данными источника.
+
+        Если включены снимки состояния получателей, изменения ищутся по снимку без чтения данных получателя.
+        Иначе данные получателя сравниваются с источником в общем виде без преобразования в Transform.
+
+        Args:
+            source_df: Датафрейм источника после преобразования по схеме получателя
+            target: Получатель
+            filters: Допустимые значения колонок для отбора строк получателя
+
+        Returns:
+            pandas.DataFrame: Результат синхронизации с количеством изменённых строк
+        """
+        if settings.ETL_SYNC_STATE:
+            return source_df.pipe(SyncState, target, complete=filters is None)
+        types = target.target_columns
+        return (
+            pandas.DataFrame()
+            .pipe(Select, target.target, target.to_table, filters=filters, columns=types)
+            .pipe(Sync, target.target, target.to_table, target.process.index_col, source_df=source_df, types=types)
+        )
+
+    @classmethod
+    def sync(
+        cls,
+        source_df: pandas.DataFrame,
+        process: Process,
+        relations: Iterable[Relationship],
+        filters: Optional[Dict[str, Iterable]] = None,
+    ) -> str:
+        """Одновременная синхронизация всех получателей процесса с однажды извлечёнными данными.
+
+        Args:
+            source_df: Датафрейм источника
+            process: Процесс
+            relations: Связи с другими таблицами
+            filters: Допустимые значения колонок для отбора строк получателей
+
+        Returns:
+            str: Результат передачи данных
+        """
+        synced = StageThreads.branch(cls.transform(source_df, process, relations), [
+            functools.partial(cls.sync_target, target=target, filters=filters)
+            for target in process.targets
+        ])
+        cls.refresh(process)
+        return 'процесс={process}, загружено={inserted}, обновлено={updated}, удалено={deleted}'.format(
+            process=process,
+            inserted=sum(df.inserted_rows for df in synced),
+            updated=sum(df.updated_rows for df in synced),
+            deleted=sum(df.deleted_rows for df in synced),
+        )
+
+
+class Transfer:
+    """ETL-сервис передачи и синхронизации данных процесса, которые выполняют задачи Celery."""
+
+    @classmethod
+    def single(cls, process: Process) -> str:
+        """Передача данных в одной задаче: целиком или частями, если у процесса задан их размер.
+
+        Args:
+            process: Процесс
+
+        Returns:
+            str: Результат передачи данных
+        """
+        if process.chunk_size:
+            return cls.chunks(process)
+        relations = process.relationships.all()
+        df = pandas.DataFrame().pipe(
+            SelectJoin, process.source, process.from_table, relations, process.index_col,
+            columns=process.source_columns,
+        )
+        inserted_rows = Targets.load(Targets.transform(df, process, relations), process)
+        Targets.refresh(process)
+        return f'процесс={process}, загружено={inserted_rows}'
+
+    @classmethod
+    def chunks(cls, process: Process) -> str:
+        """Передача данных частями, чтобы не держать в памяти всю таблицу.
+
+        Извлечение, преобразование и загрузка частей выполняются одновременно в конвейере.
+
+        Args:
+            process: Процесс
+
+        Returns:
+            str: Результат передачи данных
+        """
+        relations = process.relationships.all()
+        loaded = Pipeline().run(
+            Select.chunks(process.source, process.from_table, process.chunk_size, process.source_columns),
+            transform=lambda chunk: Targets.transform(
+                chunk.pipe(Join, process.source, process.from_table, relations, process.index_col, chunked=True),
+                process,
+                relations,
+            ),
+            load=lambda dfs: Targets.load(dfs, process),
+        )
+        inserted_rows = sum(loaded)
+        Targets.refresh(process)
+        return f'процесс={process}, загружено={inserted_rows}'
+
+    @classmethod
+    def partition(cls, process: Process, partition: dict) -> dict:
+        """Передача одной части источника без публикации данных в получателях.
+
+        Args:
+            process: Процесс
+            partition: Часть источника из Select.partitions
+
+        Returns:
+            dict: Количество загруженных строк и показатели передачи части
+        """
+        relations = process.relationships.all()
+        with RunMetrics.collect() as metrics:
+            df = (
+                pandas.DataFrame()
+                .pipe(Select, process.source, process.from_table, columns=process.source_columns, partition=partition)
+                .pipe(Join, process.source, process.from_table, relations, process.index_col, chunked=True)
+            )
+            inserted_rows = Targets.load(Targets.transform(df, process, relations), process)
+            return {'inserted_rows': inserted_rows, 'metrics': metrics.report()}
+
+    @classmethod
+    def dispatch(cls, process: Process, task: Task, callback: Signature) -> int:
+        """Запуск задач частей источника с задачей, которая выполняется после их завершения.
+
+        Args:
+            process: Процесс
+            task: Задача передачи одной части источника
+            callback: Задача подведения итога передачи
+
+        Returns:
+            int: Количество частей
+        """
+        partitions = Select.partitions(process.source, process.from_table, process.index_col, process.partitions)
+        chord(task.s(process.id, partition) for partition in partitions)(callback)
+        return len(partitions)
+
+    @classmethod
+    def record_failure(cls, process_id: int, started: float, exc: BaseException) -> None:
+        """Сохранение в историю неуспешной передачи данных частями источника.
+
+        Args:
+            process_id: Идентификатор процесса
+            started: Время запуска передачи
+            exc: Ошибка
+        """
+        metrics = RunMetrics()
+        metrics.started = started
+        metrics.finish()
+        ProcessRun.record(process_id, 'transfer_data_partitioned', metrics.report(), RunStatus.failure, repr(exc))
+
+    @classmethod
+    def sync(cls, process: Process) -> str:
+        """Синхронизация данных между источником и получателями.
+
+        Args:
+            process: Процесс
+
+        Returns:
+            str: Результат передачи данных
+        """
+        if process.incremental_col:
+            return cls.sync_incremental(process)
+        relations = process.relationships.all()
+        source_df = pandas.DataFrame().pipe(
+            SelectJoin, process.source, process.from_table, relations, process.index_col,
+            columns=process.source_columns,
+        )
+        return Targets.sync(source_df, process, relations)
+
+    @classmethod
+    def sync_incremental(cls, process: Process) -> str:
+        """Синхронизация только тех строк источника, которые изменились после прошлого запуска.
+
+        Строки с отметкой, равной отметке прошлого запуска, извлекаются повторно, чтобы не пропустить строки, которые
+        были записаны с тем же значением инкрементальной колонки после прошлого запуска. Уже синхронизированные из них
+        отсеиваются сравнением с получателем по ключу. Удалённые в источнике строки при такой синхронизации
+        не обнаруживаются.
+
+        Args:
+            process: Процесс
+
+        Returns:
+            str: Результат передачи данных
+        """
+        relations = process.relationships.all()
+        checkpoint = Watermark.get_checkpoint(process)
+        source_df = pandas.DataFrame().pipe(
+            SelectJoin, process.source, process.from_table, relations, process.index_col,
+            watermark=checkpoint, columns=process.source_columns,
+        )
+        mark = source_df[process.incremental_col].max() if not source_df.empty else None
+        result = Targets.sync(
+            source_df, process, relations, {process.index_col: source_df[process.index_col]} if checkpoint else None,
+        )
+        if not pandas.isna(mark):
+            Watermark.advance(process, mark)
+        return result
@@ -1,14 +1,15 @@
 import builtins
 import datetime
 import uuid
-from typing import Any, Dict, List, Type
+from typing import Any, Dict, Iterable, List, Type
 
 import pandas
-from django.db.models.query import QuerySet
 from django.forms.models import model_to_dict
 from pydantic import BaseModel, Field, ValidationError, create_model, validator
 from pydantic.fields import FieldInfo, ModelField
 
+from app.etl.caching import SchemaCache
+from app.etl.coercion import Coercion
 from app.etl.errors import TransformError
 from app.models import Column, Model, Relationship
 
@@ -38,9 +39,11 @@ class Validation(BaseModel):
         return value
 
     @classmethod
-    def get_schema(cls, model: Model, relations: QuerySet[Relationship]) -> Type['Validation']:
+    def get_schema(cls, model: Model, relations: Iterable[Relationship]) -> Type['Validation']:
         """Получение динамической схемы для валидации данных.
 
+        Схемы кэшируются в памяти процесса по идентификаторам модели и связей до изменения метаданных.
+
         Args:
             model: Модель объекта
             relations: Данные о вложенных объектах
@@ -48,6 +51,10 @@ class Validation(BaseModel):
         Returns:
             Type[Validation]: Схема валидации данных
         """
+        key = model.pk, tuple(rel.pk for rel in relations)
+        schema = SchemaCache.get(key)
+        if schema is not None:
+            return schema  # type: ignore[return-value]
         fields = cls.get_fields(model)
         for rel in relations:
             if not rel.flat:
@@ -55,7 +62,9 @@ class Validation(BaseModel):
             else:
                 nested_type = cls.get_type(rel.model.columns.first().type)
             fields[rel.related_name] = List[nested_type], Field(default=[])  # type: ignore[valid-type]
-        return create_model(model.title, __base__=cls, **fields)
+        schema = create_model(model.title, __base__=cls, **fields)
+        SchemaCache.set(key, schema)
+        return schema
 
     @classmethod
     def get_fields(cls, model: Model) -> Dict:
@@ -127,3 +136,22 @@ class Validation(BaseModel):
         except ValidationError as exc:
             raise TransformError(exc.errors(), str(row.name))
         return data  # type: ignore[return-value]
+
+    @classmethod
+    def validate_frame(cls, df: pandas.DataFrame) -> pandas.DataFrame:
+        """Валидация датафрейма поколоночным приведением типов.
+
+        Строки, значения которых не удалось привести векторно, проходят построчную валидацию схемой,
+        поэтому ошибки трансформации совпадают с ошибками построчной валидации.
+
+        Args:
+            df: Датафрейм
+
+        Returns:
+            pandas.DataFrame: Датафрейм после обработки
+        """
+        data, invalid = Coercion.coerce_frame(cls, df)
+        if invalid.any():
+            rows = pandas.DataFrame(df[invalid].apply(cls.validate_row, axis='columns'))
+            data.iloc[invalid.nonzero()[0]] = rows.reindex(columns=data.columns).to_numpy(dtype=object)
+        return data.infer_objects()
@@ -0,0 +1,86 @@
+import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.models import Process
+
+
+class Watermark:
+    """ETL-сервис хранения отметки инкрементальной синхронизации в исходном типе значения колонки.
+
+    Отметка сохраняется в JSON вместе с названием типа, поэтому при чтении восстанавливается значение того же типа,
+    что вернул драйвер источника, и сравнивается с колонкой без приведения к строке на стороне базы данных.
+    """
+
+    loaders: Dict[str, Callable[[Any], Any]] = {
+        'datetime': datetime.datetime.fromisoformat,
+        'date': datetime.date.fromisoformat,
+        'int': int,
+        'float': float,
+        'str': str,
+    }
+
+    @classmethod
+    def dump(cls, mark: Any) -> Optional[Dict[str, Any]]:
+        """Преобразование отметки в JSON с названием её типа.
+
+        Args:
+            mark: Наибольшее значение инкрементальной колонки
+
+        Returns:
+            Optional[Dict[str, Any]]: Тип и значение отметки или None для пустого значения
+        """
+        if mark is None or pd.isna(mark):
+            return None
+        if isinstance(mark, (pd.Timestamp, np.datetime64)):
+            mark = pd.Timestamp(mark).to_pydatetime()
+        if isinstance(mark, np.generic):
+            mark = mark.item()
+        if isinstance(mark, datetime.datetime):
+            return {'type': 'datetime', 'value': mark.isoformat()}
+        if isinstance(mark, datetime.date):
+            return {'type': 'date', 'value': mark.isoformat()}
+        if isinstance(mark, (int, float)) and not isinstance(mark, bool):
+            return {'type': type(mark).__name__, 'value': mark}
+        return {'type': 'str', 'value': str(mark)}
+
+    @classmethod
+    def load(cls, data: Optional[Dict[str, Any]]) -> Any:
+        """Восстановление отметки из JSON.
+
+        Args:
+            data: Тип и значение отметки из dump
+
+        Returns:
+            Any: Отметка в исходном типе или None, если отметки нет
+        """
+        if data is None:
+            return None
+        return cls.loaders[data['type']](data['value'])
+
+    @classmethod
+    def get_checkpoint(cls, process: Process) -> Optional[Tuple[str, Any]]:
+        """Получение отметки, начиная с которой извлекаются новые и изменённые строки процесса.
+
+        Args:
+            process: Процесс
+
+        Returns:
+            Optional[Tuple[str, Any]]: Инкрементальная колонка и её последнее синхронизированное значение
+        """
+        if process.incremental_col and process.watermark is not None:
+            return process.incremental_col, cls.load(process.watermark)
+        return None
+
+    @classmethod
+    def advance(cls, process: Process, mark: Any) -> None:
+        """Сохранение отметки последней синхронизированной строки процесса без отправки сигналов.
+
+        Args:
+            process: Процесс
+            mark: Наибольшее значение инкрементальной колонки среди извлечённых строк в исходном типе
+        """
+        process.watermark = cls.dump(mark)
+        Process.objects.filter(id=process.id).update(watermark=process.watermark)
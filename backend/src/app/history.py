@@ -0,0 +1,257 @@
+from typing import List, Optional, Tuple
+
+from django.contrib import admin
+from django.db.models import Prefetch
+from django.db.models.query import QuerySet
+from django.http import Http404, HttpRequest, HttpResponse
+from django.urls import URLPattern, path, reverse
+from django.utils.html import format_html, format_html_join
+
+from app.etl.metrics import OperatorReport
+from app.models import Process, ProcessRun, RunProfile
+
+
+class RunFormat:
+    """Класс вывода показателей запусков процессов в админке."""
+
+    chart = '▁▂▃▄▅▆▇█'
+    units = ('B', 'KB', 'MB', 'GB', 'TB')
+
+    @classmethod
+    def with_profiles(cls, queryset: QuerySet[ProcessRun]) -> QuerySet[ProcessRun]:
+        """Присоединение профилей к запускам без загрузки архивов.
+
+        Args:
+            queryset: Запуски
+
+        Returns:
+            QuerySet[ProcessRun]: Запуски с профилями
+        """
+        return queryset.select_related('profile').defer('profile__archive')
+
+    @classmethod
+    def get_profile_link(cls, obj: ProcessRun) -> str:
+        """Ссылка на скачивание архива профилирования, если запуск профилировался.
+
+        Args:
+            obj: Запуск
+
+        Returns:
+            str: Ссылка или прочерк
+        """
+        if not hasattr(obj, 'profile'):
+            return '-'
+        return format_html(
+            '<a href="{url}">{name}</a>',
+            url=reverse('admin:app_processrun_profile', args=(obj.id,)),
+            name=obj.profile.filename,
+        )
+
+    @classmethod
+    def get_operators(cls, obj: ProcessRun) -> List[Tuple[str, OperatorReport]]:
+        """Получение показателей операторов запуска от самого долгого оператора.
+
+        Args:
+            obj: Запуск
+
+        Returns:
+            List[Tuple[str, OperatorReport]]: Операторы и их показатели
+        """
+        return sorted(obj.operators.items(), key=lambda operator: operator[1]['seconds'], reverse=True)
+
+    @classmethod
+    def get_operators_summary(cls, obj: ProcessRun) -> str:
+        """Краткий вывод времени операторов запуска от самого долгого.
+
+        Args:
+            obj: Запуск
+
+        Returns:
+            str: Операторы и их время
+        """
+        return ', '.join(
+            '{operator} {seconds}'.format(operator=operator, seconds=cls.format_seconds(stats['seconds']))
+            for operator, stats in cls.get_operators(obj)
+        )
+
+    @classmethod
+    def draw_chart(cls, durations: List[float]) -> str:
+        """Построение графика длительностей из символов разной высоты.
+
+        Args:
+            durations: Длительности запусков
+
+        Returns:
+            str: График
+        """
+        top = max(durations) or 1
+        return ''.join(cls.chart[round(duration / top * (len(cls.chart) - 1))] for duration in durations)
+
+    @classmethod
+    def format_seconds(cls, seconds: float) -> str:
+        """Вывод длительности в секундах.
+
+        Args:
+            seconds: Длительность
+
+        Returns:
+            str: Длительность с единицей измерения
+        """
+        return '{seconds:.2f} s'.format(seconds=seconds)
+
+    @classmethod
+    def format_bytes(cls, size: float) -> str:
+        """Вывод объёма данных в наибольших единицах, в которых он не меньше единицы.
+
+        Args:
+            size: Объём в байтах
+
+        Returns:
+            str: Объём с единицей измерения
+        """
+        power = 0
+        while size >= 1024 and power < len(cls.units) - 1:
+            size /= 1024
+            power += 1
+        return '{size:.1f} {unit}'.format(size=size, unit=cls.units[power])
+
+
+class RunHistoryAdmin(admin.ModelAdmin):
+    """Базовый класс админки запусков, которые доступны только для просмотра, со скачиванием архивов профилирования."""
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet[ProcessRun]:
+        """Получение запусков вместе с процессом и наличием профиля без загрузки архивов профилей.
+
+        Args:
+            request: Запрос
+
+        Returns:
+            QuerySet[ProcessRun]: Запуски
+        """
+        return RunFormat.with_profiles(super().get_queryset(request).select_related('process'))
+
+    def get_urls(self) -> List[URLPattern]:
+        """Добавление адреса для скачивания архива профилирования запуска.
+
+        Returns:
+            List[URLPattern]: Адреса админки запусков
+        """
+        return [
+            path(
+                '<path:object_id>/profile/',
+                self.admin_site.admin_view(self.download_profile),
+                name='app_processrun_profile',
+            ),
+            *super().get_urls(),
+        ]
+
+    def download_profile(self, request: HttpRequest, object_id: str) -> HttpResponse:
+        """Скачивание архива профилирования запуска.
+
+        Args:
+            request: Запрос
+            object_id: Идентификатор запуска
+
+        Returns:
+            HttpResponse: Архив ZIP
+
+        Raises:
+            Http404: Запуск не профилировался или недоступен пользователю
+        """
+        profile = RunProfile.objects.select_related('run__process').filter(run_id=object_id).first()
+        if profile is None or not self.has_view_permission(request, profile.run):
+            raise Http404
+        response = HttpResponse(bytes(profile.archive), content_type='application/zip')
+        response['Content-Disposition'] = 'attachment; filename="{name}"'.format(name=profile.filename)
+        return response
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        """Запуски добавляются только задачами.
+
+        Args:
+            request: Запрос
+
+        Returns:
+            bool: Разрешение на добавление
+        """
+        return False
+
+    def has_change_permission(self, request: HttpRequest, obj: Optional[ProcessRun] = None) -> bool:
+        """Запуски доступны только для просмотра.
+
+        Args:
+            request: Запрос
+            obj: Запуск
+
+        Returns:
+            bool: Разрешение на изменение
+        """
+        return False
+
+
+class ProcessRunsAdmin(admin.ModelAdmin):
+    """Базовый класс админки процессов с графиком и таблицей последних запусков."""
+
+    trend_size = 20
+    history_size = 20
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet[Process]:
+        """Получение процессов вместе с последними запусками для графика одним запросом на всю страницу.
+
+        Args:
+            request: Запрос
+
+        Returns:
+            QuerySet[Process]: Процессы
+        """
+        runs = ProcessRun.objects.only('process_id', 'duration')[:self.trend_size]
+        return super().get_queryset(request).prefetch_related(Prefetch('runs', queryset=runs, to_attr='recent_runs'))
+
+    @admin.display(description='время последних запусков')
+    def trend(self, obj: Process) -> str:
+        """Вывод длительности последних запусков ETL-процесса в виде графика от старых к новым.
+
+        Args:
+            obj: Процесс
+
+        Returns:
+            str: График длительности и длительность последнего запуска
+        """
+        durations = [run.duration for run in reversed(obj.recent_runs)]
+        if not durations:
+            return '-'
+        return '{chart} {last}'.format(
+            chart=RunFormat.draw_chart(durations), last=RunFormat.format_seconds(durations[-1]),
+        )
+
+    @admin.display(description='история запусков')
+    def history(self, obj: Process) -> str:
+        """Вывод последних запусков ETL-процесса с показателями операторов.
+
+        Args:
+            obj: Процесс
+
+        Returns:
+            str: Таблица запусков и ссылка на полную историю
+        """
+        row = '<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>'
+        rows = format_html_join('', row, (
+            (
+                run.started.strftime('%Y-%m-%d %H:%M:%S'),
+                run.status,
+                RunFormat.format_seconds(run.duration),
+                run.rows_written,
+                RunFormat.format_bytes(run.peak_rss),
+                RunFormat.get_operators_summary(run),
+                RunFormat.get_profile_link(run),
+            )
+            for run in RunFormat.with_profiles(obj.runs.all())[:self.history_size]
+        ))
+        return format_html(
+            '<table><tr><th>начало</th><th>итог</th><th>время</th><th>записано строк</th><th>пик RSS</th>'
+            '<th>операторы</th><th>профиль</th></tr>{rows}</table>'
+            '<a href="{url}?process__id__exact={id}">вся история</a>',
+            rows=rows,
+            url=reverse('admin:app_processrun_changelist'),
+            id=obj.id,
+        )
@@ -0,0 +1,74 @@
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from app.benchmarks.baseline import BaselineReport
+from app.benchmarks.operations import OperationBenchmarks
+from app.benchmarks.suite import BenchmarkSuite
+
+
+class Command(BaseCommand):
+    """Команда для замера скорости ETL-сервисов на синтетических данных."""
+
+    help = 'Замер скорости ETL-сервисов на синтетических данных'
+    default_rows = {'etl': [10000, 100000, 1000000]}
+
+    def add_arguments(self, parser: CommandParser):
+        """Аргументы команды.
+
+        Args:
+            parser: Парсер аргументов
+        """
+        parser.add_argument('operation', choices=('diff', 'bulk', 'nested', 'etl'))
+        parser.add_argument('--rows', nargs='+', type=int, help='по умолчанию 100000 и 1000000, для etl и 10000')
+        parser.add_argument('--baseline', help='файл JSON с результатами для сравнения')
+        parser.add_argument('--save-baseline', help='файл JSON для сохранения результатов')
+        parser.add_argument('--threshold', type=float, default=10, help='допустимое замедление в процентах')
+        parser.add_argument('--strict', action='store_true', help='завершаться ошибкой при замедлении')
+        self.add_etl_arguments(parser)
+
+    def add_etl_arguments(self, parser: CommandParser):
+        """Аргументы замеров etl.
+
+        Args:
+            parser: Парсер аргументов
+        """
+        parser.add_argument('--targets', nargs='+', choices=BenchmarkSuite.targets, default=BenchmarkSuite.targets)
+        parser.add_argument('--repeat', type=int, default=3, help='повторы этапов etl, берётся лучшее время')
+        parser.add_argument('--chunk-size', type=int, help='передача частями в замерах задач etl целиком')
+        parser.add_argument(
+            '--data-dir', default=os.path.join(tempfile.gettempdir(), 'etl-benchmarks'), help='папка баз для etl',
+        )
+        parser.add_argument('--extract-cache', action='store_true', help='не отключать кэш извлечённых таблиц')
+
+    def handle(self, *args, **options):  # noqa: WPS110
+        """Запуск замеров.
+
+        Args:
+            args: Необязательные позиционные аргументы
+            options: Параметры команды
+        """
+        self.options = options
+        self.report = BaselineReport(self.stdout, self.stderr, options)
+        for rows in options['rows'] or self.default_rows.get(options['operation'], [100000, 1000000]):
+            if options['operation'] == 'etl':
+                self.bench_etl(rows)
+            else:
+                getattr(OperationBenchmarks, options['operation'])(rows, self.stdout)
+        if self.report.timings:
+            self.report.write()
+
+    def bench_etl(self, rows: int):
+        """Замер операторов Select, Join, Transform, Load и Sync по отдельности и задач процесса целиком.
+
+        Фильмы передаются из синтетической базы SQLite в получателя SQLite и в локальную заглушку Elasticsearch.
+
+        Args:
+            rows: Количество фильмов
+        """
+        with BenchmarkSuite.session(self.options['data_dir'], rows, self.options['extract_cache']) as suite:
+            for target in self.options['targets']:
+                self.report.add(target, rows, suite.run(target, self.options['repeat'], self.options['chunk_size']))
+            for problem in suite.problems:
+                self.stderr.write(problem)
@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-17 03:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0002_process_chunk_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='process',
+            name='incremental_col',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='watermark',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
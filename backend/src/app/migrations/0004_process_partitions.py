@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-17 05:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0003_process_watermark'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='process',
+            name='partitions',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2 on 2026-10-17 05:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0004_process_partitions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProcessTarget',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('to_table', models.CharField(max_length=255)),
+                ('model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='process_targets', to='app.model')),
+                ('process', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='extra_targets', to='app.process')),
+                ('target', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='process_targets', to='app.database')),
+            ],
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2 on 2026-10-17 05:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0005_processtarget'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProcessRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task', models.CharField(max_length=50)),
+                ('status', models.CharField(choices=[('success', 'Success'), ('failure', 'Failure')], max_length=50)),
+                ('started', models.DateTimeField()),
+                ('duration', models.FloatField()),
+                ('rows_written', models.PositiveBigIntegerField(default=0)),
+                ('peak_rss', models.PositiveBigIntegerField(default=0)),
+                ('operators', models.JSONField(default=dict)),
+                ('result', models.TextField(blank=True)),
+                ('process', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='runs', to='app.process')),
+            ],
+            options={
+                'ordering': ('-started',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='processrun',
+            index=models.Index(fields=['process', '-started'], name='app_process_process_c9a371_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2 on 2026-10-17 05:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0006_processrun'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='process',
+            name='profile_next_run',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name='RunProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('archive', models.BinaryField()),
+                ('run', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='profile', to='app.processrun')),
+            ],
+        ),
+    ]
@@ -0,0 +1,2 @@
+from app.models.processes import Column, Database, Model, Process, ProcessTarget, Relationship
+from app.models.runs import ProcessRun, RunProfile
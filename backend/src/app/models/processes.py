@@ -1,4 +1,5 @@
 import json
+from typing import Dict, List, Optional
 
 from django.db import models
 from django.utils import timezone
@@ -36,6 +37,19 @@ class Model(models.Model):
         """
         return self.title
 
+    @property
+    def column_types(self) -> Dict[str, Optional[str]]:
+        """Свойство для получения типов данных колонок модели по их именам и псевдонимам.
+
+        Returns:
+            Dict[str, Optional[str]]: Колонки и их типы данных
+        """
+        types: Dict[str, Optional[str]] = {}
+        for col in self.columns.all():
+            types[col.name] = col.type
+            types.setdefault(col.alias or col.name, col.type)
+        return types
+
 
 class Column(models.Model):
     """Модель для колонок схемы данных."""
@@ -69,7 +83,12 @@ class Process(models.Model):
     to_table = models.CharField(max_length=255)
     model = models.ForeignKey(Model, on_delete=models.CASCADE)
     index_col = models.CharField(max_length=255, default='id')
+    chunk_size = models.PositiveIntegerField(blank=True, null=True)
+    partitions = models.PositiveIntegerField(blank=True, null=True)
+    incremental_col = models.CharField(max_length=255, blank=True, null=True)
+    watermark = models.JSONField(blank=True, null=True)
     sync = models.BooleanField(default=False)
+    profile_next_run = models.BooleanField(default=False)
     time_interval = models.CharField(choices=TimeInterval.choices, default=TimeInterval.one_min, max_length=50)
     task = models.OneToOneField(PeriodicTask, on_delete=models.CASCADE, null=True, blank=True)
 
@@ -112,6 +131,43 @@ class Process(models.Model):
         )
         self.save()
 
+    @property
+    def source_columns(self) -> Dict[str, Optional[str]]:
+        """Свойство для получения колонок, которые процесс извлекает из таблицы источника.
+
+        Извлекаются колонки моделей всех получателей, типы совпадающих колонок берутся у основного получателя.
+        Инкрементальная колонка читается без приведения типа, чтобы отметка сохранялась в исходном виде.
+
+        Returns:
+            Dict[str, Optional[str]]: Колонки моделей, колонка для индексации данных и инкрементальная колонка с типами
+        """
+        columns: Dict[str, Optional[str]] = {}
+        for target in self.targets:
+            for name, col_type in target.model.column_types.items():
+                columns.setdefault(name, col_type)
+        columns.setdefault(self.index_col, None)
+        if self.incremental_col:
+            columns[self.incremental_col] = None
+        return columns
+
+    @property
+    def primary_target(self) -> 'ProcessTarget':
+        """Свойство для получения основного получателя, заданного полями самого процесса.
+
+        Returns:
+            ProcessTarget: Основной получатель без сохранения в БД
+        """
+        return ProcessTarget(process=self, target=self.target, to_table=self.to_table, model=self.model)
+
+    @property
+    def targets(self) -> List['ProcessTarget']:
+        """Свойство для получения всех получателей процесса: основного и дополнительных.
+
+        Returns:
+            List[ProcessTarget]: Получатели процесса
+        """
+        return [self.primary_target, *self.extra_targets.select_related('target', 'model')]
+
     @property
     def interval_schedule(self) -> IntervalSchedule:
         """Свойство для получения интервала времени.
@@ -138,3 +194,32 @@ class Relationship(models.Model):
     condition = models.CharField(max_length=255, blank=True, null=True)
     process = models.ForeignKey(Process, on_delete=models.CASCADE, related_name='relationships')
     model = models.ForeignKey(Model, on_delete=models.CASCADE, related_name='relationships')
+
+
+class ProcessTarget(models.Model):
+    """Модель для дополнительных получателей процесса передачи данных со своей таблицей и схемой данных."""
+
+    process = models.ForeignKey(Process, on_delete=models.CASCADE, related_name='extra_targets')
+    target = models.ForeignKey(Database, on_delete=models.CASCADE, related_name='process_targets')
+    to_table = models.CharField(max_length=255)
+    model = models.ForeignKey(Model, on_delete=models.CASCADE, related_name='process_targets')
+
+    def __str__(self) -> str:
+        """Строковое представление получателя в виде базы данных и таблицы.
+
+        Returns:
+            str: Строка-идентификатор
+        """
+        return '{slug}: {to_table}'.format(slug=self.target.slug, to_table=self.to_table)
+
+    @property
+    def target_columns(self) -> Dict[str, Optional[str]]:
+        """Свойство для получения полей, под которыми данные процесса хранятся у получателя.
+
+        Returns:
+            Dict[str, Optional[str]]: Колонки модели под псевдонимами, поля связанных объектов и колонка для индексации
+        """
+        columns: Dict[str, Optional[str]] = {col.alias or col.name: col.type for col in self.model.columns.all()}
+        columns.update({rel.related_name: None for rel in self.process.relationships.all()})
+        columns.setdefault(self.process.index_col, None)
+        return columns
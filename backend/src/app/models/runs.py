@@ -0,0 +1,114 @@
+import datetime
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db import models
+
+from app.enums import RunStatus
+from app.models.processes import Process
+
+
+class ProcessRun(models.Model):
+    """Модель для истории запусков процесса передачи данных с показателями операторов."""
+
+    process = models.ForeignKey(Process, on_delete=models.CASCADE, related_name='runs')
+    task = models.CharField(max_length=50)
+    status = models.CharField(choices=RunStatus.choices, max_length=50)
+    started = models.DateTimeField()
+    duration = models.FloatField()
+    rows_written = models.PositiveBigIntegerField(default=0)
+    peak_rss = models.PositiveBigIntegerField(default=0)
+    operators = models.JSONField(default=dict)
+    result = models.TextField(blank=True)
+
+    class Meta:
+        """Метаданные модели."""
+
+        ordering = ('-started',)
+        indexes = (models.Index(fields=('process', '-started')),)
+
+    def __str__(self) -> str:
+        """Строковое представление запуска в виде процесса и времени начала.
+
+        Returns:
+            str: Строка-идентификатор
+        """
+        return '{process}: {started}'.format(process=self.process_id, started=self.started.isoformat())
+
+    @classmethod
+    def record(cls, process_id: int, task: str, report: Dict, status: str, result: str) -> 'ProcessRun':
+        """Сохранение запуска в историю. Запуски сверх ETL_RUN_HISTORY_SIZE последних удаляются.
+
+        Args:
+            process_id: Идентификатор процесса
+            task: Название задачи
+            report: Показатели запуска из RunMetrics.report
+            status: Итог запуска
+            result: Результат задачи или текст ошибки
+
+        Returns:
+            ProcessRun: Сохранённый запуск
+        """
+        run = cls.objects.create(
+            process_id=process_id,
+            task=task,
+            status=status,
+            started=datetime.datetime.fromtimestamp(report['started'], tz=datetime.timezone.utc),
+            duration=report['finished'] - report['started'],
+            rows_written=sum(int(stats['rows_written']) for stats in report['operators'].values()),
+            peak_rss=report['peak_rss'],
+            operators=report['operators'],
+            result=result,
+        )
+        runs = cls.objects.filter(process_id=process_id)
+        size = settings.ETL_RUN_HISTORY_SIZE
+        if stale := list(runs.values_list('started', flat=True)[size:size + 1]):
+            runs.filter(started__lte=stale[0]).delete()
+        return run
+
+
+class RunProfile(models.Model):
+    """Модель для результатов профилирования запуска процесса."""
+
+    run = models.OneToOneField(ProcessRun, on_delete=models.CASCADE, related_name='profile')
+    archive = models.BinaryField()
+
+    def __str__(self) -> str:
+        """Строковое представление профиля в виде запуска.
+
+        Returns:
+            str: Строка-идентификатор
+        """
+        return str(self.run)
+
+    @classmethod
+    def claim(cls, process_id: int) -> bool:
+        """Снятие отметки профилирования следующего запуска. Отметку снимает только один из запусков процесса.
+
+        Args:
+            process_id: Идентификатор процесса
+
+        Returns:
+            bool: Запуск нужно профилировать
+        """
+        return Process.objects.filter(id=process_id, profile_next_run=True).update(profile_next_run=False) > 0
+
+    @classmethod
+    def store(cls, run: ProcessRun, archive: Optional[bytes]) -> None:
+        """Сохранение архива с результатами профилирования запуска, если запуск профилировался.
+
+        Args:
+            run: Запуск
+            archive: Архив из RunProfiler.archive
+        """
+        if archive is not None:
+            cls.objects.create(run=run, archive=archive)
+
+    @property
+    def filename(self) -> str:
+        """Свойство для получения имени файла архива при скачивании.
+
+        Returns:
+            str: Имя файла
+        """
+        return '{process}-run-{run}-profile.zip'.format(process=self.run.process.slug, run=self.run_id)
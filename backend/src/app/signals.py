@@ -1,8 +1,10 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from app.enums import ProcessStatus
-from app.models import Process
+from app.etl.caching import SchemaCache
+from app.etl.connections import ConnectionRegistry
+from app.models import Column, Database, Model, Process, Relationship
 
 
 @receiver(post_save, sender=Process)
@@ -21,3 +23,27 @@ def create_or_update_periodic_task(sender: Process, instance: Process, created:
         if instance.task is not None:
             instance.task.enabled = instance.status == ProcessStatus.active
             instance.task.save()
+
+
+@receiver([post_save, post_delete], sender=Column)
+@receiver([post_save, post_delete], sender=Model)
+@receiver([post_save, post_delete], sender=Relationship)
+def invalidate_validation_schemas(sender: Model, **kwargs):
+    """Функция-триггер для сброса кэша схем валидации при изменении метаданных моделей.
+
+    Args:
+        sender: Отправитель сигнала
+        kwargs: Необязательные именованные аргументы
+    """
+    SchemaCache.invalidate()
+
+
+@receiver([post_save, post_delete], sender=Database)
+def dispose_database_connections(sender: Database, **kwargs):
+    """Функция-триггер для закрытия пулов подключений при изменении или удалении базы данных.
+
+    Args:
+        sender: Отправитель сигнала
+        kwargs: Необязательные именованные аргументы
+    """
+    ConnectionRegistry.invalidate()
@@ -1,14 +1,24 @@
-import pandas
+import time
+from typing import List, Optional
+
 from celery import shared_task
+from celery.app.task import Context
 
-from app.etl.operators import Join, Load, Select, Sync, Transform
-from app.models import Process
+from app.enums import RunStatus
+from app.etl.metrics import RunMetrics, recorded_run
+from app.etl.state import TargetState
+from app.etl.transfer import Targets, Transfer
+from app.models import Process, ProcessRun
 
 
 @shared_task(name='transfer_data')
 def transfer_data(process_id: int) -> str:
     """Функция для реализации одноразовой передачи данных.
 
+    Снимки состояния получателей процесса сбрасываются, так как передача меняет их данные в обход снимков.
+    Передача частями источника сохраняется в историю запусков после завершения всех частей,
+    остальные передачи - после завершения задачи.
+
     Args:
         process_id: Идентификатор процесса
 
@@ -16,17 +26,109 @@ def transfer_data(process_id: int) -> str:
         str: Результат передачи данных
     """
     process = Process.objects.get(id=process_id)
-    df = (
-        pandas.DataFrame()
-        .pipe(Select, process.source, process.from_table)
-        .pipe(Join, process.source, process.from_table, process.relationships.all(), process.index_col)
-        .pipe(Transform, process.model, process.relationships.all())
-        .pipe(Load, process.target, process.to_table)
+    TargetState.invalidate(process.id)
+    if process.partitions:
+        return transfer_data_partitioned(process)
+    return transfer_data_single(process.id)
+
+
+@recorded_run
+def transfer_data_single(process_id: int) -> str:
+    """Функция для передачи данных в одной задаче: целиком или частями, если у процесса задан их размер.
+
+    Args:
+        process_id: Идентификатор процесса
+
+    Returns:
+        str: Результат передачи данных
+    """
+    return Transfer.single(Process.objects.get(id=process_id))
+
+
+def transfer_data_partitioned(process: Process) -> str:
+    """Функция для реализации одноразовой передачи данных частями источника, которые загружаются параллельно.
+
+    Каждая часть передаётся отдельной задачей. Итог передачи подводит задача, которая запускается после
+    завершения всех частей и сохраняет их общие показатели в историю запусков. Если часть завершилась ошибкой,
+    запуск сохраняется в историю как неуспешный.
+
+    Args:
+        process: Процесс
+
+    Raises:
+        Exception: Ошибка разбиения источника или запуска задач частей
+
+    Returns:
+        str: Результат запуска передачи данных
+    """
+    started = time.time()
+    callback = finish_partitioned_transfer.s(process.id, started)
+    callback.on_error(fail_partitioned_transfer.s(process.id, started))
+    try:
+        partitions = Transfer.dispatch(process, transfer_partition, callback)
+    except Exception as exc:
+        Transfer.record_failure(process.id, started, exc)
+        raise
+    return f'процесс={process}, частей={partitions}'
+
+
+@shared_task(name='transfer_partition')
+def transfer_partition(process_id: int, partition: dict) -> dict:
+    """Функция для передачи одной части источника.
+
+    Args:
+        process_id: Идентификатор процесса
+        partition: Часть источника из Select.partitions
+
+    Returns:
+        dict: Количество загруженных строк и показатели передачи части
+    """
+    return Transfer.partition(Process.objects.get(id=process_id), partition)
+
+
+@shared_task(name='finish_partitioned_transfer')
+def finish_partitioned_transfer(partitions: List[dict], process_id: int, started: float) -> str:
+    """Функция для подведения итога передачи данных частями.
+
+    Args:
+        partitions: Результаты transfer_partition для каждой части
+        process_id: Идентификатор процесса
+        started: Время запуска передачи
+
+    Returns:
+        str: Результат передачи данных
+    """
+    process = Process.objects.get(id=process_id)
+    Targets.refresh(process)
+    result = 'процесс={process}, загружено={inserted}'.format(
+        process=process, inserted=sum(part['inserted_rows'] for part in partitions),
     )
-    return f'процесс={process}, загружено={df.inserted_rows}'
+    metrics = RunMetrics.merge(part['metrics'] for part in partitions)
+    metrics.started = min(metrics.started, started)
+    ProcessRun.record(process.id, 'transfer_data_partitioned', metrics.report(), RunStatus.success, result)
+    return result
+
+
+@shared_task(name='fail_partitioned_transfer')
+def fail_partitioned_transfer(
+    request: Context, exc: Exception, traceback: Optional[str], process_id: int, started: float,
+) -> None:
+    """Функция для сохранения в историю передачи данных частями, часть которой завершилась ошибкой.
+
+    Celery вызывает её с запросом и ошибкой задачи, которая подводит итог передачи.
+
+    Args:
+        request: Запрос задачи
+        exc: Ошибка
+        traceback: Трассировка ошибки
+        process_id: Идентификатор процесса
+        started: Время запуска передачи
+    """
+    Transfer.record_failure(process_id, started, exc)
 
 
 @shared_task(name='sync_data')
+@recorded_run
 def sync_data(process_id: int) -> str:
     """Функция для реализации синхронизации данных между источником и целью.
 
@@ -36,16 +138,4 @@ def sync_data(process_id: int) -> str:
     Returns:
         str: Результат передачи данных
     """
-    process = Process.objects.get(id=process_id)
-    df = (
-        pandas.DataFrame()
-        .pipe(Select, process.target, process.to_table)
-        .pipe(Transform, process.model, process.relationships.all())
-        .pipe(Sync, process.target, process.to_table, process.index_col, source_df=(
-            pandas.DataFrame()
-            .pipe(Select, process.source, process.from_table)
-            .pipe(Join, process.source, process.from_table, process.relationships.all(), process.index_col)
-            .pipe(Transform, process.model, process.relationships.all())
-        ))
-    )
-    return f'процесс={process}, загружено={df.inserted_rows}, обновлено={df.updated_rows}, удалено={df.deleted_rows}'
+    return Transfer.sync(Process.objects.get(id=process_id))
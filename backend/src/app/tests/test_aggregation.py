@@ -0,0 +1,30 @@
+import pandas as pd
+from django.test import SimpleTestCase
+
+from app.etl.aggregation import Aggregation
+
+
+class DataChangesTest(SimpleTestCase):
+    """Тесты сравнения строк источника и получателя по хешам содержимого."""
+
+    cast = [{'id': 1, 'name': 'Actor'}, {'id': 2, 'name': 'Other'}]
+    reordered_cast = [{'id': 2, 'name': 'Other'}, {'id': 1, 'name': 'Actor'}]
+
+    def test_rows_are_classified(self):
+        """Строки делятся на новые, изменённые и удалённые, а порядок вложенных объектов не считается изменением."""
+        src = pd.DataFrame({
+            'id': ['same', 'modified', 'reordered', 'new'],
+            'title': ['first', 'changed', 'third', 'fifth'],
+            'rating': [1, 2.5, 3, 5],
+            'actors': [self.cast, self.cast, self.reordered_cast, []],
+        })
+        dest = pd.DataFrame({
+            'id': ['same', 'modified', 'reordered', 'deleted'],
+            'title': ['first', 'second', 'third', 'fourth'],
+            'rating': [1.0, 2.5, 3.0, 4.0],
+            'actors': [self.cast, self.cast, self.cast, None],
+        })
+        new, modified, deleted = Aggregation.get_data_changes(src, dest, 'id')
+        self.assertEqual(new['id'].tolist(), ['new'])
+        self.assertEqual(modified['id'].tolist(), ['modified'])
+        self.assertEqual(deleted['id'].tolist(), ['deleted'])
@@ -0,0 +1,112 @@
+import tempfile
+import uuid
+from typing import List
+
+import pandas as pd
+from django.test import SimpleTestCase, override_settings
+from pydantic import Field, create_model
+
+from app.etl.caching import ExtractCache, SchemaCache, bump_version
+from app.etl.validation import Validation
+
+
+class ExtractCacheTest(SimpleTestCase):
+    """Тесты снимков извлечённых таблиц."""
+
+    fingerprint = b'fingerprint'
+
+    def setUp(self):
+        """Временная папка снимков для каждого теста."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(ETL_EXTRACT_CACHE_DIR=directory.name, ETL_EXTRACT_CACHE_MAX_BYTES=10 ** 9)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.path = '{directory}/snapshot{suffix}'.format(directory=directory.name, suffix=ExtractCache.suffix)
+
+    def test_related_lists_survive_round_trip(self):
+        """Списки связанных объектов, которые PostgreSQL возвращает из json_agg, читаются из снимка списками."""
+        df = self.get_joined_frame()
+        ExtractCache.store(self.path, self.fingerprint, df)
+        cached = ExtractCache.load(self.path, self.fingerprint)
+        self.assertIsNotNone(cached)
+        self.assertEqual(cached.to_dict('records'), df.to_dict('records'))
+        self.assertIsInstance(cached['actors'].iloc[0], list)
+        self.assertIsInstance(cached['genre'].iloc[0], list)
+
+    def test_cached_frame_passes_validation(self):
+        """Датафрейм из снимка проходит валидацию так же, как датафрейм из базы данных."""
+        df = self.get_joined_frame()
+        ExtractCache.store(self.path, self.fingerprint, df)
+        cached = ExtractCache.load(self.path, self.fingerprint)
+        schema = self.get_schema()
+        pd.testing.assert_frame_equal(schema.validate_frame(cached), schema.validate_frame(df))
+
+    def test_stale_snapshot_is_ignored(self):
+        """Снимок с другим отпечатком таблиц не читается."""
+        ExtractCache.store(self.path, self.fingerprint, self.get_joined_frame())
+        self.assertIsNone(ExtractCache.load(self.path, b'other'))
+
+    def get_joined_frame(self) -> pd.DataFrame:
+        """Датафрейм фильмов со связанными объектами в том виде, в каком его возвращает JoinPlanner.
+
+        Returns:
+            pd.DataFrame: Датафрейм фильмов
+        """
+        return pd.DataFrame({
+            'id': [str(uuid.uuid4()), str(uuid.uuid4())],
+            'title': ['first', 'second'],
+            'actors': [
+                [{'id': str(uuid.uuid4()), 'full_name': 'Actor'}, {'id': str(uuid.uuid4()), 'full_name': 'Other'}],
+                None,
+            ],
+            'genre': [['Drama', 'Comedy'], []],
+        })
+
+    def get_schema(self) -> type:
+        """Схема валидации фильмов со связанными объектами.
+
+        Returns:
+            type: Схема валидации
+        """
+        person = create_model(
+            'person', __base__=Validation, id=(uuid.UUID, Field()), full_name=(str, Field(alias='name')),
+        )
+        return create_model(
+            'movies',
+            __base__=Validation,
+            id=(uuid.UUID, Field()),
+            title=(str, Field()),
+            actors=(List[person], Field(default=[])),  # type: ignore[valid-type]
+            genre=(List[str], Field(default=[])),
+        )
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SchemaCacheTest(SimpleTestCase):
+    """Тесты сброса кэша схем валидации через версию в общем кэше."""
+
+    def setUp(self):
+        """Пустой кэш схем процесса с одной сохранённой схемой."""
+        SchemaCache.schemas = {}
+        SchemaCache.version = 0
+        SchemaCache.checked = float('-inf')
+        self.addCleanup(SchemaCache.invalidate)
+        SchemaCache.get('movies')
+        SchemaCache.set('movies', Validation)
+
+    @override_settings(ETL_SCHEMA_VERSION_TTL=60)
+    def test_version_is_reread_after_ttl(self):
+        """Сброс из другого процесса виден только после перечитывания версии."""
+        bump_version(SchemaCache.version_key)
+        self.assertIs(SchemaCache.get('movies'), Validation)
+        SchemaCache.checked = float('-inf')
+        self.assertIsNone(SchemaCache.get('movies'))
+
+    @override_settings(ETL_SCHEMA_VERSION_TTL=60)
+    def test_invalidate_resets_local_cache(self):
+        """Сброс в том же процессе действует сразу, без ожидания перечитывания версии."""
+        SchemaCache.invalidate()
+        self.assertIsNone(SchemaCache.get('movies'))
+        SchemaCache.set('movies', Validation)
+        self.assertIs(SchemaCache.get('movies'), Validation)
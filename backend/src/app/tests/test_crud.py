@@ -0,0 +1,73 @@
+import sqlite3
+import tempfile
+
+import pandas as pd
+from django.test import SimpleTestCase, override_settings
+
+from app.etl.crud import CRUD
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class StagedChangesTest(SimpleTestCase):
+    """Тесты обновления и удаления строк SQLite через временную таблицу."""
+
+    existing = (('a', 'first'), ('b', 'second'))
+
+    def setUp(self):
+        """Таблица фильмов во временной базе SQLite."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = '{directory}/target.sqlite'.format(directory=directory.name)
+        self.uri = 'sqlite:///{path}'.format(path=self.path)
+        self.engine = CRUD.get_engine('sqlite')
+
+    def test_upsert_inserts_and_updates(self):
+        """Строки с новыми ключами вставляются, с существующими - обновляются."""
+        self.create_table('id TEXT PRIMARY KEY')
+        changed = self.engine.update(self.get_frame(('b', 'changed'), ('c', 'third')), self.uri, 'movies')
+        self.assertEqual(changed, 2)
+        self.assertEqual(self.get_rows(), [('a', 'first'), ('b', 'changed'), ('c', 'third')])
+
+    def test_delete_counts_removed_rows(self):
+        """Удаление возвращает количество удалённых строк без ключей, которых нет в таблице."""
+        self.create_table('id TEXT PRIMARY KEY')
+        deleted = self.engine.delete(self.get_frame(('a', 'first'), ('missing', 'none')), self.uri, 'movies')
+        self.assertEqual(deleted, 1)
+        self.assertEqual(self.get_rows(), [('b', 'second')])
+
+    def test_non_unique_key_updates_existing_rows(self):
+        """Если ключ не уникален, существующие строки обновляются через UPDATE, а новые не вставляются."""
+        self.create_table('id TEXT')
+        changed = self.engine.update(self.get_frame(('b', 'changed'), ('c', 'third')), self.uri, 'movies')
+        self.assertEqual(changed, 1)
+        self.assertEqual(self.get_rows(), [('a', 'first'), ('b', 'changed')])
+
+    def create_table(self, key: str) -> None:
+        """Создание таблицы фильмов с двумя строками.
+
+        Args:
+            key: Определение ключевой колонки
+        """
+        with sqlite3.connect(self.path) as conn:
+            conn.execute('CREATE TABLE movies ({key}, title TEXT)'.format(key=key))
+            conn.executemany('INSERT INTO movies VALUES (?, ?)', self.existing)
+
+    def get_rows(self) -> list:
+        """Строки таблицы фильмов в порядке ключей.
+
+        Returns:
+            list: Строки
+        """
+        with sqlite3.connect(self.path) as conn:
+            return conn.execute('SELECT id, title FROM movies ORDER BY id').fetchall()
+
+    def get_frame(self, *rows: tuple) -> pd.DataFrame:
+        """Датафрейм фильмов, проиндексированный по ключевой колонке.
+
+        Args:
+            rows: Ключи и названия фильмов
+
+        Returns:
+            pd.DataFrame: Датафрейм
+        """
+        return pd.DataFrame(rows, columns=['id', 'title']).set_index('id', drop=False)
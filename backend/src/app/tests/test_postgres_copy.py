@@ -0,0 +1,30 @@
+import pandas as pd
+from django.test import SimpleTestCase
+
+from app.etl.crud.postgres_copy import PostgresCopy
+
+
+class CopyTextTest(SimpleTestCase):
+    """Тесты построения данных для COPY в текстовом формате."""
+
+    def test_integral_floats_have_no_fraction(self):
+        """Целые числа, которые pandas хранит как float64 из-за пропусков, выводятся без дробной части."""
+        df = pd.DataFrame({'votes': [1.0, None, 3.0], 'rating': [1.5, None, 3.0]})
+        expected = self.get_text(('1', '1.5'), (PostgresCopy.null, PostgresCopy.null), ('3', '3.0'))
+        self.assertEqual(PostgresCopy.get_text(df), expected)
+
+    def test_objects_are_escaped(self):
+        """Вложенные объекты сохраняются как JSON, спецсимволы экранируются, пропуски выводятся как NULL."""
+        df = pd.DataFrame({'title': ['a\tb', None], 'actors': [[{'id': 1.0}], 2.0]})
+        self.assertEqual(PostgresCopy.get_text(df), self.get_text((r'a\tb', '[{"id":1.0}]'), (PostgresCopy.null, '2')))
+
+    def get_text(self, *lines: tuple) -> str:
+        """Ожидаемые данные для COPY из строк текстовых значений.
+
+        Args:
+            lines: Текстовые значения каждой строки
+
+        Returns:
+            str: Данные для COPY
+        """
+        return '\n'.join('\t'.join(line) for line in lines)
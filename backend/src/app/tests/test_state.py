@@ -0,0 +1,61 @@
+import tempfile
+
+import pandas as pd
+from django.test import SimpleTestCase, override_settings
+
+from app.etl.state import TargetState
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TargetStateTest(SimpleTestCase):
+    """Тесты снимков состояния получателя на нескольких воркерах с общим кэшем."""
+
+    columns = ('id', 'title')
+    hashes = pd.Series([1, 2], index=pd.Index(['a', 'b'], dtype=object), dtype='uint64')
+
+    def setUp(self):
+        """Папки снимков двух воркеров."""
+        self.workers = []
+        for _ in range(2):
+            directory = tempfile.TemporaryDirectory()
+            self.addCleanup(directory.cleanup)
+            self.workers.append(directory.name)
+
+    def test_snapshot_is_reused(self):
+        """Снимок читается, пока получателя не изменил другой воркер."""
+        self.get_state(0).commit(self.hashes, pd.Index([]), replace=True)
+        pd.testing.assert_series_equal(self.get_state(0).load(), self.hashes)
+
+    def test_other_worker_write_invalidates_snapshot(self):
+        """Снимок устаревает, когда получателя изменяет другой воркер."""
+        self.get_state(0).commit(self.hashes, pd.Index([]), replace=True)
+        self.get_state(1).commit(self.hashes, pd.Index([]), replace=True)
+        self.assertIsNone(self.get_state(0).load())
+        self.assertIsNotNone(self.get_state(1).load())
+
+    def test_commit_without_writes_keeps_snapshots(self):
+        """Синхронизация без изменений получателя не делает устаревшими снимки других воркеров."""
+        self.get_state(0).commit(self.hashes, pd.Index([]), replace=True)
+        self.get_state(1).commit(self.hashes, pd.Index([]), replace=True, written=False)
+        self.assertIsNotNone(self.get_state(0).load())
+        self.assertIsNotNone(self.get_state(1).load())
+
+    def test_concurrent_commit_is_not_trusted(self):
+        """Снимок, пока строился которым получателя изменил другой воркер, не используется."""
+        first, second = self.get_state(0), self.get_state(1)
+        second.commit(self.hashes, pd.Index([]), replace=True)
+        first.commit(self.hashes, pd.Index([]), replace=True)
+        self.assertIsNone(self.get_state(0).load())
+        self.assertIsNone(self.get_state(1).load())
+
+    def get_state(self, worker: int) -> TargetState:
+        """Снимок состояния получателя на воркере.
+
+        Args:
+            worker: Номер воркера
+
+        Returns:
+            TargetState: Снимок состояния
+        """
+        with override_settings(ETL_STATE_DIR=self.workers[worker]):
+            return TargetState(1, 'sqlite:///target.sqlite', 'movies', self.columns)
@@ -1,5 +1,7 @@
 import os
+import tempfile
 from pathlib import Path
+from types import MappingProxyType
 
 from django.core.management.utils import get_random_secret_key
 from dotenv import load_dotenv
@@ -30,4 +32,47 @@ REDIS_HOST = os.environ.get('REDIS_HOST', 'localhost')
 REDIS_PORT = os.environ.get('REDIS_PORT', '6379')
 
 CELERY_BROKER_URL = 'redis://{host}:{port}'.format(host=REDIS_HOST, port=REDIS_PORT)
+CELERY_RESULT_BACKEND = CELERY_BROKER_URL
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
+
+ETL_POOL_SIZE = int(os.environ.get('ETL_POOL_SIZE', '5'))
+ETL_POOL_MAX_OVERFLOW = int(os.environ.get('ETL_POOL_MAX_OVERFLOW', '10'))
+ETL_POOL_IDLE_TIMEOUT = int(os.environ.get('ETL_POOL_IDLE_TIMEOUT', '300'))
+ETL_POOL_VERSION_TTL = float(os.environ.get('ETL_POOL_VERSION_TTL', '5'))
+ETL_SCHEMA_VERSION_TTL = float(os.environ.get('ETL_SCHEMA_VERSION_TTL', '5'))
+
+ETL_ES_BULK_THREADS = int(os.environ.get('ETL_ES_BULK_THREADS', '4'))
+ETL_ES_BULK_CHUNK_SIZE = int(os.environ.get('ETL_ES_BULK_CHUNK_SIZE', '500'))
+ETL_ES_BULK_MAX_BYTES = int(os.environ.get('ETL_ES_BULK_MAX_BYTES', str(10 * 1024 * 1024)))
+ETL_ES_READ_SLICES = int(os.environ.get('ETL_ES_READ_SLICES', '4'))
+
+ETL_PIPELINE_QUEUE_SIZE = int(os.environ.get('ETL_PIPELINE_QUEUE_SIZE', '2'))
+
+ETL_ASYNC_LOAD = os.environ.get('ETL_ASYNC_LOAD', False) == 'True'
+ETL_ASYNC_CONCURRENCY = int(os.environ.get('ETL_ASYNC_CONCURRENCY', '8'))
+
+ETL_SQL_BATCH_SIZE = int(os.environ.get('ETL_SQL_BATCH_SIZE', '10000'))
+ETL_PG_COPY_CHUNK_SIZE = int(os.environ.get('ETL_PG_COPY_CHUNK_SIZE', '50000'))
+ETL_SQLITE_BULK_LOAD = os.environ.get('ETL_SQLITE_BULK_LOAD', 'True') == 'True'
+ETL_SQLITE_BATCH_SIZE = int(os.environ.get('ETL_SQLITE_BATCH_SIZE', '50000'))
+ETL_SQLITE_SYNCHRONOUS = os.environ.get('ETL_SQLITE_SYNCHRONOUS', 'NORMAL')
+ETL_SQLITE_CACHE_SIZE = int(os.environ.get('ETL_SQLITE_CACHE_SIZE', str(-64 * 1024)))
+ETL_SQLITE_REBUILD_INDEXES = os.environ.get('ETL_SQLITE_REBUILD_INDEXES', False) == 'True'
+
+ETL_EXTRACT_CACHE_DIR = os.environ.get('ETL_EXTRACT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'etl-extracts'))
+ETL_EXTRACT_CACHE_MAX_BYTES = int(os.environ.get('ETL_EXTRACT_CACHE_MAX_BYTES', str(512 * 1024 * 1024)))
+ETL_EXTRACT_CACHE_COLUMN = os.environ.get('ETL_EXTRACT_CACHE_COLUMN', 'modified')
+
+ETL_SYNC_STATE = os.environ.get('ETL_SYNC_STATE', 'True') == 'True'
+ETL_STATE_DIR = os.environ.get('ETL_STATE_DIR', os.path.join(tempfile.gettempdir(), 'etl-state'))
+
+ETL_RUN_HISTORY_SIZE = int(os.environ.get('ETL_RUN_HISTORY_SIZE', '1000'))
+
+CACHES = MappingProxyType(
+    {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CELERY_BROKER_URL,
+        },
+    },
+)